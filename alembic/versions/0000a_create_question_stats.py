@@ -0,0 +1,42 @@
+"""Create question_stats
+
+Revision ID: 0000a_create_question_stats
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+Running answer counters per question (app.models.QuestionStats), bumped by
+crud_user_answer.create_user_answer. The table is created IF NOT EXISTS, since
+app/db/init_db.py may already have built it. Counters for answers submitted
+before this migration are filled in by app/db/rebuild_question_stats.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0000a_create_question_stats'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "question_stats",
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), primary_key=True),
+        sa.Column("total_answers", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_correct", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("option_1_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("option_2_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("option_3_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("option_4_count", sa.Integer(), nullable=False, server_default="0"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("question_stats", if_exists=True)
@@ -0,0 +1,42 @@
+"""Create user_question_progress
+
+Revision ID: 0000b_create_user_question_progress
+Revises: 0000a_create_question_stats
+Create Date: 2026-10-17 00:00:00.000000
+
+Per-(user, question) rollup of user_answers (app.models.UserQuestionProgress),
+upserted by crud_user_answer.create_user_answer. The table is created IF NOT
+EXISTS, since app/db/init_db.py may already have built it; later revisions add
+its exam type copy, review schedule and indexes. Rows for answers submitted
+before this migration are filled in by app/db/rebuild_user_question_progress.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0000b_create_user_question_progress'
+down_revision: Union[str, None] = '0000a_create_question_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_question_progress",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("correct_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ever_incorrect", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("last_answered_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_question_progress", if_exists=True)
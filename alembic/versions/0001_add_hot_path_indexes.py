@@ -0,0 +1,60 @@
+"""Add indexes for the hot query paths
+
+Revision ID: 0001_add_hot_path_indexes
+Revises: 0000b_create_user_question_progress
+Create Date: 2026-10-17 00:00:00.000000
+
+Runs after the revisions that create question_stats and user_question_progress,
+so a database with only the original tables reaches head through Alembic alone.
+app/db/init_db.py (Base.metadata.create_all) builds these indexes from the models
+on a fresh database, so every index is created IF NOT EXISTS. On PostgreSQL the
+indexes are built CONCURRENTLY (outside a transaction) so existing tables stay
+writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_add_hot_path_indexes'
+down_revision: Union[str, None] = '0000b_create_user_question_progress'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+HOT_PATH_INDEXES = [
+    ("ix_questions_exam_type_id", "questions", ["exam_type_id"]),
+    ("ix_user_answers_user_id_question_id", "user_answers", ["user_id", "question_id"]),
+    ("ix_user_answers_question_id_is_correct", "user_answers", ["question_id", "is_correct"]),
+    ("ix_user_answers_user_id_answered_at", "user_answers", ["user_id", "answered_at"]),
+    ("ix_user_question_progress_question_id", "user_question_progress", ["question_id"]),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, table, columns in HOT_PATH_INDEXES:
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table, columns in HOT_PATH_INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(HOT_PATH_INDEXES):
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table, _ in reversed(HOT_PATH_INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,48 @@
+"""Add users.token_version for the cached-auth fast path
+
+Revision ID: 0002_add_user_token_version
+Revises: 0001_add_hot_path_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+Access tokens carry the user's token_version ("ver"); bumping it revokes older
+tokens. Existing rows start at 0 through the server default.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_add_user_token_version'
+down_revision: Union[str, None] = '0001_add_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _has_column(table: str, column: str) -> bool:
+    # SQLite has no ADD COLUMN IF NOT EXISTS, and init_db's create_all may already have
+    # added the column. With --sql there is nothing to inspect; PostgreSQL still gets IF NOT EXISTS.
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("users", "token_version"):
+        op.add_column(
+            "users",
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+            if_not_exists=_is_postgresql(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_postgresql() or _has_column("users", "token_version"):
+        op.drop_column("users", "token_version", if_exists=_is_postgresql())
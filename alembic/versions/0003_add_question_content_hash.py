@@ -0,0 +1,123 @@
+"""Add questions.content_hash for import deduplication
+
+Revision ID: 0003_add_question_content_hash
+Revises: 0002_add_user_token_version
+Create Date: 2026-10-17 00:00:00.000000
+
+content_hash is the sha256 of a question's normalized statement and options
+(app.models.question_content_hash, as of this revision; _content_hash below is a
+frozen copy), unique per exam type. Existing rows are backfilled here in id
+order; when an exam type already holds the same content
+more than once, the oldest question keeps the hash and the later copies are
+left NULL (NULLs do not collide in the unique index), so no data is dropped.
+The backfill needs a live connection and is skipped with --sql; run the
+migration online, or backfill before building the index.
+"""
+from typing import Sequence, Union
+
+import hashlib
+import unicodedata
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_add_question_content_hash'
+down_revision: Union[str, None] = '0002_add_user_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "uq_questions_exam_type_id_content_hash"
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _has_column(table: str, column: str) -> bool:
+    # SQLite has no ADD COLUMN IF NOT EXISTS, and init_db's create_all may already have
+    # added the column. With --sql there is nothing to inspect; PostgreSQL still gets IF NOT EXISTS.
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def _content_hash(problem_statement: str, option_1: str, option_2: str, option_3: str, option_4: str) -> str:
+    # Frozen copy of app.models.question_content_hash at this revision, so the backfill
+    # writes the same hashes however the application's normalization changes later
+    normalized = [
+        " ".join(unicodedata.normalize("NFKC", value or "").split()).casefold()
+        for value in (problem_statement, option_1, option_2, option_3, option_4)
+    ]
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+def _backfill_content_hashes() -> None:
+    connection = op.get_bind()
+    questions = sa.table(
+        "questions",
+        sa.column("id"), sa.column("exam_type_id"), sa.column("content_hash"),
+        sa.column("problem_statement"),
+        sa.column("option_1"), sa.column("option_2"), sa.column("option_3"), sa.column("option_4"),
+    )
+    seen = set(connection.execute(
+        sa.select(questions.c.exam_type_id, questions.c.content_hash).where(questions.c.content_hash.is_not(None))
+    ).tuples())
+    update = sa.update(questions).where(questions.c.id == sa.bindparam("question_id")).values(
+        content_hash=sa.bindparam("new_content_hash")
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(
+                questions.c.id, questions.c.exam_type_id, questions.c.problem_statement,
+                questions.c.option_1, questions.c.option_2, questions.c.option_3, questions.c.option_4,
+            )
+            .where(questions.c.content_hash.is_(None), questions.c.id > last_id)
+            .order_by(questions.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            key = (row.exam_type_id, _content_hash(*row[2:]))
+            if key in seen:
+                continue  # A later copy of content the exam type already has
+            seen.add(key)
+            params.append({"question_id": row.id, "new_content_hash": key[1]})
+        if params:
+            connection.execute(update, params)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("questions", "content_hash"):
+        op.add_column(
+            "questions", sa.Column("content_hash", sa.String(length=64), nullable=True), if_not_exists=_is_postgresql()
+        )
+    if not context.is_offline_mode():
+        _backfill_content_hashes()
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME, "questions", ["exam_type_id", "content_hash"],
+                unique=True, if_not_exists=True, postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(INDEX_NAME, "questions", ["exam_type_id", "content_hash"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name="questions", if_exists=True, postgresql_concurrently=True)
+    else:
+        op.drop_index(INDEX_NAME, table_name="questions", if_exists=True)
+    if _is_postgresql() or _has_column("questions", "content_hash"):
+        op.drop_column("questions", "content_hash", if_exists=_is_postgresql())
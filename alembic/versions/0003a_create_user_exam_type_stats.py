@@ -0,0 +1,40 @@
+"""Create user_exam_type_stats
+
+Revision ID: 0003a_create_user_exam_type_stats
+Revises: 0003_add_question_content_hash
+Create Date: 2026-10-17 00:00:00.000000
+
+Per-(user, exam type) answer totals read by GET /summary/ (app.models.UserExamTypeStats),
+bumped by crud_user_answer.create_user_answer. The table is created IF NOT EXISTS,
+since app/db/init_db.py may already have built it. Totals for answers submitted
+before this migration are filled in by app/db/rebuild_user_exam_type_stats.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003a_create_user_exam_type_stats'
+down_revision: Union[str, None] = '0003_add_question_content_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_exam_type_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("exam_type_id", sa.Integer(), primary_key=True), # 0: questions without an exam type
+        sa.Column("total_answers", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_correct", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("unique_questions", sa.Integer(), nullable=False, server_default="0"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_exam_type_stats", if_exists=True)
@@ -0,0 +1,79 @@
+"""Add user_question_progress.exam_type_id and the summary page indexes
+
+Revision ID: 0004_add_progress_exam_type_id
+Revises: 0003a_create_user_exam_type_stats
+Create Date: 2026-10-17 00:00:00.000000
+
+exam_type_id copies the question's exam type onto each (user, question) rollup
+row so GET /summary/ can page through one exam type, in any of its sort orders,
+as a single index range scan. It is backfilled from questions with one UPDATE
+(also emitted with --sql); app/db/rebuild_user_question_progress.py repairs it
+like the other rollup columns. The sort-key indexes are expression indexes over
+the same expressions as app.models.PROGRESS_INCORRECT_COUNT / PROGRESS_ACCURACY.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_add_progress_exam_type_id'
+down_revision: Union[str, None] = '0003a_create_user_exam_type_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns)
+SUMMARY_INDEXES = [
+    ("ix_user_question_progress_user_exam_type_question", ["user_id", "exam_type_id", "question_id"]),
+    ("ix_user_question_progress_user_exam_type_incorrect",
+     ["user_id", "exam_type_id", sa.text("(attempts - correct_count)"), "question_id"]),
+    ("ix_user_question_progress_user_exam_type_answered_at", ["user_id", "exam_type_id", "last_answered_at", "question_id"]),
+    ("ix_user_question_progress_user_exam_type_accuracy",
+     ["user_id", "exam_type_id", sa.text("(CAST(correct_count AS FLOAT) / attempts)"), "question_id"]),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _has_column(table: str, column: str) -> bool:
+    # SQLite has no ADD COLUMN IF NOT EXISTS, and init_db's create_all may already have
+    # added the column. With --sql there is nothing to inspect; PostgreSQL still gets IF NOT EXISTS.
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("user_question_progress", "exam_type_id"):
+        op.add_column(
+            "user_question_progress", sa.Column("exam_type_id", sa.Integer(), nullable=True), if_not_exists=_is_postgresql()
+        )
+    op.execute(
+        "UPDATE user_question_progress SET exam_type_id = "
+        "(SELECT questions.exam_type_id FROM questions WHERE questions.id = user_question_progress.question_id)"
+    )
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, columns in SUMMARY_INDEXES:
+                op.create_index(name, "user_question_progress", columns, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        for name, columns in SUMMARY_INDEXES:
+            op.create_index(name, "user_question_progress", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(SUMMARY_INDEXES):
+                op.drop_index(name, table_name="user_question_progress", if_exists=True, postgresql_concurrently=True)
+    else:
+        for name, _ in reversed(SUMMARY_INDEXES):
+            op.drop_index(name, table_name="user_question_progress", if_exists=True)
+    if _is_postgresql() or _has_column("user_question_progress", "exam_type_id"):
+        op.drop_column("user_question_progress", "exam_type_id", if_exists=_is_postgresql())
@@ -0,0 +1,74 @@
+"""Add the spaced-repetition review schedule to user_question_progress
+
+Revision ID: 0005_add_progress_review_schedule
+Revises: 0004_add_progress_exam_type_id
+Create Date: 2026-10-17 00:00:00.000000
+
+ease, interval_days, repetitions and due_at hold each (user, question) pair's
+review schedule (app/core/spaced_repetition.py). ix_user_question_progress_user_exam_type_due
+makes the most overdue review of a user and exam type the first entry of one index
+range, which /questions/next/ pops before anything else.
+
+Existing rows start from the initial schedule and fall due one day after their
+last answer. app/db/rebuild_user_question_progress.py replays the answers to
+compute each row's exact schedule.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_add_progress_review_schedule'
+down_revision: Union[str, None] = '0004_add_progress_exam_type_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUE_INDEX = "ix_user_question_progress_user_exam_type_due"
+DUE_INDEX_COLUMNS = ["user_id", "exam_type_id", "due_at", "question_id"]
+COLUMNS = [
+    sa.Column("ease", sa.Float(), nullable=False, server_default="2.5"),
+    sa.Column("interval_days", sa.Float(), nullable=False, server_default="0"),
+    sa.Column("repetitions", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("due_at", sa.DateTime(timezone=True), nullable=True),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _has_column(table: str, column: str) -> bool:
+    # SQLite has no ADD COLUMN IF NOT EXISTS, and init_db's create_all may already have
+    # added the column. With --sql there is nothing to inspect; PostgreSQL still gets IF NOT EXISTS.
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        if not _has_column("user_question_progress", column.name):
+            op.add_column("user_question_progress", column.copy(), if_not_exists=_is_postgresql())
+    if _is_postgresql():
+        op.execute("UPDATE user_question_progress SET due_at = last_answered_at + INTERVAL '1 day' WHERE due_at IS NULL")
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(DUE_INDEX, "user_question_progress", DUE_INDEX_COLUMNS, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        op.execute("UPDATE user_question_progress SET due_at = datetime(last_answered_at, '+1 day') WHERE due_at IS NULL")
+        op.create_index(DUE_INDEX, "user_question_progress", DUE_INDEX_COLUMNS, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.drop_index(DUE_INDEX, table_name="user_question_progress", if_exists=True, postgresql_concurrently=True)
+    else:
+        op.drop_index(DUE_INDEX, table_name="user_question_progress", if_exists=True)
+    for column in reversed(COLUMNS):
+        if _is_postgresql() or _has_column("user_question_progress", column.name):
+            op.drop_column("user_question_progress", column.name, if_exists=_is_postgresql())
@@ -0,0 +1,47 @@
+"""Create import_jobs
+
+Revision ID: 0006_create_import_jobs
+Revises: 0005_add_progress_review_schedule
+Create Date: 2026-10-17 00:00:00.000000
+
+Status and progress of background question imports (app.models.ImportJobRecord),
+so a poll can be answered by any worker process and survives restarts. The table
+is created IF NOT EXISTS, since app/db/init_db.py may already have built it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_create_import_jobs'
+down_revision: Union[str, None] = '0005_add_progress_review_schedule'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.String(length=32), primary_key=True),
+        sa.Column("exam_type_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("rows_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_import_jobs_created_at", "import_jobs", ["created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_import_jobs_created_at", table_name="import_jobs", if_exists=True)
+    op.drop_table("import_jobs", if_exists=True)
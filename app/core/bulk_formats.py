@@ -0,0 +1,134 @@
+"""
+Line-oriented bulk formats for question import/export: NDJSON and CSV.
+
+Unlike a JSON array, every line (NDJSON) or row (CSV) stands on its own, so a
+malformed line only fails that row, and both producer and consumer can work
+incrementally and resume from a row index. The format is picked from the
+upload's Content-Type (import) or the Accept header (export).
+"""
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+JSON = "json"
+NDJSON = "ndjson"
+CSV = "csv"
+
+MEDIA_TYPES = {JSON: "application/json", NDJSON: "application/x-ndjson", CSV: "text/csv"}
+FILE_EXTENSIONS = {JSON: ".json", NDJSON: ".ndjson", CSV: ".csv"}
+
+_FORMATS_BY_MEDIA_TYPE = {
+    "application/json": JSON,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/x-jsonlines": NDJSON,
+    "text/csv": CSV,
+    "application/csv": CSV,
+}
+_FORMATS_BY_EXTENSION = {".json": JSON, ".ndjson": NDJSON, ".jsonl": NDJSON, ".csv": CSV}
+
+
+class RowError:
+    """Stands in for a row that could not be parsed; the rest of the file is still read."""
+
+    def __init__(self, message: str, data: Optional[dict] = None):
+        self.message = message
+        self.data = data
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def import_format_for(content_type: Optional[str], filename: Optional[str] = None) -> str:
+    """Format of an upload: by its Content-Type, else by file extension, else JSON."""
+    fmt = _FORMATS_BY_MEDIA_TYPE.get(_media_type(content_type or ""))
+    if fmt is None and filename:
+        fmt = _FORMATS_BY_EXTENSION.get(("." + filename.rsplit(".", 1)[-1].lower()) if "." in filename else "")
+    return fmt or JSON
+
+
+def export_format_for(accept: Optional[str]) -> str:
+    """First format named in an Accept header (q-values are not weighed); JSON by default."""
+    for media_range in (accept or "").split(","):
+        fmt = _FORMATS_BY_MEDIA_TYPE.get(_media_type(media_range))
+        if fmt is not None:
+            return fmt
+    return JSON
+
+
+def iter_ndjson(stream: BinaryIO) -> Iterator[Tuple[int, Union[Any, RowError]]]:
+    """
+    Yields (line_index, decoded value or RowError) per non-blank line. line_index is the
+    0-based physical line number, so blank lines are skipped but still counted.
+    """
+    for line_index, raw_line in enumerate(stream):
+        if line_index == 0:
+            raw_line = raw_line.removeprefix(b"\xef\xbb\xbf") # UTF-8 BOM
+        if not raw_line.strip():
+            continue
+        try:
+            yield line_index, json.loads(raw_line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            yield line_index, RowError(f"Invalid JSON line: {e}")
+
+
+def iter_csv(stream: BinaryIO, optional_fields: Iterable[str] = ()) -> Iterator[Union[dict, RowError]]:
+    """
+    Yields one dict per CSV data row, keyed by the header row. Empty cells in
+    `optional_fields` become None (CSV cannot tell an empty string from a missing value).
+    A row the csv module rejects (e.g. a field over csv.field_size_limit()) becomes a
+    RowError and reading goes on with the next row; invalid UTF-8 ends the file.
+    """
+    optional_fields = set(optional_fields)
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                yield RowError(f"Invalid CSV row: {e}")
+                continue
+            if None in row:
+                yield RowError("Row has more cells than the header.", {k: v for k, v in row.items() if k is not None})
+                continue
+            yield {key: (None if value == "" and key in optional_fields else value) for key, value in row.items()}
+    except UnicodeDecodeError as e:
+        yield RowError(f"Invalid CSV: {e}")
+    finally:
+        text.detach() # Leave the underlying upload open for its owner to close
+
+
+def encode_ndjson(items: Iterable[Any], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encodes each item as one JSON line, yielding UTF-8 chunks."""
+    parts: List[str] = []
+    size = 0
+    for item in items:
+        line = json.dumps(item, ensure_ascii=False) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def encode_csv(items: Iterable[dict], fieldnames: List[str], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encodes dict items as CSV rows under a header row, yielding UTF-8 chunks."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    for item in items:
+        writer.writerow(item)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,210 @@
+"""
+Cross-worker invalidation of the per-process caches (question banks, users, exam types)
+over PostgreSQL LISTEN/NOTIFY.
+
+Each cache registers an evict handler for its kind of key, plus a reset handler
+that drops everything. Crud code calls invalidate(db, kind, key) before committing
+a write. When the session commits, the key is sent with pg_notify on
+CACHE_INVALIDATION_CHANNEL inside the same transaction, so it is delivered only
+if the write commits. The key is also evicted locally, right after the commit. On
+rollback nothing is sent. Every worker runs an InvalidationListener thread on its
+own connection, which evicts the keys other processes send. After (re)connecting,
+the listener resets every cache, because notifications sent while it was
+disconnected are lost.
+
+On other databases (SQLite) only the local eviction happens.
+"""
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from app.core.config import CACHE_INVALIDATION_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# Kinds of cached keys
+QUESTION_BANK = "question_bank" # exam_type_id
+USER = "user" # user id
+EXAM_TYPE = "exam_type" # exam_type_id
+
+# Marks this process's own notifications, which were already applied at commit
+PROCESS_ID = uuid.uuid4().hex
+# Keys per NOTIFY; PostgreSQL caps a payload at 8000 bytes
+MAX_KEYS_PER_NOTIFY = 500
+_PENDING = "cache_invalidation_pending"
+
+_handlers: Dict[str, Tuple[Callable[[Hashable], None], Callable[[], None]]] = {}
+
+
+def register(kind: str, evict: Callable[[Hashable], None], reset: Callable[[], None]) -> None:
+    """Registers a cache: evict(key) drops one key, reset() drops everything."""
+    _handlers[kind] = (evict, reset)
+
+
+def invalidate(db: Session, kind: str, key: Optional[Hashable]) -> None:
+    """Evicts key from every worker's `kind` cache once db's current transaction commits."""
+    if key is None:
+        return
+    db.info.setdefault(_PENDING, {}).setdefault(kind, set()).add(key)
+
+
+def apply(kind: str, keys: Iterable[Hashable]) -> None:
+    handler = _handlers.get(kind)
+    if handler is None:
+        return
+    for key in keys:
+        handler[0](key)
+
+
+def reset_all() -> None:
+    for _, reset in _handlers.values():
+        reset()
+
+
+def _notify_payloads(pending: Dict[str, set]) -> Iterable[str]:
+    sent_at = time.time()
+    for kind, keys in pending.items():
+        keys = sorted(keys)
+        for start in range(0, len(keys), MAX_KEYS_PER_NOTIFY):
+            yield json.dumps({
+                "origin": PROCESS_ID, "kind": kind, "keys": keys[start:start + MAX_KEYS_PER_NOTIFY], "sent_at": sent_at
+            })
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pending(session: Session) -> None:
+    pending = session.info.get(_PENDING)
+    if not pending or session.get_bind().dialect.name != "postgresql":
+        return
+    for payload in _notify_payloads(pending):
+        session.execute(sql_select(func.pg_notify(CACHE_INVALIDATION_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    for kind, keys in (pending or {}).items():
+        apply(kind, keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+listener: Optional["InvalidationListener"] = None # This process's, once start_listener() ran
+
+
+class InvalidationListener:
+    """
+    Background thread that LISTENs on the invalidation channel over a dedicated
+    psycopg2 connection (taken out of the engine's pool) and applies the keys
+    notified by other processes. It reconnects after errors.
+    """
+
+    def __init__(
+        self, engine, channel: str = CACHE_INVALIDATION_CHANNEL, poll_interval: float = 1.0,
+        reconnect_delay: float = 1.0, ignore_origin: Optional[str] = PROCESS_ID,
+    ):
+        self.engine = engine
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.ignore_origin = ignore_origin
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.listening = threading.Event()
+        self.received = 0
+        self.reconnects = 0
+        self.last_delay_ms: Optional[float] = None
+
+    def start(self) -> "InvalidationListener":
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                connection.detach() # Held for the thread's lifetime, not returned to the pool
+                self._listen(connection.driver_connection)
+            except Exception:
+                logger.exception("Cache invalidation listener lost its connection; reconnecting")
+            finally:
+                self.listening.clear()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self.reconnects += 1
+            self._stopping.wait(self.reconnect_delay)
+
+    def _listen(self, connection) -> None:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        reset_all() # Anything sent while not listening was missed
+        self.listening.set()
+        while not self._stopping.is_set():
+            if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                self.dispatch(connection.notifies.pop(0).payload)
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            kind, keys = message["kind"], message["keys"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed cache invalidation payload: {payload!r}")
+            return
+        if self.ignore_origin is not None and message.get("origin") == self.ignore_origin:
+            return
+        self.received += 1
+        if "sent_at" in message:
+            self.last_delay_ms = (time.time() - message["sent_at"]) * 1000
+        apply(kind, keys)
+
+    def stats(self) -> dict:
+        return {
+            "channel": self.channel,
+            "listening": self.listening.is_set(),
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "last_delay_ms": self.last_delay_ms,
+        }
+
+
+def start_listener(engine) -> Optional[InvalidationListener]:
+    """Starts a listener for a psycopg2 PostgreSQL engine; None (local eviction only) for anything else."""
+    if engine.dialect.name != "postgresql" or engine.dialect.driver != "psycopg2":
+        if engine.dialect.name == "postgresql":
+            logger.warning(f"Cross-worker cache invalidation needs psycopg2, not {engine.dialect.driver}")
+        return None
+    global listener
+    listener = InvalidationListener(engine).start()
+    return listener
+
+
+def stop_listener() -> None:
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
@@ -14,6 +14,66 @@ SECRET_KEY = os.getenv("SECRET_KEY", "a_very_secret_key_that_should_be_changed")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+# Size of the dedicated thread pool that runs bcrypt verification for logins.
+# Bounded so a login burst cannot occupy every worker thread (or CPU core) of the process.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+
+# Worker processes used to hash passwords for bulk user creation (0 = one per CPU).
+# Processes rather than threads so a large cohort is hashed on every core.
+BULK_HASH_PROCESSES = int(os.getenv("BULK_HASH_PROCESSES", 0))
+# Most users one POST /users/bulk request may create. Any authenticated user can call it,
+# so this bounds the bcrypt work one request can queue; app/db/bulk_create_users.py has no cap.
+BULK_USERS_MAX_PER_REQUEST = int(os.getenv("BULK_USERS_MAX_PER_REQUEST", 500))
+
+# Background question import jobs (POST /exam-types/{id}/import-jobs/). Each running job
+# holds one DB connection, so IMPORT_JOB_WORKERS bounds how many the imports can take from
+# quiz traffic; IMPORT_JOB_MAX_ROWS_PER_SECOND (0 = unlimited) further paces each job.
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 2))
+IMPORT_JOB_MAX_QUEUED = int(os.getenv("IMPORT_JOB_MAX_QUEUED", 20))
+IMPORT_JOB_MAX_ROWS_PER_SECOND = float(os.getenv("IMPORT_JOB_MAX_ROWS_PER_SECOND", 0))
+IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR") or None # Defaults to the system temp dir
+# Job status lives in the import_jobs table, so any worker can answer a poll. The process
+# running a job refreshes its heartbeat; a queued or running job whose heartbeat is older than
+# IMPORT_JOB_STALE_SECONDS is reported as failed (its process stopped). IMPORT_JOB_HISTORY
+# finished jobs are kept for polling.
+IMPORT_JOB_STALE_SECONDS = float(os.getenv("IMPORT_JOB_STALE_SECONDS", 120))
+IMPORT_JOB_HISTORY = int(os.getenv("IMPORT_JOB_HISTORY", 100))
+
+# Per-process cache of authenticated users, keyed by the user id carried in the token.
+# Lets protected endpoints authenticate without a users query; entries expire after the TTL.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+
+# Per-process LRU of already-verified access tokens (keyed by SHA-256 of the token),
+# so a client reusing one token skips signature verification until it expires. 0 disables it.
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+
+# Per-process cache of each exam type's question bank, serving GET /questions/{id}/ and
+# /questions/next/ question reads. Bounded by the banks' estimated size in bytes, least
+# recently used exam types evicted first; 0 disables it.
+QUESTION_CACHE_MAX_BYTES = int(os.getenv("QUESTION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Each cached bank's incorrect-rate sampler (app/core/question_sampler.py) follows this
+# process's answers and is rebuilt from question_stats after this long, for everyone else's.
+QUESTION_SAMPLER_MAX_AGE_SECONDS = float(os.getenv("QUESTION_SAMPLER_MAX_AGE_SECONDS", 300))
+
+# PostgreSQL NOTIFY channel that carries cache invalidations between worker processes
+# (app/core/cache_invalidation.py). Workers sharing a database must use the same channel.
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+
+# Database access mode. When true, the quiz routers (/questions, /summary) use an async
+# engine (asyncpg for PostgreSQL, aiosqlite for SQLite) instead of sync sessions run in
+# the thread pool. ASYNC_DATABASE_URL overrides the URL derived from DATABASE_URL.
+DB_ASYNC_MODE = os.getenv("DB_ASYNC_MODE", "false").lower() in ("1", "true", "yes")
+
+# Connection pool settings, applied to both the sync and the async engine (each
+# uvicorn worker process has its own pool). Defaults match SQLAlchemy's QueuePool.
+# Size against /metrics/db-pool: sustained checkout waits or overflow mean the pool is too small.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30)) # Seconds to wait for a connection before failing
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1)) # Seconds before a connection is replaced; -1 disables
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
 # Ensure SECRET_KEY is not the default in a production-like environment
 # if os.getenv("ENVIRONMENT") == "production" and SECRET_KEY == "a_very_secret_key_that_should_be_changed":
 #     raise ValueError("Default SECRET_KEY is used in production. Please set a strong SECRET_KEY environment variable.")
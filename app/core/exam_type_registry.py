@@ -0,0 +1,91 @@
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core import cache_invalidation
+
+
+class ExamTypeRegistry:
+    """
+    Per-process map of exam type id <-> name, which is all the quiz, summary and
+    import/export paths need to validate an exam type. Loaded whole on first use (or
+    at startup); updates and deletes evict their id in every worker once they commit
+    (cache_invalidation.EXAM_TYPE). A miss is never taken as "does not exist": the
+    caller checks the database, since another worker may just have created it.
+    Every eviction bumps a generation, and a load or put that began under an older
+    generation is refused, so it cannot bring back a just-evicted entry.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._loaded = False
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def load(self, rows: Iterable[Tuple[int, str]], generation: int) -> bool:
+        """Replaces the contents with every (id, name); returns whether it was current."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._names = dict(rows)
+            self._ids = {name: exam_type_id for exam_type_id, name in self._names.items()}
+            self._loaded = True
+            return True
+
+    def put(self, exam_type_id: int, name: str, generation: int) -> bool:
+        with self._lock:
+            if not self._loaded or generation != self._generation:
+                return False
+            self._names[exam_type_id] = name
+            self._ids[name] = exam_type_id
+            return True
+
+    def name(self, exam_type_id: int) -> Optional[str]:
+        with self._lock:
+            name = self._names.get(exam_type_id)
+            if name is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return name
+
+    def id_for_name(self, name: str) -> Optional[int]:
+        with self._lock:
+            exam_type_id = self._ids.get(name)
+            if exam_type_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return exam_type_id
+
+    def evict(self, exam_type_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            name = self._names.pop(exam_type_id, None)
+            if name is not None and self._ids.get(name) == exam_type_id:
+                del self._ids[name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._names.clear()
+            self._ids.clear()
+            self._loaded = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"loaded": self._loaded, "exam_types": len(self._names), "hits": self.hits, "misses": self.misses}
+
+
+exam_type_registry = ExamTypeRegistry()
+cache_invalidation.register(cache_invalidation.EXAM_TYPE, exam_type_registry.evict, exam_type_registry.clear)
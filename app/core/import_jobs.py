@@ -0,0 +1,242 @@
+"""
+Background jobs for question imports.
+
+An upload is spooled to a temporary file and handed to a small, bounded
+thread pool in the worker process that received it; the request returns a job
+id straight away and clients poll the job's progress. The pool size caps how
+many DB connections imports can hold at once, and the queue limit rejects new
+jobs instead of piling them up. Jobs commit chunk by chunk (import_questions'
+commit_each_chunk), so a paced job never sleeps inside a transaction.
+
+Job status and progress are written to the import_jobs table (crud_import_job),
+so a poll can land on any worker. While a job is queued or running, the
+process that owns it refreshes its heartbeat from a background thread; if that
+process stops (a restart, a crash), the heartbeat goes stale and the job is
+reported as failed instead of staying "running" forever.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    IMPORT_JOB_WORKERS, IMPORT_JOB_MAX_QUEUED, IMPORT_JOB_MAX_ROWS_PER_SECOND, IMPORT_SPOOL_DIR,
+    IMPORT_JOB_STALE_SECONDS, IMPORT_JOB_HISTORY,
+)
+from app.crud import crud_import_job, crud_question_import
+from app.crud.crud_import_job import QUEUED, RUNNING, SUCCEEDED, FAILED, ACTIVE_STATUSES
+from app.models.models import ImportJobRecord
+from app.schemas.schemas import ImportJobStatus, ImportSummary
+
+logger = logging.getLogger(__name__)
+
+INTERRUPTED_ERROR = "The worker process running this import stopped; chunks it had committed were kept."
+
+
+class ImportQueueFullError(Exception):
+    """Too many import jobs are already queued or running."""
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands timestamps back without a timezone; they were written in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def job_status(record: ImportJobRecord, stale_seconds: float = IMPORT_JOB_STALE_SECONDS) -> ImportJobStatus:
+    """The API view of a stored job; an active job with a stale heartbeat is reported as failed."""
+    now = datetime.now(timezone.utc)
+    started_at, finished_at = _as_utc(record.started_at), _as_utc(record.finished_at)
+    status, error = record.status, record.error
+    if status in ACTIVE_STATUSES and (now - _as_utc(record.heartbeat_at)).total_seconds() > stale_seconds:
+        status, error = FAILED, INTERRUPTED_ERROR
+    elapsed = ((finished_at or now) - started_at).total_seconds() if started_at else 0.0
+    rows = record.rows_done + record.rows_failed
+    return ImportJobStatus(
+        job_id=record.id,
+        exam_type_id=record.exam_type_id,
+        status=status,
+        rows_done=record.rows_done,
+        rows_failed=record.rows_failed,
+        rows_per_second=round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        created_at=_as_utc(record.created_at),
+        started_at=started_at,
+        finished_at=finished_at,
+        summary=ImportSummary.model_validate_json(record.summary) if record.summary else None,
+        error=error,
+    )
+
+
+class ImportJob:
+    """A job queued or running in this process (its stored row is the source of truth for polls)."""
+
+    def __init__(self, exam_type_id: int, spool_path: Optional[str], fmt: str, on_duplicate: str = crud_question_import.SKIP):
+        self.job_id = uuid.uuid4().hex
+        self.exam_type_id = exam_type_id
+        self.spool_path = spool_path
+        self.fmt = fmt
+        self.on_duplicate = on_duplicate
+        self.status = QUEUED
+        self.rows_done = 0
+        self.rows_failed = 0
+        self.summary: Optional[ImportSummary] = None
+        self.error: Optional[str] = None
+        self._started_monotonic: Optional[float] = None
+
+
+class ImportJobManager:
+    def __init__(
+        self,
+        max_workers: int = IMPORT_JOB_WORKERS,
+        max_queued: int = IMPORT_JOB_MAX_QUEUED,
+        max_rows_per_second: float = IMPORT_JOB_MAX_ROWS_PER_SECOND,
+        spool_dir: Optional[str] = IMPORT_SPOOL_DIR,
+        max_finished: int = IMPORT_JOB_HISTORY,
+        heartbeat_seconds: float = IMPORT_JOB_STALE_SECONDS / 4,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.max_rows_per_second = max_rows_per_second
+        self.spool_dir = spool_dir
+        self.max_finished = max_finished
+        self.heartbeat_seconds = heartbeat_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, ImportJob] = {} # Queued or running in this process
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def spool(self, source: BinaryIO) -> str:
+        """Copies an upload to a temporary file in chunks and returns its path."""
+        fd, path = tempfile.mkstemp(prefix="question-import-", dir=self.spool_dir)
+        with os.fdopen(fd, "wb") as spooled:
+            shutil.copyfileobj(source, spooled, 1024 * 1024)
+        return path
+
+    def submit(
+        self,
+        exam_type_id: int,
+        source: BinaryIO,
+        fmt: str,
+        session_factory: Callable[[], Session],
+        on_duplicate: str = crud_question_import.SKIP,
+    ) -> ImportJob:
+        """
+        Spools `source`, stores the job and queues its import. session_factory opens the
+        sessions the job runs and reports in. Raises ImportQueueFullError when max_queued
+        jobs are already pending in this process.
+        """
+        job = ImportJob(exam_type_id, None, fmt, on_duplicate)
+        with self._lock:
+            # The check and the registration share one critical section, so concurrent
+            # submits cannot both take the last slot; the job holds it while it spools.
+            if len(self._jobs) >= self.max_queued:
+                raise ImportQueueFullError(f"{self.max_queued} import jobs are already queued or running.")
+            self._jobs[job.job_id] = job
+        try:
+            job.spool_path = self.spool(source)
+            db = session_factory()
+            try:
+                crud_import_job.create_import_job(db, job.job_id, exam_type_id)
+                crud_import_job.delete_finished_import_jobs(db, keep=self.max_finished)
+            finally:
+                db.close()
+        except BaseException:
+            with self._lock:
+                del self._jobs[job.job_id]
+            if job.spool_path is not None:
+                self._remove_spool(job)
+            raise
+        with self._lock:
+            self._session_factory = session_factory
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="question-import")
+            self._executor.submit(self._run, job, session_factory)
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="question-import-heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+        return job
+
+    def _heartbeat(self) -> None:
+        """Refreshes this process's active jobs until it has none left."""
+        while True:
+            time.sleep(self.heartbeat_seconds)
+            with self._lock:
+                job_ids, session_factory = list(self._jobs), self._session_factory
+                if not job_ids:
+                    self._heartbeat_thread = None
+                    return
+            db = session_factory()
+            try:
+                crud_import_job.touch_import_jobs(db, job_ids)
+            except Exception:
+                logger.exception("Could not refresh the import job heartbeats")
+            finally:
+                db.close()
+
+    @staticmethod
+    def _remove_spool(job: ImportJob) -> None:
+        try:
+            os.remove(job.spool_path)
+        except OSError:
+            pass
+
+    def _on_progress(self, db: Session, job: ImportJob, rows_done: int, rows_failed: int) -> None:
+        job.rows_done, job.rows_failed = rows_done, rows_failed
+        crud_import_job.update_import_job_progress(db, job.job_id, rows_done, rows_failed)
+        if self.max_rows_per_second > 0:
+            # Sleep until this job is back under its row budget. Jobs commit each chunk
+            # before this runs, so the wait holds no transaction, locks or snapshot.
+            ahead = (rows_done + rows_failed) / self.max_rows_per_second - (time.monotonic() - job._started_monotonic)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    def _run(self, job: ImportJob, session_factory: Callable[[], Session]) -> None:
+        job.status = RUNNING
+        job._started_monotonic = time.monotonic()
+        status = FAILED
+        db = session_factory()
+        try:
+            crud_import_job.start_import_job(db, job.job_id)
+            with open(job.spool_path, "rb") as stream:
+                summary = crud_question_import.import_questions(
+                    db, exam_type_id=job.exam_type_id, stream=stream, fmt=job.fmt, on_duplicate=job.on_duplicate,
+                    on_progress=lambda done, failed: self._on_progress(db, job, done, failed), commit_each_chunk=True,
+                )
+            job.summary = summary
+            job.rows_done = summary.imported_count + summary.updated_count + summary.skipped_count
+            job.rows_failed = summary.failed_count
+            status = SUCCEEDED
+        except Exception as e:
+            logger.exception(f"Import job {job.job_id} failed")
+            db.rollback()
+            job.error = str(e)
+        try:
+            crud_import_job.finish_import_job(
+                db, job.job_id, status, job.rows_done, job.rows_failed,
+                summary=job.summary.model_dump_json() if job.summary else None, error=job.error,
+            )
+        except Exception:
+            logger.exception(f"Could not record the outcome of import job {job.job_id}")
+        finally:
+            db.close()
+            self._remove_spool(job)
+            with self._lock:
+                del self._jobs[job.job_id]
+            job.status = status # Last, so a finished job is never seen without its results
+
+
+import_job_manager = ImportJobManager()
@@ -0,0 +1,135 @@
+"""
+Incremental parsing and encoding of top-level JSON arrays.
+
+Used by the question import and export so neither an upload nor a download is
+ever held in memory as a whole: input is read in fixed-size chunks and each
+array element is decoded as soon as it is complete; output is encoded element
+by element and handed out in chunks of roughly `chunk_size` bytes.
+"""
+import codecs
+import json
+import re
+import zlib
+from typing import Any, BinaryIO, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"\s*")
+
+# Largest array element (in decoded characters) the reader buffers while waiting for it to
+# complete. Past this, an element that still does not parse is reported as invalid instead
+# of reading the rest of the upload into memory looking for its end.
+MAX_ELEMENT_CHARS = 1024 * 1024
+
+
+class InvalidJSONError(ValueError):
+    """The stream is not valid JSON."""
+
+
+class NotAJSONArrayError(ValueError):
+    """The stream is valid JSON, but its top-level value is not an array."""
+
+
+class _ArrayReader:
+    def __init__(self, stream: BinaryIO, chunk_size: int, max_element_chars: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.max_element_chars = max_element_chars
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")() # Tolerates a BOM
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        """Drops the consumed prefix of the buffer and appends the next chunk."""
+        data = self.stream.read(self.chunk_size)
+        try:
+            text = self.text_decoder.decode(data, final=not data)
+        except UnicodeDecodeError as e:
+            raise InvalidJSONError(f"Invalid UTF-8: {e}") from e
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        self.eof = not data
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input), without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def value(self) -> Any:
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise InvalidJSONError(e.msg) from e
+                if len(self.buffer) - self.pos > self.max_element_chars:
+                    raise InvalidJSONError(f"{e.msg} (in an array element over {self.max_element_chars} characters)") from e
+                self.fill()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                self.fill() # A number or literal may continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(
+    stream: BinaryIO, chunk_size: int = 64 * 1024, max_element_chars: int = MAX_ELEMENT_CHARS
+) -> Iterator[Any]:
+    """
+    Yields the elements of the JSON array in `stream` one at a time.
+    Raises NotAJSONArrayError if the document is some other JSON value and
+    InvalidJSONError on malformed input (possibly after yielding earlier elements),
+    including an element that is still incomplete after max_element_chars.
+    """
+    reader = _ArrayReader(stream, chunk_size, max_element_chars)
+    if reader.peek() != "[":
+        reader.value() # Raises InvalidJSONError unless this is some other JSON value
+        raise NotAJSONArrayError("JSON content is not an array.")
+    reader.pos += 1
+
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            reader.peek()
+            yield reader.value()
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise InvalidJSONError("Expecting ',' delimiter or ']' between array elements")
+
+    if reader.peek():
+        raise InvalidJSONError("Extra data after the JSON array")
+
+
+def encode_json_array(items: Iterable[Any], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encodes `items` as a JSON array (one element per line), yielding UTF-8 chunks."""
+    parts = ["["]
+    size = 1
+    separator = "\n"
+    for item in items:
+        part = separator + json.dumps(item, ensure_ascii=False)
+        separator = ",\n"
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    parts.append("\n]\n")
+    yield "".join(parts).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compresses a stream of byte chunks incrementally (a single gzip member)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits=31: gzip header and trailer
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,184 @@
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core import cache_invalidation
+from app.core.config import QUESTION_CACHE_MAX_BYTES
+from app.models.models import Question
+
+# Question columns held by a bank, in row order (see QuestionBank)
+QUESTION_BANK_COLUMNS = (
+    "id", "problem_statement", "option_1", "option_2", "option_3", "option_4", "correct_answer", "explanation",
+)
+_TEXT_COLUMNS = QUESTION_BANK_COLUMNS[1:6] + QUESTION_BANK_COLUMNS[7:]
+
+
+class QuestionBank:
+    """
+    Read-only snapshot of one exam type's questions, stored column-wise: question ids
+    and correct answers in arrays, each text column in a tuple, all indexed by slot,
+    plus an id -> slot map. Stamped with the cache version it was loaded under.
+    `sampler` (the review tier's IncorrectRateSampler) is attached on first use.
+    """
+    __slots__ = ("exam_type_id", "version", "ids", "correct_answers", "texts", "slots", "nbytes", "sampler")
+
+    def __init__(self, exam_type_id: int, version: Tuple[int, int], rows: Iterable[tuple]):
+        rows = list(rows)
+        self.exam_type_id = exam_type_id
+        self.version = version
+        self.ids = array("q", (row[0] for row in rows))
+        self.correct_answers = array("b", (row[6] for row in rows))
+        self.texts = {column: tuple(row[QUESTION_BANK_COLUMNS.index(column)] for row in rows) for column in _TEXT_COLUMNS}
+        self.slots: Dict[int, int] = {question_id: slot for slot, question_id in enumerate(self.ids)}
+        self.nbytes = self._estimate_nbytes()
+        self.sampler = None
+
+    def _estimate_nbytes(self) -> int:
+        nbytes = self.ids.buffer_info()[1] * self.ids.itemsize + len(self.correct_answers)
+        nbytes += sys.getsizeof(self.slots) + sum(sys.getsizeof(question_id) for question_id in self.slots)
+        for values in self.texts.values():
+            nbytes += sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values if value is not None)
+        return nbytes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self.slots
+
+    def question(self, slot: int) -> Question:
+        """A fresh transient Question for the slot, so nothing is shared between sessions."""
+        return Question(
+            id=self.ids[slot],
+            exam_type_id=self.exam_type_id,
+            correct_answer=self.correct_answers[slot],
+            **{column: values[slot] for column, values in self.texts.items()}
+        )
+
+    def get(self, question_id: int) -> Optional[Question]:
+        slot = self.slots.get(question_id)
+        return None if slot is None else self.question(slot)
+
+
+class QuestionBankCache:
+    """
+    Per-process LRU of QuestionBanks keyed by exam_type_id, bounded by the banks'
+    estimated size in bytes. Every exam type has a version that is bumped when a
+    change to its questions commits (see cache_invalidation.QUESTION_BANK); bumping
+    drops the cached bank, and a bank loaded under an older version is refused, so a
+    load racing a write cannot repopulate stale rows. clear() starts a new epoch,
+    which likewise refuses every bank loaded before it.
+    """
+
+    def __init__(self, max_bytes: int = QUESTION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._banks: "OrderedDict[int, QuestionBank]" = OrderedDict()
+        self._epoch = 0
+        self._versions: Dict[int, int] = {}
+        self._oversized: Dict[int, Tuple[int, int]] = {} # exam_type_id -> version whose bank exceeded max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _version(self, exam_type_id: int) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(exam_type_id, 0)
+
+    def version(self, exam_type_id: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._version(exam_type_id)
+
+    def is_oversized(self, exam_type_id: int) -> bool:
+        """True while the exam type's current bank is known not to fit in the cache."""
+        with self._lock:
+            return self._oversized.get(exam_type_id) == self._version(exam_type_id)
+
+    def get(self, exam_type_id: int) -> Optional[QuestionBank]:
+        with self._lock:
+            bank = self._banks.get(exam_type_id)
+            if bank is None:
+                self.misses += 1
+                return None
+            self._banks.move_to_end(exam_type_id)
+            self.hits += 1
+            return bank
+
+    def peek(self, exam_type_id: int) -> Optional[QuestionBank]:
+        """get() without touching the LRU order or the hit counters."""
+        with self._lock:
+            return self._banks.get(exam_type_id)
+
+    def find_question(self, question_id: int) -> Optional[Question]:
+        with self._lock:
+            for bank in self._banks.values():
+                if question_id in bank:
+                    self._banks.move_to_end(bank.exam_type_id)
+                    self.hits += 1
+                    break
+            else:
+                self.misses += 1
+                return None
+        return bank.get(question_id)
+
+    def put(self, bank: QuestionBank) -> bool:
+        """Caches the bank unless its version is stale or it cannot fit; returns whether it was cached."""
+        with self._lock:
+            if not self.enabled or bank.version != self._version(bank.exam_type_id):
+                return False
+            if bank.nbytes > self.max_bytes:
+                self._oversized[bank.exam_type_id] = bank.version
+                return False
+            previous = self._banks.pop(bank.exam_type_id, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._banks[bank.exam_type_id] = bank
+            self._bytes += bank.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._banks.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+            return True
+
+    def bump_version(self, exam_type_id: Optional[int]) -> None:
+        """Drops the exam type's bank; called once a change to its questions commits."""
+        if exam_type_id is None:
+            return
+        with self._lock:
+            self._versions[exam_type_id] = self._versions.get(exam_type_id, 0) + 1
+            bank = self._banks.pop(exam_type_id, None)
+            if bank is not None:
+                self._bytes -= bank.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._banks.clear()
+            self._oversized.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "banks": len(self._banks),
+                "questions": sum(len(bank) for bank in self._banks.values()),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+question_bank_cache = QuestionBankCache()
+cache_invalidation.register(
+    cache_invalidation.QUESTION_BANK, question_bank_cache.bump_version, question_bank_cache.clear
+)
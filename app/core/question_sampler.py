@@ -0,0 +1,139 @@
+"""
+Weighted sampling of an exam type's questions by global incorrect rate, for the
+review tier of /questions/next/.
+
+IncorrectRateSampler keeps one integer weight per question bank slot (the incorrect
+rate scaled by WEIGHT_SCALE) in a Fenwick tree: a draw and a weight update are
+both O(log n). It is built from question_stats when first needed and hangs off
+the QuestionBank, so it shares the bank's version and eviction. Answers committed
+in this process update it right away; it is rebuilt after QUESTION_SAMPLER_MAX_AGE_SECONDS
+to take in other workers' answers.
+
+All draws use one module-level generator, as do the uniform picks of
+crud_question's cached /questions/next/ path (sample, choice, randrange);
+seed() makes them reproducible.
+"""
+import random
+import threading
+import time
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.config import QUESTION_SAMPLER_MAX_AGE_SECONDS
+
+WEIGHT_SCALE = 1 << 16
+
+_random = random.Random()
+
+
+def seed(value) -> None:
+    """Seeds every sampler's draws (tests, benchmarks)."""
+    _random.seed(value)
+
+
+def sample(population, k: int) -> list:
+    return _random.sample(population, k)
+
+
+def choice(seq):
+    return _random.choice(seq)
+
+
+def randrange(stop: int) -> int:
+    return _random.randrange(stop)
+
+
+def incorrect_rate_weight(total_answers: int, total_correct: int) -> int:
+    if total_answers <= 0:
+        return 0
+    return round((total_answers - total_correct) * WEIGHT_SCALE / total_answers)
+
+
+class FenwickTree:
+    """Binary indexed tree of non-negative integer weights: prefix sums, updates and weighted search in O(log n)."""
+    __slots__ = ("_tree",)
+
+    def __init__(self, weights: Iterable[int]):
+        tree = array("q", [0])
+        tree.extend(weights)
+        size = len(tree) - 1
+        for i in range(1, size + 1): # O(n) build: push each node into its parent
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int) -> None:
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """Sum of the weights of indexes [0, end)."""
+        total = 0
+        while end > 0:
+            total += self._tree[end]
+            end -= end & -end
+        return total
+
+    def total(self) -> int:
+        return self.prefix_sum(len(self))
+
+    def find(self, target: int) -> int:
+        """The index i with prefix_sum(i) <= target < prefix_sum(i + 1); target must be below total()."""
+        index = 0
+        step = 1 << (len(self).bit_length() - 1) if len(self) else 0
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                index = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return index
+
+
+class IncorrectRateSampler:
+    """Draws a bank's slots with probability proportional to their questions' global incorrect rate."""
+
+    def __init__(self, stats: List[Tuple[int, int]]):
+        """stats: (total_answers, total_correct) per bank slot."""
+        self._totals = array("q", (total for total, _ in stats))
+        self._corrects = array("q", (correct for _, correct in stats))
+        self._weights = array("q", (incorrect_rate_weight(total, correct) for total, correct in stats))
+        self._tree = FenwickTree(self._weights)
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > QUESTION_SAMPLER_MAX_AGE_SECONDS
+
+    def weight(self, slot: int) -> int:
+        return self._weights[slot]
+
+    def record_answer(self, slot: int, is_correct: bool) -> None:
+        with self._lock:
+            self._totals[slot] += 1
+            self._corrects[slot] += is_correct
+            weight = incorrect_rate_weight(self._totals[slot], self._corrects[slot])
+            self._tree.add(slot, weight - self._weights[slot])
+            self._weights[slot] = weight
+
+    def draw(self, count: int) -> List[int]:
+        """count slots drawn independently (with replacement); empty when no question was ever answered incorrectly."""
+        with self._lock:
+            total = self._tree.total()
+            if total <= 0:
+                return []
+            return [self._tree.find(_random.randrange(total)) for _ in range(count)]
+
+    def choose(self, slots: List[int]) -> Optional[int]:
+        """One of the given slots, drawn by the same weights; None if none of them has weight."""
+        weights = [self._weights[slot] for slot in slots]
+        if not any(weights):
+            return None
+        return _random.choices(slots, weights)[0]
@@ -1,22 +1,73 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, PASSWORD_HASH_WORKERS, TOKEN_CACHE_MAX_ENTRIES,
+    BULK_HASH_PROCESSES,
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~250ms) and releases the GIL, so it runs on its own
+# bounded pool instead of the event loop or Starlette's shared request thread pool.
+password_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool, without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, verify_password, plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Below this many passwords, starting worker processes costs more than it saves
+PARALLEL_HASH_MIN_PASSWORDS = 8
+
+BULK_HASH_WORKERS = BULK_HASH_PROCESSES or os.cpu_count() or 1
+
+_bulk_hash_pool: Optional[ProcessPoolExecutor] = None
+_bulk_hash_pool_lock = threading.Lock()
+
+
+def _get_bulk_hash_pool() -> ProcessPoolExecutor:
+    global _bulk_hash_pool
+    with _bulk_hash_pool_lock:
+        if _bulk_hash_pool is None:
+            # spawn, not fork: the server process already runs threads (thread pools, DB pool)
+            _bulk_hash_pool = ProcessPoolExecutor(
+                max_workers=BULK_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _bulk_hash_pool
+
+
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    """get_password_hash for many passwords, spread across the bulk hashing process pool. Order is kept."""
+    if len(passwords) < PARALLEL_HASH_MIN_PASSWORDS:
+        return [get_password_hash(password) for password in passwords]
+    pool = _get_bulk_hash_pool()
+    chunksize = max(1, len(passwords) // (BULK_HASH_WORKERS * 4))
+    return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -28,12 +79,75 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[str]:
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens whose signature has already been verified, keyed by the
+    SHA-256 of the token string. Entries are dropped once the token's exp passes;
+    only successfully verified tokens that carry an exp are stored.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
+def decode_token_claims(token: str) -> Optional[dict]:
+    """Verified claims of a token ("sub", and "uid"/"ver" for tokens minted at login), or None."""
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: Optional[str] = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    verified_token_cache.put(token, payload)
+    return payload
+
+
+def decode_token(token: str) -> Optional[str]:
+    claims = decode_token_claims(token)
+    return claims["sub"] if claims is not None else None
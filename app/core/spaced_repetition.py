@@ -0,0 +1,42 @@
+"""
+SM-2 style review scheduling of (user, question) pairs, with binary grading: a
+correct answer counts as an easy recall, an incorrect one as a lapse.
+
+Each pair keeps an ease factor, an interval in days and a count of consecutive
+correct answers (repetitions). A correct answer schedules the next review after
+1 day, then 6 days, then the previous interval times the ease, and raises the
+ease. A lapse resets the repetitions, lowers the ease and brings the question
+back after RELEARN_DELAY_SECONDS.
+
+review() is the reference implementation. crud_user_question_progress applies the
+same rules in SQL, inside the upsert that records each answer.
+"""
+from typing import Tuple
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+CORRECT_EASE_BONUS = 0.1 # SM-2 quality 5
+LAPSE_EASE_PENALTY = 0.2
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+MAX_INTERVAL_DAYS = 365.0
+RELEARN_DELAY_SECONDS = 10 * 60
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def review(ease: float, interval_days: float, repetitions: int, correct: bool) -> Tuple[float, float, int]:
+    """The (ease, interval_days, repetitions) after one more answer."""
+    if not correct:
+        return max(MIN_EASE, ease - LAPSE_EASE_PENALTY), 0.0, 0
+    if repetitions == 0:
+        interval_days = FIRST_INTERVAL_DAYS
+    elif repetitions == 1:
+        interval_days = SECOND_INTERVAL_DAYS
+    else:
+        interval_days = min(MAX_INTERVAL_DAYS, interval_days * ease)
+    return ease + CORRECT_EASE_BONUS, interval_days, repetitions + 1
+
+
+def delay_seconds(interval_days: float) -> float:
+    """Seconds from an answer to the next review; an interval of 0 is a lapse."""
+    return interval_days * SECONDS_PER_DAY if interval_days else RELEARN_DELAY_SECONDS
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from app.core import cache_invalidation
+from app.core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES
+from app.models.models import User
+
+# Columns kept in the cache; hashed_password deliberately is not one of them
+CACHED_USER_FIELDS = ("id", "username", "email", "full_name", "token_version")
+
+
+class UserCache:
+    """
+    Bounded LRU of user records keyed by id, with a per-entry TTL.
+    Stores plain column snapshots and hands out fresh transient User instances,
+    so nothing is shared between sessions or threads.
+    """
+
+    def __init__(self, ttl_seconds: float = USER_CACHE_TTL_SECONDS, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            snapshot = entry[1]
+        return User(**snapshot)
+
+    def put(self, user: User) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        snapshot = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache()
+cache_invalidation.register(cache_invalidation.USER, user_cache.invalidate, user_cache.clear)
+
+
+# Any ORM update or delete of a user drops its cached record in this process right
+# away, and in every worker (this one included, again) once the change commits
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        cache_invalidation.invalidate(session, cache_invalidation.USER, target.id)
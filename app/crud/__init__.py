@@ -3,3 +3,9 @@ from . import crud_question
 from . import crud_user_answer
 from . import crud_summary
 from . import crud_exam_type # Added this line
+from . import crud_question_stats
+from . import crud_user_question_progress
+from . import crud_user_exam_type_stats
+from . import crud_question_import
+from . import crud_import_job
+from . import crud_async
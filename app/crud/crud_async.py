@@ -0,0 +1,75 @@
+"""
+Async counterparts of the crud functions used by the async routers.
+
+Each one runs the existing synchronous crud function on the AsyncSession's
+underlying Session via run_sync, so the query logic stays in one place while
+all I/O goes through the async driver.
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exam_type_registry import exam_type_registry
+from app.crud import crud_exam_type, crud_question, crud_summary, crud_user, crud_user_answer
+from app.models.models import ExamType, Question, User, UserAnswer
+from app.schemas import schemas
+
+# Users
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.run_sync(crud_user.get_user, user_id)
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    return await db.run_sync(crud_user.get_user_by_username, username)
+
+# Exam types
+async def get_exam_type(db: AsyncSession, exam_type_id: int) -> Optional[ExamType]:
+    return await db.run_sync(crud_exam_type.get_exam_type, exam_type_id)
+
+async def exam_type_exists(db: AsyncSession, exam_type_id: int) -> bool:
+    # A registry hit needs no trip through the session
+    if exam_type_registry.name(exam_type_id) is not None:
+        return True
+    return await db.run_sync(crud_exam_type.exam_type_exists, exam_type_id)
+
+# Questions
+async def get_question(db: AsyncSession, question_id: int) -> Optional[Question]:
+    return await db.run_sync(crud_question.get_question, question_id)
+
+async def get_questions(db: AsyncSession, skip: int = 0, limit: int = 100, exam_type_id: Optional[int] = None) -> List[Question]:
+    return await db.run_sync(crud_question.get_questions, skip=skip, limit=limit, exam_type_id=exam_type_id)
+
+async def get_next_question_for_user(db: AsyncSession, user_id: int, exam_type_id: int) -> Optional[Question]:
+    return await db.run_sync(crud_question.get_next_question_for_user, user_id, exam_type_id)
+
+async def get_question_cached(db: AsyncSession, question_id: int) -> Optional[Question]:
+    return await db.run_sync(crud_question.get_question_cached, question_id)
+
+async def get_next_question_cached(db: AsyncSession, user_id: int, exam_type_id: int) -> Optional[Question]:
+    return await db.run_sync(crud_question.get_next_question_cached, user_id, exam_type_id)
+
+async def create_question(db: AsyncSession, question: schemas.QuestionCreate) -> Question:
+    return await db.run_sync(crud_question.create_question, question)
+
+async def update_question(db: AsyncSession, question_id: int, question_update: schemas.QuestionUpdate) -> Optional[Question]:
+    return await db.run_sync(crud_question.update_question, question_id, question_update)
+
+async def delete_question(db: AsyncSession, question_id: int) -> Optional[Question]:
+    return await db.run_sync(crud_question.delete_question, question_id)
+
+# Answers
+async def create_user_answer(db: AsyncSession, user_answer: schemas.UserAnswerCreate, user_id: int) -> UserAnswer:
+    return await db.run_sync(crud_user_answer.create_user_answer, user_answer, user_id)
+
+# Summary
+async def get_user_summary_stats(db: AsyncSession, user_id: int, exam_type_id: Optional[int] = None) -> schemas.UserSummaryStats:
+    return await db.run_sync(crud_summary.get_user_summary_stats, user_id, exam_type_id)
+
+async def get_user_dashboard_summary(db: AsyncSession, user_id: int) -> schemas.UserDashboardSummary:
+    return await db.run_sync(crud_summary.get_user_dashboard_summary, user_id)
+
+async def get_user_question_performance_summary(
+    db: AsyncSession, user_id: int, exam_type_id: Optional[int] = None, sort: str = "question_id",
+    limit: int = crud_summary.DEFAULT_PERFORMANCE_PAGE_SIZE, cursor: Optional[str] = None, problem_text_length: Optional[int] = None
+) -> Tuple[List[schemas.UserQuestionPerformance], Optional[str]]:
+    return await db.run_sync(
+        crud_summary.get_user_question_performance_summary, user_id, exam_type_id, sort, limit, cursor, problem_text_length
+    )
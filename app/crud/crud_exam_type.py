@@ -1,6 +1,9 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.models.models import ExamType
+from app.core import cache_invalidation
+from app.core.exam_type_registry import exam_type_registry
+from app.crud import crud_user_exam_type_stats
+from app.models.models import ExamType, UserExamTypeStats, UserQuestionProgress
 from app.schemas import schemas # Ensure schemas is accessible like this
 
 def get_exam_type(db: Session, exam_type_id: int) -> Optional[ExamType]:
@@ -9,14 +12,52 @@ def get_exam_type(db: Session, exam_type_id: int) -> Optional[ExamType]:
 def get_exam_type_by_name(db: Session, name: str) -> Optional[ExamType]:
     return db.query(ExamType).filter(ExamType.name == name).first()
 
+def load_exam_type_registry(db: Session) -> None:
+    generation = exam_type_registry.generation()
+    exam_type_registry.load(db.query(ExamType.id, ExamType.name).all(), generation)
+
+def get_exam_type_name(db: Session, exam_type_id: int) -> Optional[str]:
+    """The exam type's name from the in-process registry, or None if it does not exist."""
+    if not exam_type_registry.loaded:
+        load_exam_type_registry(db)
+    name = exam_type_registry.name(exam_type_id)
+    if name is None:
+        # Not known here, but another worker may have created it since the registry loaded
+        generation = exam_type_registry.generation()
+        db_exam_type = get_exam_type(db, exam_type_id)
+        if db_exam_type is None:
+            return None
+        name = db_exam_type.name
+        exam_type_registry.put(exam_type_id, name, generation)
+    return name
+
+def exam_type_exists(db: Session, exam_type_id: int) -> bool:
+    return get_exam_type_name(db, exam_type_id) is not None
+
+def get_exam_type_id_by_name(db: Session, name: str) -> Optional[int]:
+    """Like get_exam_type_by_name, but only the id, from the in-process registry when it knows the name."""
+    if not exam_type_registry.loaded:
+        load_exam_type_registry(db)
+    exam_type_id = exam_type_registry.id_for_name(name)
+    if exam_type_id is None:
+        generation = exam_type_registry.generation()
+        db_exam_type = get_exam_type_by_name(db, name)
+        if db_exam_type is None:
+            return None
+        exam_type_id = db_exam_type.id
+        exam_type_registry.put(exam_type_id, name, generation)
+    return exam_type_id
+
 def get_exam_types(db: Session, skip: int = 0, limit: int = 100) -> List[ExamType]:
     return db.query(ExamType).offset(skip).limit(limit).all()
 
 def create_exam_type(db: Session, exam_type: schemas.ExamTypeCreate) -> ExamType:
+    generation = exam_type_registry.generation()
     db_exam_type = ExamType(name=exam_type.name)
     db.add(db_exam_type)
     db.commit()
     db.refresh(db_exam_type)
+    exam_type_registry.put(db_exam_type.id, db_exam_type.name, generation)
     return db_exam_type
 
 def update_exam_type(db: Session, exam_type_id: int, exam_type_update: schemas.ExamTypeUpdate) -> Optional[ExamType]:
@@ -25,6 +66,7 @@ def update_exam_type(db: Session, exam_type_id: int, exam_type_update: schemas.E
         update_data = exam_type_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_exam_type, key, value)
+        cache_invalidation.invalidate(db, cache_invalidation.EXAM_TYPE, exam_type_id)
         db.commit()
         db.refresh(db_exam_type)
     return db_exam_type
@@ -36,6 +78,17 @@ def delete_exam_type(db: Session, exam_type_id: int) -> Optional[ExamType]:
         # The FK constraint in Question model is ON DELETE SET NULL for exam_type_id.
         # This means if an ExamType is deleted, questions associated with it will have their exam_type_id set to NULL.
         # This is acceptable given the current model setup.
+        # Their answers then count under NO_EXAM_TYPE in the per-user totals.
+        user_ids = [row.user_id for row in db.query(UserExamTypeStats.user_id).filter(UserExamTypeStats.exam_type_id == exam_type_id)]
         db.delete(db_exam_type)
+        db.query(UserQuestionProgress).filter(UserQuestionProgress.exam_type_id == exam_type_id)\
+          .update({UserQuestionProgress.exam_type_id: None}, synchronize_session=False)
+        db.flush()
+        if user_ids:
+            crud_user_exam_type_stats.refresh_user_exam_type_stats(
+                db, user_ids=user_ids, exam_type_ids=[exam_type_id, crud_user_exam_type_stats.NO_EXAM_TYPE]
+            )
+        cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, exam_type_id)
+        cache_invalidation.invalidate(db, cache_invalidation.EXAM_TYPE, exam_type_id)
         db.commit()
     return db_exam_type
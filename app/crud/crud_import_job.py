@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.models import ImportJobRecord
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def create_import_job(db: Session, job_id: str, exam_type_id: int) -> ImportJobRecord:
+    now = _now()
+    db_job = ImportJobRecord(id=job_id, exam_type_id=exam_type_id, status=QUEUED, created_at=now, heartbeat_at=now)
+    db.add(db_job)
+    db.commit()
+    return db_job
+
+
+def get_import_job(db: Session, job_id: str) -> Optional[ImportJobRecord]:
+    return db.query(ImportJobRecord).filter(ImportJobRecord.id == job_id).first()
+
+
+def get_import_jobs(db: Session, limit: int = 100) -> List[ImportJobRecord]:
+    """The `limit` most recently created jobs, oldest first."""
+    jobs = db.query(ImportJobRecord).order_by(ImportJobRecord.created_at.desc()).limit(limit).all()
+    return jobs[::-1]
+
+
+def start_import_job(db: Session, job_id: str) -> None:
+    now = _now()
+    db.query(ImportJobRecord).filter(ImportJobRecord.id == job_id).update(
+        {"status": RUNNING, "started_at": now, "heartbeat_at": now}, synchronize_session=False
+    )
+    db.commit()
+
+
+def update_import_job_progress(db: Session, job_id: str, rows_done: int, rows_failed: int) -> None:
+    db.query(ImportJobRecord).filter(ImportJobRecord.id == job_id).update(
+        {"rows_done": rows_done, "rows_failed": rows_failed, "heartbeat_at": _now()}, synchronize_session=False
+    )
+    db.commit()
+
+
+def finish_import_job(
+    db: Session, job_id: str, status: str, rows_done: int, rows_failed: int,
+    summary: Optional[str] = None, error: Optional[str] = None,
+) -> None:
+    """Records a job's outcome; summary is the ImportSummary as JSON."""
+    now = _now()
+    db.query(ImportJobRecord).filter(ImportJobRecord.id == job_id).update({
+        "status": status, "rows_done": rows_done, "rows_failed": rows_failed,
+        "summary": summary, "error": error, "finished_at": now, "heartbeat_at": now,
+    }, synchronize_session=False)
+    db.commit()
+
+
+def touch_import_jobs(db: Session, job_ids: List[str]) -> None:
+    """Refreshes the heartbeat of jobs this process still has queued or running."""
+    if not job_ids:
+        return
+    db.query(ImportJobRecord).filter(ImportJobRecord.id.in_(job_ids)).update(
+        {"heartbeat_at": _now()}, synchronize_session=False
+    )
+    db.commit()
+
+
+def delete_finished_import_jobs(db: Session, keep: int) -> int:
+    """Deletes finished jobs other than the `keep` most recent ones; returns how many went."""
+    kept = (
+        db.query(ImportJobRecord.id)
+        .filter(ImportJobRecord.status.notin_(ACTIVE_STATUSES))
+        .order_by(ImportJobRecord.created_at.desc())
+        .limit(keep)
+    )
+    deleted = db.query(ImportJobRecord).filter(
+        ImportJobRecord.status.notin_(ACTIVE_STATUSES), ImportJobRecord.id.notin_(kept.scalar_subquery())
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
@@ -1,8 +1,12 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_
+from sqlalchemy import func, case, and_, desc
+from sqlalchemy.exc import IntegrityError
 
-from app.models.models import Question, UserAnswer
+from app.core import cache_invalidation, near_duplicates, question_sampler
+from app.core.question_cache import QUESTION_BANK_COLUMNS, QuestionBank, question_bank_cache
+from app.crud import crud_user_exam_type_stats, crud_user_question_progress
+from app.models.models import Question, UserAnswer, QuestionStats, UserQuestionProgress
 from app.schemas import schemas
 
 def get_question(db: Session, question_id: int) -> Optional[Question]:
@@ -19,6 +23,51 @@ def get_questions(
         query = query.filter(Question.exam_type_id == exam_type_id)
     return query.offset(skip).limit(limit).all()
 
+EXPORT_BATCH_SIZE = 1000
+
+def iter_questions_for_export(db: Session, exam_type_id: int, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every question of an exam type as a QuestionExportItem-shaped dict, in id order.
+    Column rows are fetched batch_size at a time (a server-side cursor on PostgreSQL),
+    so memory does not grow with the size of the bank.
+    """
+    columns = [
+        Question.problem_statement, Question.option_1, Question.option_2, Question.option_3,
+        Question.option_4, Question.correct_answer, Question.explanation,
+    ]
+    query = db.query(*columns).filter(Question.exam_type_id == exam_type_id)\
+              .order_by(Question.id).yield_per(batch_size)
+    for row in query:
+        yield row._asdict()
+
+def find_near_duplicate_questions(
+    db: Session,
+    exam_type_id: int,
+    threshold: float = near_duplicates.DEFAULT_THRESHOLD,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> schemas.NearDuplicateReport:
+    """
+    Clusters an exam type's questions whose statement and options are near-identical
+    (see app.core.near_duplicates). Rows are streamed like the export; only their
+    shingle hashes and LSH band keys are kept in memory.
+    """
+    query = db.query(
+        Question.id, Question.problem_statement,
+        Question.option_1, Question.option_2, Question.option_3, Question.option_4,
+    ).filter(Question.exam_type_id == exam_type_id).order_by(Question.id).yield_per(batch_size)
+    question_count = 0
+
+    def texts():
+        nonlocal question_count
+        for row in query:
+            question_count += 1
+            yield row[0], row[1:]
+
+    clusters = near_duplicates.find_near_duplicate_clusters(texts(), threshold=threshold)
+    return schemas.NearDuplicateReport(
+        exam_type_id=exam_type_id, threshold=threshold, question_count=question_count, clusters=clusters
+    )
+
 def create_question(db: Session, question: schemas.QuestionCreate) -> Question:
     db_question = Question(
         problem_statement=question.problem_statement,
@@ -31,7 +80,12 @@ def create_question(db: Session, question: schemas.QuestionCreate) -> Question:
         exam_type_id=question.exam_type_id # Added exam_type_id
     )
     db.add(db_question)
-    db.commit()
+    cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, db_question.exam_type_id)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback() # Same content already in the exam type (uq_questions_exam_type_id_content_hash)
+        raise
     db.refresh(db_question)
     return db_question
 
@@ -40,7 +94,7 @@ def get_unanswered_question_ids(
     user_id: int, 
     exam_type_id: Optional[int] = None
 ) -> List[int]:
-    answered_subquery = db.query(UserAnswer.question_id).filter(UserAnswer.user_id == user_id).distinct()
+    answered_subquery = db.query(UserQuestionProgress.question_id).filter(UserQuestionProgress.user_id == user_id)
     
     query = db.query(Question.id).filter(~Question.id.in_(answered_subquery))
     if exam_type_id is not None:
@@ -58,41 +112,16 @@ def get_question_global_stats(
     if exam_type_id is not None:
         question_base_query = question_base_query.filter(Question.exam_type_id == exam_type_id)
     
-    # Alias for subqueries to make them distinct if used multiple times or for clarity
     questions_for_stats = question_base_query.subquery('questions_for_stats')
 
-    # Subquery for total answers
-    total_answers_sq = (
-        db.query(
-            UserAnswer.question_id,
-            func.count(UserAnswer.id).label("total_answers")
-        )
-        .join(questions_for_stats, UserAnswer.question_id == questions_for_stats.c.question_id) # Join to filter by exam_type
-        .group_by(UserAnswer.question_id)
-        .subquery('total_answers_sq')
-    )
-
-    # Subquery for total correct answers
-    total_correct_answers_sq = (
-        db.query(
-            UserAnswer.question_id,
-            func.count(UserAnswer.id).label("total_correct_answers")
-        )
-        .join(questions_for_stats, UserAnswer.question_id == questions_for_stats.c.question_id) # Join to filter by exam_type
-        .filter(UserAnswer.is_correct == True)
-        .group_by(UserAnswer.question_id)
-        .subquery('total_correct_answers_sq')
-    )
-
-    # Main query joining questions with their stats
+    # Counters are maintained incrementally in question_stats, so this reads one row per question
     query_result = (
         db.query(
             questions_for_stats.c.question_id,
-            func.coalesce(total_answers_sq.c.total_answers, 0).label("total_answers"),
-            func.coalesce(total_correct_answers_sq.c.total_correct_answers, 0).label("total_correct_answers")
+            func.coalesce(QuestionStats.total_answers, 0).label("total_answers"),
+            func.coalesce(QuestionStats.total_correct, 0).label("total_correct_answers")
         )
-        .outerjoin(total_answers_sq, questions_for_stats.c.question_id == total_answers_sq.c.question_id)
-        .outerjoin(total_correct_answers_sq, questions_for_stats.c.question_id == total_correct_answers_sq.c.question_id)
+        .outerjoin(QuestionStats, questions_for_stats.c.question_id == QuestionStats.question_id)
         .all()
     )
     
@@ -116,13 +145,206 @@ def get_question_global_stats(
         
     return stats_list
 
+def get_next_question_for_user(
+    db: Session,
+    user_id: int,
+    exam_type_id: int
+) -> Optional[Question]:
+    """
+    Picks the next question for a user.
+
+    Priority order:
+      1. The user's most overdue review (app.core.spaced_repetition), popped off the
+         due-queue index.
+      2. A random question the user has never answered.
+      3. A question the user has answered incorrectly at least once, highest
+         global incorrect rate first (ties broken randomly).
+      4. Any other question (always answered correctly), for review.
+    Tiers 2-4 are a single SQL statement. Returns None if the exam type has no questions.
+    """
+    due_question_id = crud_user_question_progress.get_earliest_due_question_id(db, user_id=user_id, exam_type_id=exam_type_id)
+    if due_question_id is not None:
+        due_question = get_question(db, due_question_id)
+        if due_question is not None:
+            return due_question
+
+    selection_tier = case(
+        (UserQuestionProgress.question_id.is_(None), 0),
+        (UserQuestionProgress.ever_incorrect == True, 1),
+        else_=2
+    )
+    # Only tier 1 is ranked by incorrect rate; the other tiers are picked at random
+    incorrect_rate = case(
+        (
+            and_(UserQuestionProgress.ever_incorrect == True, QuestionStats.total_answers > 0),
+            (QuestionStats.total_answers - QuestionStats.total_correct) * 1.0 / QuestionStats.total_answers
+        ),
+        else_=0
+    )
+
+    return (
+        db.query(Question)
+        .outerjoin(UserQuestionProgress, and_(
+            UserQuestionProgress.question_id == Question.id,
+            UserQuestionProgress.user_id == user_id
+        ))
+        .outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+        .filter(Question.exam_type_id == exam_type_id)
+        .order_by(selection_tier, desc(incorrect_rate), func.random())
+        .first()
+    )
+
+# Question bank cache (app.core.question_cache): the read paths of GET /questions/{id}/
+# and /questions/next/. create/update/delete_question, imports and exam type deletion
+# bump the exam type's version after committing.
+
+NEXT_QUESTION_PROBES = 32
+
+def get_question_bank(db: Session, exam_type_id: int) -> Optional[QuestionBank]:
+    """
+    The exam type's QuestionBank from the cache, loaded with one query on a miss. None
+    when the cache is disabled or the bank is too large for it; callers then query directly.
+    """
+    if not question_bank_cache.enabled or question_bank_cache.is_oversized(exam_type_id):
+        return None
+    bank = question_bank_cache.get(exam_type_id)
+    if bank is None:
+        version = question_bank_cache.version(exam_type_id) # Read before the rows, so a concurrent write makes this load stale
+        rows = db.query(*(getattr(Question, column) for column in QUESTION_BANK_COLUMNS))\
+                 .filter(Question.exam_type_id == exam_type_id)\
+                 .order_by(Question.id)\
+                 .all()
+        bank = QuestionBank(exam_type_id, version, rows)
+        question_bank_cache.put(bank)
+    return bank
+
+def get_question_cached(db: Session, question_id: int) -> Optional[Question]:
+    """
+    get_question for read-only use, served from the question bank cache as a transient
+    Question. A miss reads the question and loads its exam type's bank for the next reads.
+    """
+    if not question_bank_cache.enabled:
+        return get_question(db, question_id)
+    question = question_bank_cache.find_question(question_id)
+    if question is None:
+        question = get_question(db, question_id)
+        if question is not None and question.exam_type_id is not None:
+            get_question_bank(db, question.exam_type_id)
+    return question
+
+def _pick_unanswered_slot(db: Session, bank: QuestionBank, user_id: int, answered_count: int) -> Optional[int]:
+    if answered_count >= len(bank):
+        return None
+    if answered_count * 2 <= len(bank):
+        # Mostly unanswered: one primary-key lookup of a few random candidates almost surely finds one
+        candidates = question_sampler.sample(range(len(bank)), min(NEXT_QUESTION_PROBES, len(bank)))
+        answered = {row.question_id for row in db.query(UserQuestionProgress.question_id).filter(
+            UserQuestionProgress.user_id == user_id,
+            UserQuestionProgress.question_id.in_([bank.ids[slot] for slot in candidates])
+        )}
+        for slot in candidates:
+            if bank.ids[slot] not in answered:
+                return slot
+    answered = {row.question_id for row in db.query(UserQuestionProgress.question_id).filter(
+        UserQuestionProgress.user_id == user_id, UserQuestionProgress.exam_type_id == bank.exam_type_id
+    )}
+    unanswered = [slot for slot, question_id in enumerate(bank.ids) if question_id not in answered]
+    return question_sampler.choice(unanswered) if unanswered else None
+
+def get_question_sampler(db: Session, bank: QuestionBank) -> question_sampler.IncorrectRateSampler:
+    """The bank's incorrect-rate sampler, (re)built from question_stats when missing or expired."""
+    sampler = bank.sampler
+    if sampler is None or sampler.expired:
+        counts = {row.question_id: (row.total_answers, row.total_correct) for row in db.query(
+            QuestionStats.question_id, QuestionStats.total_answers, QuestionStats.total_correct
+        ).join(Question, Question.id == QuestionStats.question_id).filter(Question.exam_type_id == bank.exam_type_id)}
+        sampler = question_sampler.IncorrectRateSampler([counts.get(question_id, (0, 0)) for question_id in bank.ids])
+        bank.sampler = sampler
+    return sampler
+
+def record_answer_in_sampler(exam_type_id: Optional[int], question_id: int, is_correct: bool) -> None:
+    """Call after committing an answer: keeps this process's sampler of the exam type current."""
+    bank = question_bank_cache.peek(exam_type_id) if exam_type_id is not None else None
+    if bank is not None and bank.sampler is not None and question_id in bank:
+        bank.sampler.record_answer(bank.slots[question_id], is_correct)
+
+def _pick_incorrect_slot(db: Session, bank: QuestionBank, user_id: int) -> Optional[int]:
+    sampler = get_question_sampler(db, bank)
+    # Draws follow the global incorrect rate; keeping the first one the user has got wrong
+    # samples the user's own wrong answers by that same weight
+    candidates = sampler.draw(NEXT_QUESTION_PROBES)
+    if not candidates:
+        return None
+    incorrect = {row.question_id for row in db.query(UserQuestionProgress.question_id).filter(
+        UserQuestionProgress.user_id == user_id,
+        UserQuestionProgress.question_id.in_({bank.ids[slot] for slot in candidates}),
+        UserQuestionProgress.ever_incorrect == True
+    )}
+    for slot in candidates:
+        if bank.ids[slot] in incorrect:
+            return slot
+    # The user's wrong answers are rarely missed by others: weigh just those
+    incorrect_slots = [bank.slots[row.question_id] for row in db.query(UserQuestionProgress.question_id).filter(
+        UserQuestionProgress.user_id == user_id,
+        UserQuestionProgress.exam_type_id == bank.exam_type_id,
+        UserQuestionProgress.ever_incorrect == True
+    ) if row.question_id in bank]
+    return sampler.choose(incorrect_slots) if incorrect_slots else None
+
+def get_next_question_cached(db: Session, user_id: int, exam_type_id: int) -> Optional[Question]:
+    """
+    get_next_question_for_user served from the cached question bank: the questions
+    table is not read, only the user's own rows. Same priority order, except that
+    the questions the user got wrong are drawn at random weighted by their global
+    incorrect rate (question_sampler) instead of always the highest. Falls back to
+    get_next_question_for_user when the bank is not cacheable.
+    """
+    bank = get_question_bank(db, exam_type_id)
+    if bank is None:
+        return get_next_question_for_user(db, user_id=user_id, exam_type_id=exam_type_id)
+    if not len(bank):
+        return None
+
+    due_question_id = crud_user_question_progress.get_earliest_due_question_id(db, user_id=user_id, exam_type_id=exam_type_id)
+    if due_question_id in bank:
+        return bank.get(due_question_id)
+
+    answered_count = int(crud_user_exam_type_stats.get_user_totals(db, user_id=user_id, exam_type_id=exam_type_id).unique_questions)
+    slot = _pick_unanswered_slot(db, bank, user_id, answered_count)
+    if slot is None:
+        slot = _pick_incorrect_slot(db, bank, user_id)
+    if slot is None:
+        slot = question_sampler.randrange(len(bank)) # Everything answered correctly: review at random
+    return bank.question(slot)
+
+def _answering_user_ids(db: Session, question_id: int) -> List[int]:
+    return [row.user_id for row in db.query(UserQuestionProgress.user_id).filter(UserQuestionProgress.question_id == question_id)]
+
 def update_question(db: Session, question_id: int, question_update: schemas.QuestionUpdate) -> Optional[Question]:
     db_question = get_question(db, question_id)
     if db_question:
+        old_exam_type_id = db_question.exam_type_id
         update_data = question_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_question, key, value)
-        db.commit()
+        try:
+            db.flush()
+            if db_question.exam_type_id != old_exam_type_id:
+                # The question's answers now count towards another exam type
+                db.query(UserQuestionProgress).filter(UserQuestionProgress.question_id == question_id)\
+                  .update({UserQuestionProgress.exam_type_id: db_question.exam_type_id}, synchronize_session=False)
+                crud_user_exam_type_stats.refresh_user_exam_type_stats(
+                    db,
+                    user_ids=_answering_user_ids(db, question_id),
+                    exam_type_ids=[crud_user_exam_type_stats.exam_type_bucket(old_exam_type_id),
+                                   crud_user_exam_type_stats.exam_type_bucket(db_question.exam_type_id)],
+                )
+            cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, old_exam_type_id)
+            cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, db_question.exam_type_id)
+            db.commit()
+        except IntegrityError:
+            db.rollback() # The new content duplicates another question of the exam type
+            raise
         db.refresh(db_question)
     return db_question
 
@@ -139,8 +361,17 @@ def delete_question(db: Session, question_id: int) -> Optional[Question]:
         # without handling UserAnswers will cause an IntegrityError if UserAnswers exist for this question.
         # So, we must delete associated UserAnswers first.
 
+        answering_user_ids = _answering_user_ids(db, question_id)
         db.query(UserAnswer).filter(UserAnswer.question_id == question_id).delete(synchronize_session=False)
+        db.query(QuestionStats).filter(QuestionStats.question_id == question_id).delete(synchronize_session=False)
+        db.query(UserQuestionProgress).filter(UserQuestionProgress.question_id == question_id).delete(synchronize_session=False)
         
         db.delete(db_question)
+        db.flush()
+        # The deleted answers no longer count towards their users' exam type totals
+        crud_user_exam_type_stats.refresh_user_exam_type_stats(
+            db, user_ids=answering_user_ids, exam_type_ids=[crud_user_exam_type_stats.exam_type_bucket(db_question.exam_type_id)]
+        )
+        cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, db_question.exam_type_id)
         db.commit()
     return db_question # Returns the deleted question object (now detached from session) or None
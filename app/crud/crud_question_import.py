@@ -0,0 +1,340 @@
+"""
+Bulk question import: streams questions (a JSON array, NDJSON or CSV),
+validates them chunk by chunk and writes each chunk with a single statement
+(COPY on PostgreSQL). Everything is committed in one transaction at the end, so
+an import is all or nothing; background jobs commit chunk by chunk instead.
+"""
+import io
+import json
+from typing import Any, BinaryIO, Callable, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import bulk_formats, cache_invalidation
+from app.core.bulk_formats import RowError
+from app.core.json_stream import InvalidJSONError, NotAJSONArrayError, iter_json_array
+from app.models.models import CONTENT_HASH_FIELDS, Question, question_content_hash
+from app.schemas.schemas import ImportErrorDetail, ImportSummary, QuestionExportItem
+
+# Items validated and written per statement. An import commits once, at the end, unless
+# it is run with commit_each_chunk (background jobs).
+IMPORT_CHUNK_SIZE = 1000
+
+QUESTION_IMPORT_COLUMNS = [
+    "exam_type_id", "problem_statement", "option_1", "option_2", "option_3", "option_4",
+    "correct_answer", "explanation", "content_hash",
+]
+
+# What to do with an item whose content (question_content_hash) is already in the exam type
+SKIP = "skip"       # keep the stored question, count the item as skipped
+UPDATE = "update"   # overwrite the stored question's text, answer and explanation
+FAIL = "fail"       # reject the whole import, reporting every duplicate found
+DUPLICATE_MODES = (SKIP, UPDATE, FAIL)
+
+# Validates a whole chunk of items in one call into pydantic-core
+_ITEMS_ADAPTER = TypeAdapter(List[QuestionExportItem])
+
+
+class _DuplicatesFound(Exception):
+    pass
+
+
+def _copy_field(value: Any) -> str:
+    # COPY ... CSV: an unquoted empty field is NULL, a quoted one is an empty string
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_questions(db: Session, rows: List[dict]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(row[column]) for column in QUESTION_IMPORT_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+    # The raw psycopg2 connection of the session's transaction, so the COPY commits with it
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Question.__tablename__} ({', '.join(QUESTION_IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_insert_questions(db: Session, rows: List[dict]) -> None:
+    """
+    Inserts question rows (dicts keyed by QUESTION_IMPORT_COLUMNS) in one statement:
+    COPY FROM STDIN with psycopg2, a multi-row INSERT elsewhere. Does not commit.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        _copy_questions(db, rows)
+    else:
+        db.execute(insert(Question).values(rows))
+
+
+def _existing_content_hashes(db: Session, exam_type_id: int, hashes: List[str]) -> set:
+    if not hashes:
+        return set()
+    rows = db.query(Question.content_hash).filter(
+        Question.exam_type_id == exam_type_id, Question.content_hash.in_(hashes)
+    ).all()
+    return {content_hash for (content_hash,) in rows}
+
+
+def _update_questions_by_hash(db: Session, exam_type_id: int, rows: List[dict]) -> None:
+    """One executemany UPDATE matching stored questions on (exam_type_id, content_hash)."""
+    if not rows:
+        return
+    table = Question.__table__
+    statement = update(table).where(
+        table.c.exam_type_id == bindparam("match_exam_type_id"),
+        table.c.content_hash == bindparam("match_content_hash"),
+    )
+    db.execute(statement, [
+        {
+            "match_exam_type_id": exam_type_id,
+            "match_content_hash": row["content_hash"],
+            **{column: row[column] for column in QUESTION_IMPORT_COLUMNS if column not in ("exam_type_id", "content_hash")},
+        }
+        for row in rows
+    ])
+
+
+def _validate_chunk(chunk: List[tuple], errors: List[ImportErrorDetail]) -> List[tuple]:
+    """
+    Validates a chunk with one TypeAdapter call over the whole list; returns the valid
+    items as (row_index, row dict with exam-type-independent columns), in row order.
+    """
+    chunk_errors = []
+    candidates = [] # (row_index, item_data)
+    for index, item_data in chunk:
+        if isinstance(item_data, RowError):
+            chunk_errors.append(ImportErrorDetail(row_index=index, error_message=item_data.message, data=item_data.data))
+        else:
+            candidates.append((index, item_data))
+    try:
+        items = _ITEMS_ADAPTER.validate_python([item_data for _, item_data in candidates])
+    except ValidationError as e:
+        failed = {} # position in candidates -> its errors, with loc relative to the item
+        for error in e.errors(include_url=False):
+            failed.setdefault(error["loc"][0], []).append({**error, "loc": error["loc"][1:]})
+        for position, item_errors in failed.items():
+            index, item_data = candidates[position]
+            chunk_errors.append(ImportErrorDetail(
+                row_index=index,
+                error_message=f"Validation Error: {json.dumps(item_errors)}",
+                data=item_data if isinstance(item_data, dict) else None
+            ))
+        candidates = [candidate for position, candidate in enumerate(candidates) if position not in failed]
+        items = _ITEMS_ADAPTER.validate_python([item_data for _, item_data in candidates])
+    chunk_errors.sort(key=lambda error: error.row_index)
+    errors.extend(chunk_errors)
+    return [(index, item.model_dump()) for (index, _), item in zip(candidates, items)]
+
+
+def _resolve_duplicates(
+    db: Session, exam_type_id: int, valid: List[tuple], seen_hashes: Optional[set]
+) -> Tuple[List[dict], List[tuple]]:
+    """
+    Splits validated items into new rows and duplicates (row_index, row), set-wise: one
+    lookup of the chunk's content hashes. seen_hashes carries the hashes of earlier
+    chunks when they are not in the DB yet (dry runs).
+    """
+    rows_by_hash = {} # content_hash -> (row_index, row); first occurrence in the chunk wins its slot
+    duplicates = [] # (row_index, row) whose content already occurred earlier in the file
+    for index, item in valid:
+        row = {"exam_type_id": exam_type_id, **item}
+        row["content_hash"] = question_content_hash(*(row[field] for field in CONTENT_HASH_FIELDS))
+        if row["content_hash"] in rows_by_hash or (seen_hashes is not None and row["content_hash"] in seen_hashes):
+            duplicates.append((index, row))
+        else:
+            rows_by_hash[row["content_hash"]] = (index, row)
+
+    existing = _existing_content_hashes(db, exam_type_id, list(rows_by_hash))
+    new_rows = [row for content_hash, (_, row) in rows_by_hash.items() if content_hash not in existing]
+    duplicates += [(index, row) for content_hash, (index, row) in rows_by_hash.items() if content_hash in existing]
+    if seen_hashes is not None:
+        seen_hashes.update(rows_by_hash)
+    duplicates.sort(key=lambda duplicate: duplicate[0])
+    return new_rows, duplicates
+
+
+def _insert_chunk(
+    db: Session, exam_type_id: int, chunk: List[tuple], errors: List[ImportErrorDetail], counts: dict,
+    on_duplicate: str, seen_hashes: Optional[set] = None,
+) -> None:
+    """
+    Validates a chunk and resolves its duplicates, then writes it with one insert for the
+    new questions and (update mode) one executemany UPDATE. With seen_hashes (a dry run)
+    nothing is written and only the counts and errors are recorded.
+    """
+    dry_run = seen_hashes is not None
+    new_rows, duplicates = _resolve_duplicates(db, exam_type_id, _validate_chunk(chunk, errors), seen_hashes)
+
+    if duplicates and on_duplicate == FAIL:
+        duplicate_errors = [
+            ImportErrorDetail(
+                row_index=index,
+                error_message="Duplicate question: the same content already exists in this exam type or earlier in the file.",
+                data={field: row[field] for field in CONTENT_HASH_FIELDS},
+            )
+            for index, row in duplicates
+        ]
+        errors.extend(duplicate_errors)
+        errors.sort(key=lambda error: error.row_index)
+        if not dry_run:
+            raise _DuplicatesFound()
+        counts["rejected"] += len(duplicates)
+        duplicates = []
+
+    if not dry_run:
+        bulk_insert_questions(db, new_rows)
+    counts["imported"] += len(new_rows)
+    if on_duplicate == UPDATE:
+        if not dry_run:
+            # In-chunk repeats of a new question are applied after its insert, so the last one wins
+            _update_questions_by_hash(db, exam_type_id, [row for _, row in duplicates])
+        counts["updated"] += len(duplicates)
+    else:
+        counts["skipped"] += len(duplicates)
+
+
+def _iter_items(stream: BinaryIO, fmt: str):
+    """(row_index, item) pairs: the NDJSON line, the CSV data row or the JSON array position."""
+    if fmt == bulk_formats.NDJSON:
+        return bulk_formats.iter_ndjson(stream)
+    if fmt == bulk_formats.CSV:
+        optional = [name for name, field in QuestionExportItem.model_fields.items() if not field.is_required()]
+        return enumerate(bulk_formats.iter_csv(stream, optional_fields=optional))
+    return enumerate(iter_json_array(stream))
+
+
+def _import_chunks(
+    db: Session, exam_type_id: int, stream: BinaryIO, fmt: str, chunk_size: int, errors: List[ImportErrorDetail],
+    counts: dict, on_duplicate: str, seen_hashes: Optional[set], after_chunk: Optional[Callable[[], None]] = None,
+) -> None:
+    """Reads `stream` and runs _insert_chunk on every chunk of items, calling after_chunk after each."""
+    chunk: List[tuple] = []
+
+    def flush():
+        _insert_chunk(db, exam_type_id, chunk, errors, counts, on_duplicate, seen_hashes)
+        if after_chunk is not None:
+            after_chunk()
+
+    for index, item_data in _iter_items(stream, fmt):
+        chunk.append((index, item_data))
+        if len(chunk) >= chunk_size:
+            flush()
+            chunk = []
+    flush()
+
+
+def _partial_summary(committed: dict, errors: List[ImportErrorDetail], failed_count: int) -> ImportSummary:
+    """Summary of an import that stopped early: only what was already committed counts."""
+    return ImportSummary(
+        imported_count=committed["imported"], updated_count=committed["updated"], skipped_count=committed["skipped"],
+        failed_count=failed_count, errors=errors,
+    )
+
+
+def import_questions(
+    db: Session,
+    exam_type_id: int,
+    stream: BinaryIO,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    fmt: str = bulk_formats.JSON,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    on_duplicate: str = SKIP,
+    dry_run: bool = False,
+    commit_each_chunk: bool = False,
+) -> ImportSummary:
+    """
+    Imports the QuestionExportItem objects read from `stream` (a JSON array, NDJSON lines
+    or CSV rows, see app.core.bulk_formats) into an exam type. Only one chunk of items is
+    in memory at a time. Invalid or unparseable items are reported per row (0-based
+    row_index; for NDJSON the file line, blank lines included, for CSV the data row)
+    and skipped; the valid ones are committed together at the end, so a JSON array
+    that turns out to be malformed part way through imports nothing.
+
+    Items whose content matches a question already in the exam type (or an earlier item)
+    are handled per on_duplicate (SKIP, UPDATE or FAIL; FAIL imports nothing).
+    on_progress(rows_done, rows_failed) is called after each chunk, where rows_done
+    counts imported, updated and skipped items.
+
+    With commit_each_chunk (background jobs) each chunk is committed before on_progress
+    runs, so a caller pacing the import there holds no transaction while it waits. An
+    import that stops part way then keeps the chunks committed before it, and the
+    summary counts only those. With FAIL the whole file is first checked for duplicates
+    (a dry run), so a file containing any still imports nothing. `stream` must be seekable.
+
+    With dry_run the file is only validated and checked for duplicates (reads, no
+    writes); the summary reports what the same import would do, and with
+    on_duplicate=FAIL it lists every duplicate in the file, not just the first chunk's.
+    """
+    if on_duplicate not in DUPLICATE_MODES:
+        raise ValueError(f"on_duplicate must be one of {DUPLICATE_MODES}")
+    commit_each_chunk = commit_each_chunk and not dry_run
+    counts = {"imported": 0, "updated": 0, "skipped": 0, "rejected": 0} # rejected: FAIL-mode duplicates (dry runs)
+    committed = dict(counts) # What commit_each_chunk has already made permanent
+    errors: List[ImportErrorDetail] = []
+
+    def commit():
+        if (counts["imported"], counts["updated"]) != (committed["imported"], committed["updated"]):
+            cache_invalidation.invalidate(db, cache_invalidation.QUESTION_BANK, exam_type_id)
+        db.commit()
+        committed.update(counts)
+
+    def after_chunk():
+        if commit_each_chunk:
+            commit()
+        if on_progress is not None:
+            on_progress(counts["imported"] + counts["updated"] + counts["skipped"], len(errors))
+
+    try:
+        if commit_each_chunk and on_duplicate == FAIL:
+            # Committed chunks cannot be taken back, so look for duplicates in the whole file first
+            _import_chunks(db, exam_type_id, stream, fmt, chunk_size, errors, counts, FAIL, seen_hashes=set())
+            db.rollback() # Only ends the read transaction
+            if counts["rejected"]:
+                return ImportSummary(imported_count=0, failed_count=len(errors), errors=errors)
+            stream.seek(0)
+            counts.update(committed)
+            errors.clear()
+        _import_chunks(
+            db, exam_type_id, stream, fmt, chunk_size, errors, counts, on_duplicate,
+            seen_hashes=set() if dry_run else None, after_chunk=after_chunk,
+        )
+    except _DuplicatesFound:
+        db.rollback()
+        return _partial_summary(committed, errors, failed_count=len(errors))
+    except IntegrityError:
+        db.rollback() # A concurrent import inserted the same content between lookup and insert
+        done = "only the counted rows were imported" if commit_each_chunk else "nothing was imported"
+        return _partial_summary(committed, [ImportErrorDetail(
+            error_message=f"Import conflicted with a concurrent change to this exam type's questions; {done}, retry it."
+        )], failed_count=0)
+    except (NotAJSONArrayError, InvalidJSONError) as e:
+        db.rollback()
+        message = "JSON content is not a list of questions." if isinstance(e, NotAJSONArrayError) else f"Invalid JSON file: {e}"
+        return _partial_summary(committed, [ImportErrorDetail(error_message=message)], failed_count=0)
+    except Exception:
+        db.rollback()
+        raise
+    if dry_run:
+        db.rollback() # Only ends the read transaction
+    else:
+        commit()
+    if counts["rejected"]:
+        counts["imported"] = 0 # The real import would be rejected as a whole
+    return ImportSummary(
+        imported_count=counts["imported"], updated_count=counts["updated"], skipped_count=counts["skipped"],
+        failed_count=len(errors), errors=errors, dry_run=dry_run,
+    )
@@ -0,0 +1,100 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, insert, delete
+
+from app.db.upsert import execute_upsert
+from app.models.models import Question, QuestionStats, UserAnswer
+
+OPTION_COUNT_COLUMNS = ["option_1_count", "option_2_count", "option_3_count", "option_4_count"]
+
+
+def get_question_stats(db: Session, question_id: int) -> Optional[QuestionStats]:
+    return db.query(QuestionStats).filter(QuestionStats.question_id == question_id).first()
+
+
+def increment_question_stats(db: Session, question_id: int, selected_answer: int, is_correct: bool) -> None:
+    """
+    Adds one answer to the question's counters as a single atomic upsert.
+    Does not commit: the caller commits it together with the UserAnswer row.
+    """
+    values = {
+        "total_answers": 1,
+        "total_correct": 1 if is_correct else 0,
+        **{column: 1 if selected_answer == index else 0 for index, column in enumerate(OPTION_COUNT_COLUMNS, start=1)},
+    }
+    increments = {column: getattr(QuestionStats, column) + amount for column, amount in values.items() if amount}
+
+    execute_upsert(db, QuestionStats, {"question_id": question_id}, values, increments)
+
+
+def _aggregated_stats_query(exam_type_id: Optional[int] = None):
+    """SELECT that recomputes question_stats rows from user_answers."""
+    query = (
+        select(
+            UserAnswer.question_id,
+            func.count(UserAnswer.id).label("total_answers"),
+            func.sum(case((UserAnswer.is_correct == True, 1), else_=0)).label("total_correct"),
+            *[
+                func.sum(case((UserAnswer.selected_answer == index, 1), else_=0)).label(column)
+                for index, column in enumerate(OPTION_COUNT_COLUMNS, start=1)
+            ],
+        )
+        .group_by(UserAnswer.question_id)
+    )
+    if exam_type_id is not None:
+        query = query.join(Question, Question.id == UserAnswer.question_id).filter(Question.exam_type_id == exam_type_id)
+    return query
+
+
+def rebuild_question_stats(db: Session, exam_type_id: Optional[int] = None) -> int:
+    """
+    Rebuilds question_stats from user_answers (all questions, or one exam type)
+    in one transaction. Returns the number of stats rows written.
+    """
+    clear_stmt = delete(QuestionStats)
+    if exam_type_id is not None:
+        clear_stmt = clear_stmt.where(
+            QuestionStats.question_id.in_(select(Question.id).where(Question.exam_type_id == exam_type_id))
+        )
+    db.execute(clear_stmt)
+
+    aggregated = _aggregated_stats_query(exam_type_id)
+    db.execute(
+        insert(QuestionStats).from_select(
+            ["question_id", "total_answers", "total_correct", *OPTION_COUNT_COLUMNS], aggregated
+        )
+    )
+    db.commit()
+
+    count_query = db.query(func.count(QuestionStats.question_id))
+    if exam_type_id is not None:
+        count_query = count_query.join(Question, Question.id == QuestionStats.question_id)\
+                                 .filter(Question.exam_type_id == exam_type_id)
+    return count_query.scalar() or 0
+
+
+def find_question_stats_mismatches(db: Session, exam_type_id: Optional[int] = None) -> List[int]:
+    """
+    Returns the ids of questions whose stored counters differ from user_answers
+    (including answered questions with no stats row and stale rows with no answers).
+    """
+    aggregated = _aggregated_stats_query(exam_type_id).subquery("aggregated")
+    expected = {row.question_id: tuple(row[1:]) for row in db.execute(select(aggregated))}
+
+    stored_query = db.query(
+        QuestionStats.question_id,
+        QuestionStats.total_answers,
+        QuestionStats.total_correct,
+        *[getattr(QuestionStats, column) for column in OPTION_COUNT_COLUMNS],
+    )
+    if exam_type_id is not None:
+        stored_query = stored_query.join(Question, Question.id == QuestionStats.question_id)\
+                                   .filter(Question.exam_type_id == exam_type_id)
+    stored = {row.question_id: tuple(row[1:]) for row in stored_query.all()}
+
+    empty_counts = (0,) * (2 + len(OPTION_COUNT_COLUMNS))
+    mismatched = [
+        question_id for question_id in expected.keys() | stored.keys()
+        if expected.get(question_id, empty_counts) != stored.get(question_id, empty_counts)
+    ]
+    return sorted(mismatched)
@@ -1,75 +1,197 @@
+import base64
+import heapq
+from itertools import islice
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, case # Ensure 'and_' and 'case' are imported
-from typing import List, Dict, Any, Optional # Ensure Optional is imported
+from sqlalchemy import func, or_
+from typing import List, Optional, Tuple
 
-from app.models.models import UserAnswer, Question # Ensure Question is imported
+from app.crud import crud_user_exam_type_stats
+from app.models.models import ExamType, UserQuestionProgress, Question, UserExamTypeStats, PROGRESS_INCORRECT_COUNT, PROGRESS_ACCURACY
 from app.schemas import schemas # Assuming schemas are imported
 
-def get_user_summary_stats(db: Session, user_id: int, exam_type_id: Optional[int] = None) -> schemas.UserSummaryStats:
-    # Base query for UserAnswers by the user
-    user_answers_query = db.query(UserAnswer).filter(UserAnswer.user_id == user_id)
-
-    if exam_type_id is not None:
-        user_answers_query = user_answers_query.join(Question, Question.id == UserAnswer.question_id)\
-                                              .filter(Question.exam_type_id == exam_type_id)
-
-    total_answers_submitted = user_answers_query.count()
-    
-    correct_answers_query = user_answers_query.filter(UserAnswer.is_correct == True)
-    total_correct_answers = correct_answers_query.count()
-    
+def _summary_stats(unique_questions: int, total_answers: int, total_correct: int) -> schemas.UserSummaryStats:
+    total_answers_submitted = int(total_answers)
+    total_correct_answers = int(total_correct)
     total_incorrect_answers = total_answers_submitted - total_correct_answers
 
-    # For total_unique_questions_attempted, we need to count distinct question_ids from the filtered answers
-    # unique_questions_query = user_answers_query.distinct(UserAnswer.question_id) # This was the previous approach
-    # total_unique_questions_attempted = unique_questions_query.count() 
-                                                                 
-    # Correct way to count distinct question_ids from the filtered set of answers
-    if exam_type_id is not None:
-         count_unique_q = db.query(func.count(func.distinct(UserAnswer.question_id)))\
-                            .join(Question, Question.id == UserAnswer.question_id)\
-                            .filter(UserAnswer.user_id == user_id, Question.exam_type_id == exam_type_id)\
-                            .scalar() or 0 # Changed to .scalar()
-    else:
-         count_unique_q = db.query(func.count(func.distinct(UserAnswer.question_id)))\
-                            .filter(UserAnswer.user_id == user_id)\
-                            .scalar() or 0 # Changed to .scalar()
-    total_unique_questions_attempted = count_unique_q
-
-
     correct_answer_rate = (total_correct_answers / total_answers_submitted) if total_answers_submitted > 0 else 0
 
     return schemas.UserSummaryStats(
-        total_unique_questions_attempted=total_unique_questions_attempted,
+        total_unique_questions_attempted=unique_questions,
         total_answers_submitted=total_answers_submitted,
         total_correct_answers=total_correct_answers,
         total_incorrect_answers=total_incorrect_answers,
         correct_answer_rate=correct_answer_rate
     )
 
-def get_user_question_performance_summary(db: Session, user_id: int, exam_type_id: Optional[int] = None) -> List[schemas.UserQuestionPerformance]:
-    # Base query for UserAnswers by the user, joined with Question
-    base_query = db.query(
-            UserAnswer.question_id,
-            Question.problem_statement, # Get problem_statement from Question model
-            func.count(UserAnswer.id).label("times_answered"),
-            func.sum(case((UserAnswer.is_correct == True, 1), else_=0)).label("times_correct"),
-            func.sum(case((UserAnswer.is_correct == False, 1), else_=0)).label("times_incorrect")
-        ).join(Question, Question.id == UserAnswer.question_id)\
-         .filter(UserAnswer.user_id == user_id)
+def get_user_summary_stats(db: Session, user_id: int, exam_type_id: Optional[int] = None) -> schemas.UserSummaryStats:
+    # The per-(user, exam type) totals maintained on answer submission: one row, or the sum of a few
+    row = crud_user_exam_type_stats.get_user_totals(db, user_id=user_id, exam_type_id=exam_type_id)
+    return _summary_stats(row.unique_questions, row.total_answers, row.total_correct)
+
+def get_user_dashboard_summary(db: Session, user_id: int) -> schemas.UserDashboardSummary:
+    """
+    The user's UserSummaryStats for every exam type they have answered, plus the overall
+    totals, from one read of their user_exam_type_stats rows joined to the exam type names.
+    Answers to questions without an exam type are listed with exam_type_id None.
+    """
+    rows = db.query(
+        UserExamTypeStats.exam_type_id,
+        ExamType.name,
+        UserExamTypeStats.unique_questions,
+        UserExamTypeStats.total_answers,
+        UserExamTypeStats.total_correct,
+    ).outerjoin(ExamType, ExamType.id == UserExamTypeStats.exam_type_id)\
+     .filter(UserExamTypeStats.user_id == user_id)\
+     .all()
+
+    exam_types = [
+        schemas.ExamTypeSummaryStats(
+            exam_type_id=None if row.exam_type_id == crud_user_exam_type_stats.NO_EXAM_TYPE else row.exam_type_id,
+            exam_type_name=row.name,
+            summary_stats=_summary_stats(row.unique_questions, row.total_answers, row.total_correct),
+        )
+        for row in rows
+    ]
+    # Named exam types alphabetically, questions without an exam type last
+    exam_types.sort(key=lambda item: (item.exam_type_id is None, item.exam_type_name or "", item.exam_type_id or 0))
+    overall = _summary_stats(
+        sum(row.unique_questions for row in rows), sum(row.total_answers for row in rows), sum(row.total_correct for row in rows)
+    )
+    return schemas.UserDashboardSummary(summary_stats=overall, exam_types=exam_types)
+
+# sort name -> (key expression, descending); each has an index on (user_id, exam_type_id, key, question_id)
+PERFORMANCE_SORTS = {
+    "question_id": (None, False),
+    "most_incorrect": (PROGRESS_INCORRECT_COUNT, True),
+    "least_recent": (UserQuestionProgress.last_answered_at, False),
+    "lowest_accuracy": (PROGRESS_ACCURACY, False),
+}
+DEFAULT_PERFORMANCE_PAGE_SIZE = 100
+MAX_PERFORMANCE_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    pass
+
 
+def encode_performance_cursor(sort: str, question_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{sort}:{question_id}".encode()).decode().rstrip("=")
+
+
+def decode_performance_cursor(cursor: str, sort: str) -> int:
+    """Returns the question_id the previous page ended at; the cursor must belong to the same sort."""
+    try:
+        cursor_sort, question_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        question_id = int(question_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid cursor.")
+    if cursor_sort != sort:
+        raise InvalidCursorError(f"Cursor belongs to sort '{cursor_sort}', not '{sort}'.")
+    return question_id
+
+
+def _performance_page_query(db: Session, user_id: int, sort: str, exam_type_filter, after_question_id: Optional[int], limit: int):
+    """One exam type's (or all, for question_id order) progress rows in sort order, after the cursor."""
+    key, descending = PERFORMANCE_SORTS[sort]
+    columns = [
+        UserQuestionProgress.question_id,
+        UserQuestionProgress.attempts,
+        UserQuestionProgress.correct_count,
+        UserQuestionProgress.last_answered_at,
+    ]
+    if key is not None:
+        columns.append(key.label("sort_key"))
+    query = db.query(*columns).filter(UserQuestionProgress.user_id == user_id)
+    if exam_type_filter is not None:
+        query = query.filter(exam_type_filter)
+
+    if key is None:
+        if after_question_id is not None:
+            query = query.filter(UserQuestionProgress.question_id > after_question_id)
+        return query.order_by(UserQuestionProgress.question_id).limit(limit).all()
+
+    if after_question_id is not None:
+        # The cursor row's current key, read by primary key so no value round-trips through the client
+        cursor_key = db.query(key).filter(
+            UserQuestionProgress.user_id == user_id, UserQuestionProgress.question_id == after_question_id
+        ).scalar_subquery()
+        # (key, question_id) past the cursor, spelled so the leading key bound is an index seek
+        if descending:
+            query = query.filter(key <= cursor_key, or_(key < cursor_key, UserQuestionProgress.question_id < after_question_id))
+        else:
+            query = query.filter(key >= cursor_key, or_(key > cursor_key, UserQuestionProgress.question_id > after_question_id))
+    if descending:
+        return query.order_by(key.desc(), UserQuestionProgress.question_id.desc()).limit(limit).all()
+    return query.order_by(key, UserQuestionProgress.question_id).limit(limit).all()
+
+
+def _exam_type_filters(db: Session, user_id: int, exam_type_id: Optional[int], sort: str) -> list:
     if exam_type_id is not None:
-        base_query = base_query.filter(Question.exam_type_id == exam_type_id)
-    
-    summary_data = base_query.group_by(UserAnswer.question_id, Question.problem_statement).all() # Group by problem_statement too
+        return [UserQuestionProgress.exam_type_id == exam_type_id]
+    if sort == "question_id":
+        return [None] # The primary key is already in (user_id, question_id) order
+    # Sorted across all exam types: one index range per exam type the user has answered, merged
+    buckets = db.query(UserExamTypeStats.exam_type_id).filter(UserExamTypeStats.user_id == user_id).all()
+    return [
+        UserQuestionProgress.exam_type_id.is_(None) if row.exam_type_id == crud_user_exam_type_stats.NO_EXAM_TYPE
+        else UserQuestionProgress.exam_type_id == row.exam_type_id
+        for row in buckets
+    ]
+
+
+def get_user_question_performance_summary(
+    db: Session,
+    user_id: int,
+    exam_type_id: Optional[int] = None,
+    sort: str = "question_id",
+    limit: int = DEFAULT_PERFORMANCE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    problem_text_length: Optional[int] = None,
+) -> Tuple[List[schemas.UserQuestionPerformance], Optional[str]]:
+    """
+    One page of the user's per-question performance in the given sort order, and the
+    cursor of the next page (None on the last page). Each page is an index range scan
+    of user_question_progress, so its cost does not grow with the user's history.
+    problem_text_length=None returns the full problem statement, 0 omits it and n
+    truncates it to n characters. Raises InvalidCursorError for a malformed cursor.
+    """
+    if sort not in PERFORMANCE_SORTS:
+        raise ValueError(f"Unknown sort '{sort}'.")
+    after_question_id = decode_performance_cursor(cursor, sort) if cursor else None
+    key, descending = PERFORMANCE_SORTS[sort]
+
+    pages = [
+        _performance_page_query(db, user_id, sort, exam_type_filter, after_question_id, limit + 1)
+        for exam_type_filter in _exam_type_filters(db, user_id, exam_type_id, sort)
+    ]
+    if len(pages) == 1:
+        rows = pages[0]
+    else:
+        rows = list(islice(
+            heapq.merge(*pages, key=lambda row: (row.sort_key, row.question_id), reverse=descending), limit + 1
+        ))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_performance_cursor(sort, rows[-1].question_id)
+
+    problem_statements = {}
+    if rows and problem_text_length != 0:
+        text = Question.problem_statement if problem_text_length is None else func.substr(Question.problem_statement, 1, problem_text_length)
+        problem_statements = dict(
+            db.query(Question.id, text).filter(Question.id.in_([row.question_id for row in rows])).all()
+        )
 
     performance_list = []
-    for item in summary_data:
+    for item in rows:
         performance_list.append(schemas.UserQuestionPerformance(
             question_id=item.question_id,
-            problem_statement=item.problem_statement,
-            times_answered=item.times_answered,
-            times_correct=item.times_correct,
-            times_incorrect=item.times_incorrect
+            problem_statement=problem_statements.get(item.question_id),
+            times_answered=item.attempts,
+            times_correct=item.correct_count,
+            times_incorrect=item.attempts - item.correct_count,
+            last_answered_at=item.last_answered_at
         ))
-    return performance_list
+    return performance_list, next_cursor
@@ -1,9 +1,17 @@
-from typing import Optional
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.models import User
-from app.schemas.schemas import UserCreate
-from app.core.security import get_password_hash
+from app.schemas.schemas import UserCreate, ImportErrorDetail, ImportSummary
+from app.core.security import get_password_hash, get_password_hashes
+
+# Rows per multi-row INSERT (4 bind parameters each, well under SQLite's limit)
+BULK_CREATE_BATCH_SIZE = 500
+
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.query(User).filter(User.id == user_id).first()
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
@@ -23,3 +31,85 @@ def create_user(db: Session, user: UserCreate) -> User:
     db.commit()
     db.refresh(db_user)
     return db_user
+
+def revoke_user_tokens(db: Session, user_id: int) -> Optional[User]:
+    """
+    Bumps the user's token_version so every access token issued so far is rejected.
+    The update also drops the user from the auth cache (see app.core.user_cache).
+    """
+    db_user = get_user(db, user_id)
+    if db_user is None:
+        return None
+    db_user.token_version = User.token_version + 1
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
+def _existing_values(db: Session, column, values: List[str]) -> set:
+    found = set()
+    for start in range(0, len(values), BULK_CREATE_BATCH_SIZE):
+        chunk = values[start:start + BULK_CREATE_BATCH_SIZE]
+        found.update(value for (value,) in db.query(column).filter(column.in_(chunk)).all())
+    return found
+
+
+def create_users_bulk(db: Session, users: List[UserCreate], batch_size: int = BULK_CREATE_BATCH_SIZE) -> ImportSummary:
+    """
+    Creates many users: duplicate usernames/emails (within the input or already stored)
+    are reported per row, the remaining passwords are hashed across the process pool
+    with no connection held, and rows are inserted in multi-row INSERT batches.
+    A batch hitting a unique violation (a concurrent insert) is retried row by row.
+    row_index in the errors is the position in `users`.
+    """
+    errors: List[ImportErrorDetail] = []
+
+    def reject(index: int, user: UserCreate, message: str):
+        errors.append(ImportErrorDetail(
+            row_index=index, error_message=message, data={"username": user.username, "email": user.email}
+        ))
+
+    existing_usernames = _existing_values(db, User.username, list({user.username for user in users}))
+    existing_emails = _existing_values(db, User.email, list({user.email for user in users if user.email}))
+    db.rollback() # Release the connection while hashing
+
+    accepted: Dict[int, UserCreate] = {}
+    seen_usernames, seen_emails = set(), set()
+    for index, user in enumerate(users):
+        if user.username in existing_usernames or user.username in seen_usernames:
+            reject(index, user, f"Username '{user.username}' already exists.")
+        elif user.email and (user.email in existing_emails or user.email in seen_emails):
+            reject(index, user, f"Email '{user.email}' already exists.")
+        else:
+            accepted[index] = user
+            seen_usernames.add(user.username)
+            if user.email:
+                seen_emails.add(user.email)
+
+    hashes = get_password_hashes([user.password for user in accepted.values()])
+    rows = [
+        (index, {"username": user.username, "email": user.email, "full_name": user.full_name, "hashed_password": hashed})
+        for (index, user), hashed in zip(accepted.items(), hashes)
+    ]
+
+    created_count = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        try:
+            db.execute(insert(User).values([values for _, values in batch]))
+            db.commit()
+            created_count += len(batch)
+            continue
+        except IntegrityError:
+            db.rollback()
+        for index, values in batch:
+            try:
+                db.execute(insert(User).values(values))
+                db.commit()
+                created_count += 1
+            except IntegrityError:
+                db.rollback()
+                reject(index, accepted[index], "Username or email already exists.")
+
+    errors.sort(key=lambda error: error.row_index)
+    return ImportSummary(imported_count=created_count, failed_count=len(errors), errors=errors)
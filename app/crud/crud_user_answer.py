@@ -2,8 +2,9 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func # Added func
 
-from app.models.models import UserAnswer, Question
+from app.models.models import UserAnswer, Question, UserQuestionProgress
 from app.schemas import schemas # Assuming schemas are imported as app.schemas
+from app.crud import crud_question, crud_question_stats, crud_user_question_progress, crud_user_exam_type_stats
 
 def create_user_answer(db: Session, user_answer: schemas.UserAnswerCreate, user_id: int) -> UserAnswer:
     # We need to fetch the question to determine if the answer is correct.
@@ -22,7 +23,18 @@ def create_user_answer(db: Session, user_answer: schemas.UserAnswerCreate, user_
         is_correct=is_correct
     )
     db.add(db_user_answer)
+    # Counters and the user's rollups are bumped in the same transaction as the answer row
+    crud_question_stats.increment_question_stats(
+        db, question_id=user_answer.question_id, selected_answer=user_answer.selected_answer, is_correct=is_correct
+    )
+    first_attempt = crud_user_question_progress.record_answer(
+        db, user_id=user_id, question_id=user_answer.question_id, exam_type_id=question.exam_type_id, is_correct=is_correct
+    )
+    crud_user_exam_type_stats.record_answer(
+        db, user_id=user_id, exam_type_id=question.exam_type_id, is_correct=is_correct, first_attempt=first_attempt
+    )
     db.commit()
+    crud_question.record_answer_in_sampler(question.exam_type_id, question.id, is_correct)
     db.refresh(db_user_answer)
     return db_user_answer
 
@@ -54,7 +66,7 @@ def get_answered_question_ids(db: Session, user_id: int) -> List[int]:
     """
     Retrieves a list of question IDs that the user has already answered.
     """
-    return [ua.question_id for ua in db.query(UserAnswer.question_id).filter(UserAnswer.user_id == user_id).distinct().all()]
+    return [p.question_id for p in db.query(UserQuestionProgress.question_id).filter(UserQuestionProgress.user_id == user_id).all()]
 
 
 def get_questions_always_answered_correctly_by_user(
@@ -66,32 +78,14 @@ def get_questions_always_answered_correctly_by_user(
     Returns a list of question IDs that the given user has answered one or more times,
     and all of those answers were correct. Optionally filters by exam_type_id.
     """
-    # Subquery to find question IDs that the user has answered incorrectly at least once for the given exam_type
-    incorrectly_answered_question_ids_sq = (
-        db.query(UserAnswer.question_id)
-        .join(Question, Question.id == UserAnswer.question_id)
-        .filter(UserAnswer.user_id == user_id)
-        .filter(UserAnswer.is_correct == False)
-    )
-    if exam_type_id is not None:
-        incorrectly_answered_question_ids_sq = incorrectly_answered_question_ids_sq.filter(Question.exam_type_id == exam_type_id)
-    
-    # Must be a subquery to be used with notin_
-    incorrectly_answered_question_ids_sq = incorrectly_answered_question_ids_sq.distinct().subquery()
-
-    # Query for question IDs that the user has answered (implies at least one answer exists)
-    # and are not in the subquery of incorrectly answered questions.
+    # The progress rollup already tracks whether any attempt was incorrect
     always_correct_query = (
-        db.query(UserAnswer.question_id)
-        .join(Question, Question.id == UserAnswer.question_id)
-        .filter(UserAnswer.user_id == user_id)
-        # Ensure we only consider questions that the user has answered.
-        # And that these questions are NOT in the set of questions they've answered incorrectly.
-        .filter(UserAnswer.question_id.notin_(incorrectly_answered_question_ids_sq.select()))
+        db.query(UserQuestionProgress.question_id)
+        .filter(UserQuestionProgress.user_id == user_id)
+        .filter(UserQuestionProgress.ever_incorrect == False)
     )
     if exam_type_id is not None:
-        always_correct_query = always_correct_query.filter(Question.exam_type_id == exam_type_id)
-    
-    always_correct_questions = always_correct_query.distinct().all()
-    
-    return [q.question_id for q in always_correct_questions]
+        always_correct_query = always_correct_query.join(Question, Question.id == UserQuestionProgress.question_id)\
+                                                   .filter(Question.exam_type_id == exam_type_id)
+
+    return [q.question_id for q in always_correct_query.all()]
@@ -0,0 +1,139 @@
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, insert, delete
+
+from app.db.upsert import execute_upsert
+from app.models.models import Question, UserAnswer, UserExamTypeStats
+
+# user_exam_type_stats.exam_type_id of answers to questions that have no exam type
+NO_EXAM_TYPE = 0
+
+
+def exam_type_bucket(exam_type_id: Optional[int]) -> int:
+    return exam_type_id if exam_type_id is not None else NO_EXAM_TYPE
+
+
+def get_user_totals(db: Session, user_id: int, exam_type_id: Optional[int] = None):
+    """
+    (unique_questions, total_answers, total_correct) of a user, for one exam type (a
+    primary-key lookup) or summed over the user's few per-exam-type rows.
+    """
+    query = db.query(
+        func.coalesce(func.sum(UserExamTypeStats.unique_questions), 0).label("unique_questions"),
+        func.coalesce(func.sum(UserExamTypeStats.total_answers), 0).label("total_answers"),
+        func.coalesce(func.sum(UserExamTypeStats.total_correct), 0).label("total_correct"),
+    ).filter(UserExamTypeStats.user_id == user_id)
+    if exam_type_id is not None:
+        query = query.filter(UserExamTypeStats.exam_type_id == exam_type_id)
+    return query.one()
+
+
+def record_answer(db: Session, user_id: int, exam_type_id: Optional[int], is_correct: bool, first_attempt: bool) -> None:
+    """
+    Adds one answer to the user's totals for the question's exam type as a single atomic
+    upsert; first_attempt counts the question as newly attempted.
+    Does not commit: the caller commits it together with the UserAnswer row.
+    """
+    values = {
+        "total_answers": 1,
+        "total_correct": 1 if is_correct else 0,
+        "unique_questions": 1 if first_attempt else 0,
+    }
+    increments = {column: getattr(UserExamTypeStats, column) + amount for column, amount in values.items() if amount}
+
+    execute_upsert(
+        db, UserExamTypeStats, {"user_id": user_id, "exam_type_id": exam_type_bucket(exam_type_id)}, values, increments
+    )
+
+
+def _aggregated_stats_query(user_ids: Optional[Iterable[int]] = None, exam_type_ids: Optional[Iterable[int]] = None):
+    """SELECT that recomputes user_exam_type_stats rows from user_answers."""
+    bucket = func.coalesce(Question.exam_type_id, NO_EXAM_TYPE)
+    query = (
+        select(
+            UserAnswer.user_id,
+            bucket.label("exam_type_id"),
+            func.count(UserAnswer.id).label("total_answers"),
+            func.sum(case((UserAnswer.is_correct == True, 1), else_=0)).label("total_correct"),
+            func.count(func.distinct(UserAnswer.question_id)).label("unique_questions"),
+        )
+        .join(Question, Question.id == UserAnswer.question_id)
+        .group_by(UserAnswer.user_id, bucket)
+    )
+    if user_ids is not None:
+        query = query.filter(UserAnswer.user_id.in_(list(user_ids)))
+    if exam_type_ids is not None:
+        query = query.filter(bucket.in_(list(exam_type_ids)))
+    return query
+
+
+def _stats_scope(query, user_ids: Optional[Iterable[int]], exam_type_ids: Optional[Iterable[int]]):
+    if user_ids is not None:
+        query = query.where(UserExamTypeStats.user_id.in_(list(user_ids)))
+    if exam_type_ids is not None:
+        query = query.where(UserExamTypeStats.exam_type_id.in_(list(exam_type_ids)))
+    return query
+
+
+def refresh_user_exam_type_stats(
+    db: Session, user_ids: Optional[Iterable[int]] = None, exam_type_ids: Optional[Iterable[int]] = None
+) -> None:
+    """
+    Recomputes the rows of the given users and/or exam types from user_answers, for
+    changes that move answers between exam types (a question changing exam type, an
+    exam type being deleted) or remove them. Does not commit; pending ORM changes
+    must be flushed first.
+    """
+    user_ids = None if user_ids is None else list(user_ids)
+    exam_type_ids = None if exam_type_ids is None else list(exam_type_ids)
+    db.execute(_stats_scope(delete(UserExamTypeStats), user_ids, exam_type_ids))
+    db.execute(
+        insert(UserExamTypeStats).from_select(
+            ["user_id", "exam_type_id", "total_answers", "total_correct", "unique_questions"],
+            _aggregated_stats_query(user_ids, exam_type_ids)
+        )
+    )
+
+
+def rebuild_user_exam_type_stats(db: Session, user_id: Optional[int] = None, exam_type_id: Optional[int] = None) -> int:
+    """
+    Rebuilds user_exam_type_stats from user_answers (optionally for one user and/or
+    exam type) in one transaction. Returns the number of rows written.
+    """
+    user_ids = None if user_id is None else [user_id]
+    exam_type_ids = None if exam_type_id is None else [exam_type_id]
+    refresh_user_exam_type_stats(db, user_ids, exam_type_ids)
+    db.commit()
+
+    return db.execute(
+        _stats_scope(select(func.count()).select_from(UserExamTypeStats), user_ids, exam_type_ids)
+    ).scalar() or 0
+
+
+def find_user_exam_type_stats_mismatches(db: Session, user_id: Optional[int] = None, exam_type_id: Optional[int] = None) -> List[tuple]:
+    """
+    Returns (user_id, exam_type_id) pairs whose totals differ from user_answers,
+    including missing and stale rows.
+    """
+    user_ids = None if user_id is None else [user_id]
+    exam_type_ids = None if exam_type_id is None else [exam_type_id]
+    aggregated = _aggregated_stats_query(user_ids, exam_type_ids).subquery("aggregated")
+    expected = {
+        (row.user_id, row.exam_type_id): (row.total_answers, row.total_correct, row.unique_questions)
+        for row in db.execute(select(aggregated))
+    }
+    stored_query = _stats_scope(
+        select(
+            UserExamTypeStats.user_id,
+            UserExamTypeStats.exam_type_id,
+            UserExamTypeStats.total_answers,
+            UserExamTypeStats.total_correct,
+            UserExamTypeStats.unique_questions,
+        ),
+        user_ids, exam_type_ids
+    )
+    stored = {
+        (row.user_id, row.exam_type_id): (row.total_answers, row.total_correct, row.unique_questions)
+        for row in db.execute(stored_query)
+    }
+    return sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
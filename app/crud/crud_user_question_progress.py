@@ -0,0 +1,209 @@
+from datetime import timedelta
+from itertools import groupby
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, insert, delete, update, bindparam
+
+from app.core import spaced_repetition
+from app.db.datetime_sql import add_seconds
+from app.db.upsert import execute_upsert
+from app.models.models import Question, UserAnswer, UserQuestionProgress
+
+
+def get_progress(db: Session, user_id: int, question_id: int) -> Optional[UserQuestionProgress]:
+    return db.query(UserQuestionProgress).filter(
+        UserQuestionProgress.user_id == user_id,
+        UserQuestionProgress.question_id == question_id
+    ).first()
+
+
+def _schedule_updates(is_correct: bool) -> dict:
+    """spaced_repetition.review() as SET expressions over the row's current schedule."""
+    progress = UserQuestionProgress
+    if not is_correct:
+        lowered_ease = progress.ease - spaced_repetition.LAPSE_EASE_PENALTY
+        return {
+            "ease": case((lowered_ease < spaced_repetition.MIN_EASE, spaced_repetition.MIN_EASE), else_=lowered_ease),
+            "interval_days": 0.0,
+            "repetitions": 0,
+            "due_at": add_seconds(func.now(), spaced_repetition.RELEARN_DELAY_SECONDS),
+        }
+    grown_interval = progress.interval_days * progress.ease
+    interval_days = case(
+        (progress.repetitions == 0, spaced_repetition.FIRST_INTERVAL_DAYS),
+        (progress.repetitions == 1, spaced_repetition.SECOND_INTERVAL_DAYS),
+        (grown_interval > spaced_repetition.MAX_INTERVAL_DAYS, spaced_repetition.MAX_INTERVAL_DAYS),
+        else_=grown_interval
+    )
+    return {
+        "ease": progress.ease + spaced_repetition.CORRECT_EASE_BONUS,
+        "interval_days": interval_days,
+        "repetitions": progress.repetitions + 1,
+        "due_at": add_seconds(func.now(), interval_days * spaced_repetition.SECONDS_PER_DAY),
+    }
+
+
+def _first_schedule(is_correct: bool) -> dict:
+    ease, interval_days, repetitions = spaced_repetition.review(spaced_repetition.INITIAL_EASE, 0.0, 0, is_correct)
+    return {
+        "ease": ease,
+        "interval_days": interval_days,
+        "repetitions": repetitions,
+        "due_at": add_seconds(func.now(), spaced_repetition.delay_seconds(interval_days)),
+    }
+
+
+def record_answer(db: Session, user_id: int, question_id: int, exam_type_id: Optional[int], is_correct: bool) -> bool:
+    """
+    Upserts the (user, question) rollup and review schedule for one new answer and
+    returns whether it was the user's first attempt at the question.
+    Does not commit: the caller commits it together with the UserAnswer row.
+    """
+    updates = {
+        "attempts": UserQuestionProgress.attempts + 1,
+        "last_answered_at": func.now(),
+        "exam_type_id": exam_type_id,
+        **_schedule_updates(is_correct),
+    }
+    if is_correct:
+        updates["correct_count"] = UserQuestionProgress.correct_count + 1
+    else:
+        updates["ever_incorrect"] = True
+
+    row = execute_upsert(
+        db,
+        UserQuestionProgress,
+        {"user_id": user_id, "question_id": question_id},
+        {"attempts": 1, "correct_count": 1 if is_correct else 0, "ever_incorrect": not is_correct, "last_answered_at": func.now(),
+         "exam_type_id": exam_type_id, **_first_schedule(is_correct)},
+        updates,
+        returning=[UserQuestionProgress.attempts]
+    )
+    return row.attempts == 1
+
+
+def get_earliest_due_question_id(db: Session, user_id: int, exam_type_id: int) -> Optional[int]:
+    """The user's question of the exam type whose review is most overdue, or None if none is due."""
+    return db.query(UserQuestionProgress.question_id).filter(
+        UserQuestionProgress.user_id == user_id,
+        UserQuestionProgress.exam_type_id == exam_type_id,
+        UserQuestionProgress.due_at <= func.now()
+    ).order_by(UserQuestionProgress.due_at, UserQuestionProgress.question_id).limit(1).scalar()
+
+
+def _aggregated_progress_query(user_id: Optional[int] = None, exam_type_id: Optional[int] = None):
+    """SELECT that recomputes user_question_progress rows from user_answers."""
+    query = (
+        select(
+            UserAnswer.user_id,
+            UserAnswer.question_id,
+            func.count(UserAnswer.id).label("attempts"),
+            func.sum(case((UserAnswer.is_correct == True, 1), else_=0)).label("correct_count"),
+            (func.sum(case((UserAnswer.is_correct == False, 1), else_=0)) > 0).label("ever_incorrect"),
+            func.max(UserAnswer.answered_at).label("last_answered_at"),
+            Question.exam_type_id,
+        )
+        .join(Question, Question.id == UserAnswer.question_id)
+        .group_by(UserAnswer.user_id, UserAnswer.question_id, Question.exam_type_id)
+    )
+    if user_id is not None:
+        query = query.filter(UserAnswer.user_id == user_id)
+    if exam_type_id is not None:
+        query = query.filter(Question.exam_type_id == exam_type_id)
+    return query
+
+
+def _progress_scope(query, user_id: Optional[int], exam_type_id: Optional[int]):
+    if user_id is not None:
+        query = query.filter(UserQuestionProgress.user_id == user_id)
+    if exam_type_id is not None:
+        query = query.join(Question, Question.id == UserQuestionProgress.question_id)\
+                     .filter(Question.exam_type_id == exam_type_id)
+    return query
+
+
+def rebuild_user_question_progress(db: Session, user_id: Optional[int] = None, exam_type_id: Optional[int] = None) -> int:
+    """
+    Rebuilds user_question_progress from user_answers (optionally for one user
+    and/or exam type) in one transaction. Returns the number of rows written.
+    """
+    clear_stmt = delete(UserQuestionProgress)
+    if user_id is not None:
+        clear_stmt = clear_stmt.where(UserQuestionProgress.user_id == user_id)
+    if exam_type_id is not None:
+        clear_stmt = clear_stmt.where(
+            UserQuestionProgress.question_id.in_(select(Question.id).where(Question.exam_type_id == exam_type_id))
+        )
+    db.execute(clear_stmt)
+
+    db.execute(
+        insert(UserQuestionProgress).from_select(
+            ["user_id", "question_id", "attempts", "correct_count", "ever_incorrect", "last_answered_at", "exam_type_id"],
+            _aggregated_progress_query(user_id, exam_type_id)
+        )
+    )
+    _replay_schedules(db, user_id, exam_type_id)
+    db.commit()
+
+    return _progress_scope(db.query(func.count()).select_from(UserQuestionProgress), user_id, exam_type_id).scalar() or 0
+
+
+REPLAY_BATCH_SIZE = 1000
+
+def _replay_schedules(db: Session, user_id: Optional[int], exam_type_id: Optional[int]) -> None:
+    """Recomputes every rebuilt row's review schedule by replaying its answers in order."""
+    answers = select(UserAnswer.user_id, UserAnswer.question_id, UserAnswer.is_correct, UserAnswer.answered_at)\
+        .join(Question, Question.id == UserAnswer.question_id)\
+        .order_by(UserAnswer.user_id, UserAnswer.question_id, UserAnswer.answered_at, UserAnswer.id)
+    if user_id is not None:
+        answers = answers.where(UserAnswer.user_id == user_id)
+    if exam_type_id is not None:
+        answers = answers.where(Question.exam_type_id == exam_type_id)
+    stmt = update(UserQuestionProgress).where(
+        UserQuestionProgress.user_id == bindparam("b_user_id"), UserQuestionProgress.question_id == bindparam("b_question_id")
+    ).values(
+        ease=bindparam("b_ease"), interval_days=bindparam("b_interval_days"),
+        repetitions=bindparam("b_repetitions"), due_at=bindparam("b_due_at")
+    )
+    batch = []
+    for (answer_user_id, question_id), rows in groupby(db.execute(answers), key=lambda row: (row.user_id, row.question_id)):
+        ease, interval_days, repetitions = spaced_repetition.INITIAL_EASE, 0.0, 0
+        for row in rows:
+            ease, interval_days, repetitions = spaced_repetition.review(ease, interval_days, repetitions, row.is_correct)
+        batch.append({
+            "b_user_id": answer_user_id, "b_question_id": question_id, "b_ease": ease, "b_interval_days": interval_days,
+            "b_repetitions": repetitions, "b_due_at": row.answered_at + timedelta(seconds=spaced_repetition.delay_seconds(interval_days)),
+        })
+        if len(batch) >= REPLAY_BATCH_SIZE:
+            db.connection().execute(stmt, batch)
+            batch = []
+    if batch:
+        db.connection().execute(stmt, batch)
+
+
+def find_user_question_progress_mismatches(db: Session, user_id: Optional[int] = None, exam_type_id: Optional[int] = None) -> List[tuple]:
+    """
+    Returns (user_id, question_id) pairs whose rollup counters (or copied exam type)
+    differ from user_answers, including missing and stale rows.
+    """
+    aggregated = _aggregated_progress_query(user_id, exam_type_id).subquery("aggregated")
+    expected = {
+        (row.user_id, row.question_id): (row.attempts, row.correct_count, bool(row.ever_incorrect), row.exam_type_id)
+        for row in db.execute(select(aggregated))
+    }
+    stored_query = _progress_scope(
+        db.query(
+            UserQuestionProgress.user_id,
+            UserQuestionProgress.question_id,
+            UserQuestionProgress.attempts,
+            UserQuestionProgress.correct_count,
+            UserQuestionProgress.ever_incorrect,
+            UserQuestionProgress.exam_type_id,
+        ),
+        user_id, exam_type_id
+    )
+    stored = {
+        (row.user_id, row.question_id): (row.attempts, row.correct_count, bool(row.ever_incorrect), row.exam_type_id)
+        for row in stored_query.all()
+    }
+    return sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
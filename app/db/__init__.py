@@ -1 +1 @@
-from .database import SessionLocal, engine, get_db, Base
+from .database import SessionLocal, engine, get_db, Base, AsyncSessionLocal, async_engine, get_async_db
@@ -0,0 +1,67 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import os
+
+# Add project root to sys.path to allow imports from app
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from pydantic import ValidationError
+
+from app.db.database import SessionLocal
+from app.crud import crud_user
+from app.schemas.schemas import UserCreate, ImportErrorDetail, ImportSummary
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def read_user_rows(path: str) -> list:
+    """Rows from a JSON list of objects or a CSV with a header (username,password[,email,full_name])."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".json"):
+            return json.load(f)
+        return [{key: value or None for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+def bulk_create_users(path: str, batch_size: int = crud_user.BULK_CREATE_BATCH_SIZE) -> ImportSummary:
+    """
+    Validates every row, then creates the valid ones with crud_user.create_users_bulk.
+    Errors keep the row's position in the file (0-based, header excluded).
+    """
+    errors = []
+    valid_indices, valid_users = [], []
+    for index, row in enumerate(read_user_rows(path)):
+        try:
+            valid_users.append(UserCreate(**row))
+            valid_indices.append(index)
+        except (ValidationError, TypeError) as e:
+            errors.append(ImportErrorDetail(row_index=index, error_message=f"Validation Error: {e}"))
+
+    db = SessionLocal()
+    try:
+        result = crud_user.create_users_bulk(db, users=valid_users, batch_size=batch_size)
+    finally:
+        db.close()
+    for error in result.errors:
+        error.row_index = valid_indices[error.row_index]
+    errors = sorted(errors + result.errors, key=lambda error: error.row_index)
+    return ImportSummary(imported_count=result.imported_count, failed_count=len(errors), errors=errors)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create many users from a JSON or CSV file.")
+    parser.add_argument("path", help="JSON list of users, or CSV with username,password,email,full_name columns.")
+    parser.add_argument("--batch-size", type=int, default=crud_user.BULK_CREATE_BATCH_SIZE, help="Rows per INSERT statement.")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        logger.error("DATABASE_URL environment variable is not set. Cannot create users.")
+        sys.exit(2)
+    summary = bulk_create_users(args.path, batch_size=args.batch_size)
+    for error in summary.errors:
+        logger.warning(f"Row {error.row_index}: {error.error_message}")
+    logger.info(f"Created {summary.imported_count} user(s), {summary.failed_count} row(s) failed.")
+    sys.exit(1 if summary.failed_count else 0)
@@ -1,14 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 import os
 
+from app.core.config import (
+    DB_ASYNC_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
+from app.db.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+def pool_options(url, poolclass) -> dict:
+    """Configured, instrumented QueuePool settings for an engine URL."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {} # In-memory SQLite keeps SQLAlchemy's single-connection pool
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -18,3 +38,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async mode (DB_ASYNC_MODE=true): the quiz routers use an AsyncSession on an async
+# driver instead of occupying a thread-pool slot per request.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_database_url(url: str) -> str:
+    """Swaps the sync DBAPI driver in a database URL for its async counterpart."""
+    parsed = make_url(url)
+    async_driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if async_driver is None or parsed.drivername == async_driver:
+        return url
+    return parsed.set(drivername=async_driver).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (to_async_database_url(DATABASE_URL) if DATABASE_URL else None)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC_MODE:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncAdaptedQueuePool)
+    )
+    # expire_on_commit=False: attributes must stay loaded after commit, since lazy
+    # loads cannot happen implicitly outside the session's greenlet
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,26 @@
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class add_seconds(FunctionElement):
+    """
+    SQL expression for a timestamp plus a (possibly computed) number of seconds,
+    e.g. add_seconds(func.now(), Model.interval_days * 86400), so date arithmetic
+    can run inside one UPDATE on every supported database.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+    name = "add_seconds"
+
+
+@compiles(add_seconds)
+def _add_seconds_default(element, compiler, **kw):
+    timestamp, seconds = list(element.clauses)
+    return f"({compiler.process(timestamp, **kw)} + ({compiler.process(seconds, **kw)}) * INTERVAL '1' SECOND)"
+
+
+@compiles(add_seconds, "sqlite")
+def _add_seconds_sqlite(element, compiler, **kw):
+    timestamp, seconds = list(element.clauses)
+    return f"datetime({compiler.process(timestamp, **kw)}, '+' || ({compiler.process(seconds, **kw)}) || ' seconds')"
@@ -0,0 +1,60 @@
+import argparse
+import json
+import logging
+import sys
+import os
+
+# Add project root to sys.path to allow imports from app
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from app.core.near_duplicates import DEFAULT_THRESHOLD
+from app.db.database import SessionLocal
+from app.crud import crud_exam_type, crud_question
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def find_near_duplicates(exam_type_id=None, threshold=DEFAULT_THRESHOLD) -> list:
+    """
+    Scans one exam type (or every exam type) for clusters of near-duplicate questions.
+    Returns the NearDuplicateReport of each scanned exam type.
+    """
+    db = SessionLocal()
+    try:
+        if exam_type_id is not None:
+            exam_type_ids = [exam_type_id]
+        else:
+            exam_type_ids = [exam_type.id for exam_type in crud_exam_type.get_exam_types(db, skip=0, limit=None)]
+        reports = []
+        for current_id in exam_type_ids:
+            report = crud_question.find_near_duplicate_questions(db, exam_type_id=current_id, threshold=threshold)
+            duplicates = sum(len(cluster.question_ids) - 1 for cluster in report.clusters)
+            logger.info(
+                f"Exam type {current_id}: {len(report.clusters)} cluster(s) among {report.question_count} questions, "
+                f"{duplicates} question(s) beyond the first of each cluster."
+            )
+            reports.append(report)
+        return reports
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find clusters of near-duplicate questions (MinHash/LSH).")
+    parser.add_argument("--exam-type-id", type=int, default=None, help="Only scan this exam type (default: all).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum Jaccard similarity of word bigrams (default {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--output", default=None, help="Write the reports as JSON to this file (default: stdout).")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        logger.error("DATABASE_URL environment variable is not set. Cannot scan questions.")
+        sys.exit(2)
+    reports = find_near_duplicates(exam_type_id=args.exam_type_id, threshold=args.threshold)
+    document = json.dumps([report.model_dump() for report in reports], indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(document)
+    else:
+        print(document)
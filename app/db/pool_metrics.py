@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for one connection pool: checkout wait times (recent
+    window for percentiles, plus totals), timeouts and high-water marks of
+    checked-out and overflow connections.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, wait_seconds: float, checked_out: int, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self._recent_waits.append(wait_seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self._recent_waits.append(wait_seconds)
+
+    def wait_percentiles_ms(self) -> Dict[str, float]:
+        with self._lock:
+            waits = sorted(self._recent_waits)
+        if not waits:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * q))] * 1000, 3)
+
+        return {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)}
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout through the public Pool.connect(): the wait for a free
+    connection, plus opening a new one or its pre-ping when that happens.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout(), self.overflow())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_snapshot(pool: Optional[Pool], max_overflow: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Current state plus accumulated metrics of a pool, or None if there is no pool.
+    max_overflow is the setting the pool was created with (QueuePool has no public getter).
+    """
+    if pool is None:
+        return None
+    snapshot: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "pool_size": pool.size(),
+            "max_overflow": max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow_in_use": pool.overflow(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(metrics, PoolMetrics):
+        snapshot.update({
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "peak_checked_out": metrics.peak_checked_out,
+            "peak_overflow": metrics.peak_overflow,
+            "wait_ms": {
+                **metrics.wait_percentiles_ms(),
+                "max": round(metrics.max_wait_seconds * 1000, 3),
+                "mean": round(metrics.total_wait_seconds * 1000 / max(1, metrics.checkouts + metrics.timeouts), 3),
+            },
+        })
+    return snapshot
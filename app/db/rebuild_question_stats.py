@@ -0,0 +1,47 @@
+import argparse
+import logging
+import sys
+import os
+
+# Add project root to sys.path to allow imports from app
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from app.db.database import SessionLocal
+from app.crud import crud_question_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild_question_stats(exam_type_id=None, check_only=False) -> int:
+    """
+    Backfills/reconciles the question_stats counters from user_answers.
+    With check_only, only reports drift. Returns the number of mismatched questions found.
+    """
+    db = SessionLocal()
+    try:
+        mismatched_ids = crud_question_stats.find_question_stats_mismatches(db, exam_type_id=exam_type_id)
+        if mismatched_ids:
+            logger.warning(f"{len(mismatched_ids)} question(s) have stale stats, e.g. ids {mismatched_ids[:20]}")
+        else:
+            logger.info("question_stats is consistent with user_answers.")
+
+        if not check_only:
+            rows = crud_question_stats.rebuild_question_stats(db, exam_type_id=exam_type_id)
+            logger.info(f"Rebuilt question_stats: {rows} row(s) written.")
+        return len(mismatched_ids)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the question_stats counters from user_answers.")
+    parser.add_argument("--exam-type-id", type=int, default=None, help="Only rebuild questions of this exam type.")
+    parser.add_argument("--check", action="store_true", help="Report mismatches without writing (exit code 1 if any).")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        logger.error("DATABASE_URL environment variable is not set. Cannot rebuild question stats.")
+        sys.exit(2)
+    mismatches = rebuild_question_stats(exam_type_id=args.exam_type_id, check_only=args.check)
+    sys.exit(1 if args.check and mismatches else 0)
@@ -0,0 +1,50 @@
+import argparse
+import logging
+import sys
+import os
+
+# Add project root to sys.path to allow imports from app
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from app.db.database import SessionLocal
+from app.crud import crud_user_exam_type_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild_user_exam_type_stats(user_id=None, exam_type_id=None, check_only=False) -> int:
+    """
+    Backfills/reconciles user_exam_type_stats from user_answers.
+    With check_only, only reports drift. Returns the number of mismatched rows found.
+    """
+    db = SessionLocal()
+    try:
+        mismatched = crud_user_exam_type_stats.find_user_exam_type_stats_mismatches(
+            db, user_id=user_id, exam_type_id=exam_type_id
+        )
+        if mismatched:
+            logger.warning(f"{len(mismatched)} (user_id, exam_type_id) row(s) are stale, e.g. {mismatched[:20]}")
+        else:
+            logger.info("user_exam_type_stats is consistent with user_answers.")
+
+        if not check_only:
+            rows = crud_user_exam_type_stats.rebuild_user_exam_type_stats(db, user_id=user_id, exam_type_id=exam_type_id)
+            logger.info(f"Rebuilt user_exam_type_stats: {rows} row(s) written.")
+        return len(mismatched)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the per-(user, exam type) summary totals from user_answers.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild rows of this user.")
+    parser.add_argument("--exam-type-id", type=int, default=None, help="Only rebuild this exam type (0: questions without one).")
+    parser.add_argument("--check", action="store_true", help="Report mismatches without writing (exit code 1 if any).")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        logger.error("DATABASE_URL environment variable is not set. Cannot rebuild user exam type stats.")
+        sys.exit(2)
+    mismatches = rebuild_user_exam_type_stats(user_id=args.user_id, exam_type_id=args.exam_type_id, check_only=args.check)
+    sys.exit(1 if args.check and mismatches else 0)
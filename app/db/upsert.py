@@ -0,0 +1,34 @@
+from sqlalchemy import update, insert, select, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def execute_upsert(db: Session, model, key_values: dict, insert_values: dict, update_values: dict, returning=None):
+    """
+    INSERT a row keyed by key_values, or apply update_values to the existing row,
+    as one atomic statement (ON CONFLICT DO UPDATE on PostgreSQL/SQLite).
+    update_values may reference the current row's columns (e.g. Model.count + 1).
+    With `returning` (a list of columns) returns those columns of the row as written.
+    Does not commit.
+    """
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(model).values(**key_values, **insert_values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[getattr(model, key) for key in key_values],
+            set_=update_values
+        )
+        if returning:
+            return db.execute(stmt.returning(*returning)).first()
+        db.execute(stmt)
+        return None
+
+    # Generic fallback: update in place, create the row if it did not exist yet
+    key_filter = and_(*[getattr(model, key) == value for key, value in key_values.items()])
+    result = db.execute(update(model).where(key_filter).values(**update_values))
+    if result.rowcount == 0:
+        db.execute(insert(model).values(**key_values, **insert_values))
+    if returning:
+        return db.execute(select(*returning).where(key_filter)).first()
+    return None
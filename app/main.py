@@ -1,7 +1,15 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
 from app.routers import questions, auth, summary, pages # Existing routers
 from app.routers import exam_types # New router
+from app.routers import questions_async, summary_async # Async-mode quiz routers
+from app.routers import metrics, users, import_jobs
+from app.core import cache_invalidation
+from app.core.config import DB_ASYNC_MODE
+from app.crud import crud_exam_type
 from app.db import database, init_db
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware # If you have CORS middleware
@@ -10,7 +18,19 @@ from fastapi.middleware.cors import CORSMiddleware # If you have CORS middleware
 # In a production app with Alembic, you might handle this differently.
 # models.Base.metadata.create_all(bind=database.engine) # init_db.init_db() might handle this
 
-app = FastAPI(title="Quiz App")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Evict this worker's caches when other workers change what they hold (PostgreSQL only)
+    cache_invalidation.start_listener(database.engine)
+    try:
+        with database.SessionLocal() as db:
+            crud_exam_type.load_exam_type_registry(db)
+    except SQLAlchemyError:
+        pass # e.g. not migrated yet; the first exam type lookup loads it instead
+    yield
+    cache_invalidation.stop_listener()
+
+app = FastAPI(title="Quiz App", lifespan=lifespan)
 
 # Optional: CORS Middleware (if you have it, ensure it's configured correctly)
 app.add_middleware(
@@ -27,9 +47,17 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(pages.router, tags=["Pages"]) # Serve HTML pages
-app.include_router(questions.router, prefix="/questions", tags=["Questions"])
-app.include_router(summary.router, prefix="/summary", tags=["Summary"])
+# The quiz routers come in a sync (thread pool) and an async (AsyncSession) flavour
+if DB_ASYNC_MODE:
+    app.include_router(questions_async.router, prefix="/questions", tags=["Questions"])
+    app.include_router(summary_async.router, prefix="/summary", tags=["Summary"])
+else:
+    app.include_router(questions.router, prefix="/questions", tags=["Questions"])
+    app.include_router(summary.router, prefix="/summary", tags=["Summary"])
 app.include_router(exam_types.router) # Add the new exam_types router
+app.include_router(users.router)
+app.include_router(import_jobs.router)
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 # Optional: Initialize DB with some data (if init_db.py is used)
 # @app.on_event("startup")
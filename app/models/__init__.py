@@ -1 +1 @@
-from .models import Base, Question, UserAnswer, User # Added User
+from .models import Base, Question, UserAnswer, User, QuestionStats, UserQuestionProgress, UserExamTypeStats, question_content_hash # Added User
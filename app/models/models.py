@@ -1,9 +1,11 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+import hashlib
+import unicodedata
+
+from sqlalchemy import create_engine, Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, false, event, cast, inspect
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
-Base = declarative_base()
+from app.db.database import Base # Shared with get_db/test setup so create_all sees these tables
 
 # New ExamType model
 class ExamType(Base):
@@ -28,11 +30,51 @@ class Question(Base):
     explanation = Column(Text, nullable=True)
 
     # Add ForeignKey and relationship to ExamType
-    exam_type_id = Column(Integer, ForeignKey("exam_types.id"), nullable=True) # Will be made non-nullable after initial data population
+    exam_type_id = Column(Integer, ForeignKey("exam_types.id"), nullable=True, index=True) # Will be made non-nullable after initial data population
     exam_type = relationship("ExamType", back_populates="questions")
 
+    # SHA-256 of the normalized statement and options (see question_content_hash); one question
+    # per content within an exam type. NULL only for legacy duplicates left by migration 0003.
+    content_hash = Column(String(64), nullable=True)
+
     user_answers = relationship("UserAnswer", back_populates="question")
 
+    __table_args__ = (
+        Index("uq_questions_exam_type_id_content_hash", "exam_type_id", "content_hash", unique=True),
+    )
+
+
+CONTENT_HASH_FIELDS = ["problem_statement", "option_1", "option_2", "option_3", "option_4"]
+
+
+def question_content_hash(problem_statement: str, option_1: str, option_2: str, option_3: str, option_4: str) -> str:
+    """
+    Identity of a question's content: Unicode (NFKC), whitespace and case differences are
+    ignored. The correct answer and explanation are not part of it, so a re-import can
+    correct them in place.
+    """
+    # split()/join collapses and strips whitespace exactly like re.sub(r"\s+", " ", ...).strip(), several times faster
+    normalized = [
+        " ".join(unicodedata.normalize("NFKC", value or "").split()).casefold()
+        for value in (problem_statement, option_1, option_2, option_3, option_4)
+    ]
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+# ORM inserts/updates keep content_hash in step; bulk Core inserts must set it themselves
+@event.listens_for(Question, "before_insert")
+def _set_question_content_hash(mapper, connection, target: Question) -> None:
+    target.content_hash = question_content_hash(*(getattr(target, field) for field in CONTENT_HASH_FIELDS))
+
+
+@event.listens_for(Question, "before_update")
+def _update_question_content_hash(mapper, connection, target: Question) -> None:
+    # Only when the hashed content changed: editing e.g. the explanation of a legacy
+    # duplicate (NULL hash, see migration 0003) must not give it a colliding hash
+    attrs = inspect(target).attrs
+    if any(getattr(attrs, field).history.has_changes() for field in CONTENT_HASH_FIELDS):
+        _set_question_content_hash(mapper, connection, target)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -42,6 +84,8 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=True)
     full_name = Column(String, nullable=True)
     hashed_password = Column(String, nullable=False)
+    # Embedded in access tokens as "ver"; bumping it revokes every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     answers = relationship("UserAnswer", back_populates="user")
 
@@ -58,3 +102,89 @@ class UserAnswer(Base):
 
     question = relationship("Question", back_populates="user_answers")
     user = relationship("User", back_populates="answers") # Added relationship to User
+
+    # Hot query paths: per-user history, per-question correctness, recent activity
+    __table_args__ = (
+        Index("ix_user_answers_user_id_question_id", "user_id", "question_id"),
+        Index("ix_user_answers_question_id_is_correct", "question_id", "is_correct"),
+        Index("ix_user_answers_user_id_answered_at", "user_id", "answered_at"),
+    )
+
+
+class QuestionStats(Base):
+    # Running answer counters per question, kept in step with user_answers by
+    # crud_user_answer.create_user_answer so stats reads don't rescan the answer history.
+    __tablename__ = "question_stats"
+
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    total_answers = Column(Integer, nullable=False, default=0, server_default="0")
+    total_correct = Column(Integer, nullable=False, default=0, server_default="0")
+    option_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    option_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    option_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    option_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class UserQuestionProgress(Base):
+    # Per-(user, question) rollup of user_answers, upserted by
+    # crud_user_answer.create_user_answer in the same transaction as the answer.
+    __tablename__ = "user_question_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ever_incorrect = Column(Boolean, nullable=False, default=False, server_default=false())
+    last_answered_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Copy of the question's exam type, so per-exam-type summary pages are one index range
+    exam_type_id = Column(Integer, nullable=True)
+    # Review schedule (app.core.spaced_repetition), updated by the same upsert
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    interval_days = Column(Float, nullable=False, default=0.0, server_default="0")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0") # Consecutive correct answers
+    due_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# Sort keys of the paginated question performance in /summary/ (crud_summary). Queries
+# must use these exact expressions for the planner to match the expression indexes.
+PROGRESS_INCORRECT_COUNT = UserQuestionProgress.attempts - UserQuestionProgress.correct_count
+PROGRESS_ACCURACY = cast(UserQuestionProgress.correct_count, Float).op("/")(UserQuestionProgress.attempts)
+
+Index("ix_user_question_progress_user_exam_type_question", UserQuestionProgress.user_id, UserQuestionProgress.exam_type_id, UserQuestionProgress.question_id)
+Index("ix_user_question_progress_user_exam_type_incorrect", UserQuestionProgress.user_id, UserQuestionProgress.exam_type_id, PROGRESS_INCORRECT_COUNT, UserQuestionProgress.question_id)
+Index("ix_user_question_progress_user_exam_type_answered_at", UserQuestionProgress.user_id, UserQuestionProgress.exam_type_id, UserQuestionProgress.last_answered_at, UserQuestionProgress.question_id)
+Index("ix_user_question_progress_user_exam_type_accuracy", UserQuestionProgress.user_id, UserQuestionProgress.exam_type_id, PROGRESS_ACCURACY, UserQuestionProgress.question_id)
+# Due queue of /questions/next/: the earliest due review is the first entry of the range
+Index("ix_user_question_progress_user_exam_type_due", UserQuestionProgress.user_id, UserQuestionProgress.exam_type_id, UserQuestionProgress.due_at, UserQuestionProgress.question_id)
+
+
+class UserExamTypeStats(Base):
+    # Per-(user, exam type) answer totals, bumped by crud_user_answer.create_user_answer in the
+    # same transaction as the answer, so the summary reads one row instead of aggregating.
+    # exam_type_id is not a foreign key: 0 (NO_EXAM_TYPE) collects questions without an exam type.
+    __tablename__ = "user_exam_type_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    exam_type_id = Column(Integer, primary_key=True)
+    total_answers = Column(Integer, nullable=False, default=0, server_default="0")
+    total_correct = Column(Integer, nullable=False, default=0, server_default="0")
+    unique_questions = Column(Integer, nullable=False, default=0, server_default="0") # Distinct questions answered
+
+
+class ImportJobRecord(Base):
+    # Status and progress of a background question import (app.core.import_jobs), written by
+    # the worker process running it so that any worker can answer a poll. heartbeat_at is
+    # refreshed while the job is queued or running; a stale one means that process is gone.
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)
+    exam_type_id = Column(Integer, nullable=False)
+    status = Column(String(16), nullable=False) # queued, running, succeeded, failed
+    rows_done = Column(Integer, nullable=False, default=0, server_default="0")
+    rows_failed = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False)
+    summary = Column(Text, nullable=True) # ImportSummary JSON, once the job has succeeded
+    error = Column(Text, nullable=True)
@@ -4,10 +4,13 @@ from typing import Annotated, Optional # Added Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request # Added Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app import crud, schemas # Assuming schemas are in app.schemas
 from app.core import security
-from app.db.database import get_db # Assuming get_db is in app.db.database
+from app.core.user_cache import user_cache
+from app.db.database import get_db, get_async_db # Assuming get_db is in app.db.database
 from app.models.models import User # Assuming User model is in app.models.models
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
 
@@ -18,7 +21,42 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token") # Relative to the router
 def get_user_from_db(db: Session, username: str) -> Optional[User]: # Changed return type hint
     return crud.crud_user.get_user_by_username(db, username=username)
 
-async def get_current_user(
+def _cached_user_for_claims(claims: dict) -> Optional[User]:
+    """
+    Fast path: a token carrying "uid"/"ver" is resolved from the per-process user
+    cache without touching the database, as long as the cached token version matches.
+    """
+    user_id = claims.get("uid")
+    if user_id is None:
+        return None
+    user = user_cache.get(user_id)
+    if user is None or user.token_version != claims.get("ver") or user.username != claims["sub"]:
+        return None
+    return user
+
+def _accept_loaded_user(claims: dict, user: Optional[User]) -> Optional[User]:
+    """Checks a user loaded from the database against the token and caches it."""
+    if user is None or user.username != claims["sub"]:
+        return None
+    if "uid" in claims:
+        if user.token_version != claims.get("ver"):
+            return None # Token issued before revoke_user_tokens
+        user_cache.put(user)
+    return user
+
+def resolve_user(db: Session, claims: dict) -> Optional[User]:
+    user = _cached_user_for_claims(claims)
+    if user is not None:
+        return user
+    if "uid" in claims:
+        user = crud.crud_user.get_user(db, claims["uid"])
+    else:
+        user = get_user_from_db(db, username=claims["sub"]) # Tokens minted before "uid" existed
+    return _accept_loaded_user(claims, user)
+
+# Plain `def` dependencies: FastAPI runs them in its thread pool, so the
+# synchronous DB lookup never blocks the event loop.
+def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Session = Depends(get_db)
 ) -> User:
@@ -27,10 +65,34 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    username = security.decode_token(token)
-    if username is None:
+    claims = security.decode_token_claims(token)
+    if claims is None:
         raise credentials_exception
-    user = get_user_from_db(db, username=username)
+    user = resolve_user(db, claims)
+    if user is None:
+        raise credentials_exception
+    return user
+
+# Async-mode counterpart used by the async routers: the lookup goes through the async driver
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    claims = security.decode_token_claims(token)
+    if claims is None:
+        raise credentials_exception
+    user = _cached_user_for_claims(claims)
+    if user is None:
+        if "uid" in claims:
+            user = await crud.crud_async.get_user(db, user_id=claims["uid"])
+        else:
+            user = await crud.crud_async.get_user_by_username(db, username=claims["sub"])
+        user = _accept_loaded_user(claims, user)
     if user is None:
         raise credentials_exception
     return user
@@ -48,8 +110,9 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Session = Depends(get_db)
 ):
-    user = crud.crud_user.get_user_by_username(db, username=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    # Async endpoint: the DB lookup goes to the thread pool and bcrypt to its own bounded pool
+    user = await run_in_threadpool(crud.crud_user.get_user_by_username, db, username=form_data.username)
+    if not user or not await security.verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -57,11 +120,11 @@ async def login_for_access_token(
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id, "ver": user.token_version}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-async def get_current_user_or_none(
+def get_current_user_or_none(
     request: Request, # Changed to use request
     db: Session = Depends(get_db)
 ) -> Optional[User]:
@@ -76,12 +139,11 @@ async def get_current_user_or_none(
         
     token = parts[1]
     try:
-        username = security.decode_token(token)
-        if username is None:
+        claims = security.decode_token_claims(token)
+        if claims is None:
             return None # Token decoding failed or no username in token
-        user = get_user_from_db(db, username=username)
-        # user can be None if not found in DB, which is valid for "or_none"
-        return user
+        # user can be None if not found in DB (or revoked), which is valid for "or_none"
+        return resolve_user(db, claims)
     except Exception: 
         # Catches JWT errors (expired, invalid signature, etc.) or other issues
         return None
@@ -1,8 +1,7 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Response, File, UploadFile
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
-import json
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
 from app import crud, models, schemas # Ensure these are importable
 # Directly import specific schemas used in this router
@@ -10,12 +9,15 @@ from app.schemas import (
     QuestionsExport, 
     QuestionExportItem, 
     ImportSummary, 
-    ImportErrorDetail, 
-    QuestionCreate,
+    ImportJobStatus,
+    NearDuplicateReport,
     ExamType,
     ExamTypeCreate,
     ExamTypeUpdate
 )
+from app.core import bulk_formats, near_duplicates
+from app.core.import_jobs import ImportQueueFullError, import_job_manager, job_status
+from app.core.json_stream import encode_json_array, gzip_chunks
 from app.db.database import get_db
 from app.routers.auth import get_current_user # For authentication
 
@@ -31,8 +33,7 @@ def create_exam_type_endpoint(
     db: Session = Depends(get_db)
     # current_user: models.User = Depends(get_current_user) # Already in router dependencies
 ):
-    db_exam_type = crud.crud_exam_type.get_exam_type_by_name(db, name=exam_type.name)
-    if db_exam_type:
+    if crud.crud_exam_type.get_exam_type_id_by_name(db, name=exam_type.name) is not None:
         raise HTTPException(status_code=400, detail="Exam type with this name already exists")
     return crud.crud_exam_type.create_exam_type(db=db, exam_type=exam_type)
 
@@ -70,8 +71,8 @@ def update_exam_type_endpoint(
     
     # If name is being updated, check if the new name already exists for another exam type
     if exam_type_update.name is not None and exam_type_update.name != db_exam_type.name:
-        existing_exam_type_with_new_name = crud.crud_exam_type.get_exam_type_by_name(db, name=exam_type_update.name)
-        if existing_exam_type_with_new_name and existing_exam_type_with_new_name.id != exam_type_id:
+        existing_exam_type_id = crud.crud_exam_type.get_exam_type_id_by_name(db, name=exam_type_update.name)
+        if existing_exam_type_id is not None and existing_exam_type_id != exam_type_id:
             raise HTTPException(status_code=400, detail="Another exam type with this name already exists")
 
     updated_exam_type = crud.crud_exam_type.update_exam_type(db=db, exam_type_id=exam_type_id, exam_type_update=exam_type_update)
@@ -101,101 +102,93 @@ def delete_exam_type_endpoint(
 @router.get("/{exam_type_id}/export-questions/", response_model=QuestionsExport)
 def export_questions_for_exam_type(
     exam_type_id: int,
+    gzip: bool = False,
+    accept: Optional[str] = Header(None),
     db: Session = Depends(get_db)
     # current_user: models.User = Depends(get_current_user) # Router dependency
 ):
     # Verify Exam Type
-    db_exam_type = crud.crud_exam_type.get_exam_type(db, exam_type_id=exam_type_id)
-    if db_exam_type is None:
+    exam_type_name = crud.crud_exam_type.get_exam_type_name(db, exam_type_id=exam_type_id)
+    if exam_type_name is None:
         raise HTTPException(status_code=404, detail="ExamType not found")
 
-    # Fetch Questions
-    db_questions = crud.crud_question.get_questions(db, exam_type_id=exam_type_id, limit=10000)
-
-    # Prepare Data for Export
-    questions_export_schema_list: List[QuestionExportItem] = []
-    for q_model in db_questions:
-        questions_export_schema_list.append(
-            QuestionExportItem(
-                problem_statement=q_model.problem_statement,
-                option_1=q_model.option_1,
-                option_2=q_model.option_2,
-                option_3=q_model.option_3,
-                option_4=q_model.option_4,
-                correct_answer=q_model.correct_answer,
-                explanation=q_model.explanation
-            )
-        )
-
-    # Return JSON File
-    filename = f"exam_type_{db_exam_type.name.replace(' ', '_')}_{exam_type_id}_questions.json"
-    
-    questions_to_export_dict = [q.model_dump() for q in questions_export_schema_list]
-    
-    json_content = json.dumps(questions_to_export_dict, indent=4, ensure_ascii=False)
-    
+    # Stream every question (no limit): rows are read in batches and encoded as they arrive.
+    # A JSON array by default; NDJSON or CSV when the Accept header asks for them.
+    fmt = bulk_formats.export_format_for(accept)
+    filename = f"exam_type_{exam_type_name.replace(' ', '_')}_{exam_type_id}_questions{bulk_formats.FILE_EXTENSIONS[fmt]}"
+    items = crud.crud_question.iter_questions_for_export(db, exam_type_id=exam_type_id)
+    if fmt == bulk_formats.NDJSON:
+        content = bulk_formats.encode_ndjson(items)
+    elif fmt == bulk_formats.CSV:
+        content = bulk_formats.encode_csv(items, fieldnames=list(QuestionExportItem.model_fields))
+    else:
+        content = encode_json_array(items)
+    media_type = bulk_formats.MEDIA_TYPES[fmt]
+    if gzip:
+        content = gzip_chunks(content)
+        media_type = "application/gzip"
+        filename += ".gz"
+
     response_headers = {
         "Content-Disposition": f"attachment; filename=\"{filename}\""
     }
-    return Response(content=json_content, media_type="application/json", headers=response_headers)
+    return StreamingResponse(content, media_type=media_type, headers=response_headers)
+
+
+# Plain `def`: the scan is CPU-bound and runs in the thread pool. For very large banks
+# prefer the batch job, app/db/find_near_duplicates.py.
+@router.get("/{exam_type_id}/near-duplicates/", response_model=NearDuplicateReport)
+def find_near_duplicates_for_exam_type(
+    exam_type_id: int,
+    threshold: float = Query(near_duplicates.DEFAULT_THRESHOLD, ge=0.3, le=1.0),
+    db: Session = Depends(get_db)
+) -> NearDuplicateReport:
+    if not crud.crud_exam_type.exam_type_exists(db, exam_type_id=exam_type_id):
+        raise HTTPException(status_code=404, detail="ExamType not found")
+    return crud.crud_question.find_near_duplicate_questions(db, exam_type_id=exam_type_id, threshold=threshold)
 
 
+# Plain `def`: parsing and inserting run in the thread pool, reading the
+# spooled upload in chunks instead of loading it into memory.
 @router.post("/{exam_type_id}/import-questions/", response_model=ImportSummary)
-async def import_questions_for_exam_type(
+def import_questions_for_exam_type(
     exam_type_id: int,
     file: UploadFile = File(...),
+    on_duplicate: Literal["skip", "update", "fail"] = "skip",
+    dry_run: bool = False,
     db: Session = Depends(get_db)
 ) -> ImportSummary:
     
-    db_exam_type = crud.crud_exam_type.get_exam_type(db, exam_type_id=exam_type_id)
-    if db_exam_type is None:
+    if not crud.crud_exam_type.exam_type_exists(db, exam_type_id=exam_type_id):
         raise HTTPException(status_code=404, detail="ExamType not found")
 
-    imported_count = 0
-    failed_count = 0
-    errors_list: List[ImportErrorDetail] = []
+    # JSON array, NDJSON or CSV, chosen by the uploaded file's Content-Type (or extension).
+    # dry_run validates and checks duplicates only, returning the summary the import would produce.
+    fmt = bulk_formats.import_format_for(file.content_type, file.filename)
+    return crud.crud_question_import.import_questions(
+        db, exam_type_id=exam_type_id, stream=file.file, fmt=fmt, on_duplicate=on_duplicate, dry_run=dry_run
+    )
+
 
-    contents = await file.read()
-    await file.close()
+@router.post("/{exam_type_id}/import-jobs/", response_model=ImportJobStatus, status_code=status.HTTP_202_ACCEPTED)
+def create_import_job_for_exam_type(
+    exam_type_id: int,
+    file: UploadFile = File(...),
+    on_duplicate: Literal["skip", "update", "fail"] = "skip",
+    db: Session = Depends(get_db)
+) -> ImportJobStatus:
+    """
+    Same input as import-questions/, but the upload is spooled to disk and imported by a
+    background worker; poll GET /import-jobs/{job_id} for progress and the ImportSummary.
+    """
+    if not crud.crud_exam_type.exam_type_exists(db, exam_type_id=exam_type_id):
+        raise HTTPException(status_code=404, detail="ExamType not found")
 
+    fmt = bulk_formats.import_format_for(file.content_type, file.filename)
+    # The job gets its own session on the same engine as this request's
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
     try:
-        parsed_data = json.loads(contents.decode('utf-8')) 
-    except json.JSONDecodeError as e:
-        errors_list.append(ImportErrorDetail(error_message=f"Invalid JSON file: {str(e)}"))
-        return ImportSummary(imported_count=0, failed_count=0, errors=errors_list)
-
-    if not isinstance(parsed_data, list):
-        errors_list.append(ImportErrorDetail(error_message="JSON content is not a list of questions."))
-        return ImportSummary(imported_count=0, failed_count=0, errors=errors_list)
-
-    for index, item_data in enumerate(parsed_data):
-        try:
-            question_export_item = QuestionExportItem(**item_data)
-            question_create_data = question_export_item.model_dump()
-            question_create_data['exam_type_id'] = exam_type_id
-            question_to_create_schema = QuestionCreate(**question_create_data)
-            
-            crud.crud_question.create_question(db=db, question=question_to_create_schema)
-            imported_count += 1
-
-        except ValidationError as e:
-            failed_count += 1
-            error_messages = json.dumps(e.errors()) 
-            errors_list.append(ImportErrorDetail(
-                row_index=index, 
-                error_message=f"Validation Error: {error_messages}", 
-                data=item_data
-            ))
-        except Exception as e:
-            failed_count += 1
-            errors_list.append(ImportErrorDetail(
-                row_index=index, 
-                error_message=f"An unexpected error occurred: {str(e)}", 
-                data=item_data
-            ))
-
-    return ImportSummary(
-        imported_count=imported_count,
-        failed_count=failed_count,
-        errors=errors_list
-    )
+        job = import_job_manager.submit(exam_type_id, file.file, fmt, session_factory, on_duplicate=on_duplicate)
+    except ImportQueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "30"})
+    return job_status(crud.crud_import_job.get_import_job(db, job_id=job.job_id))
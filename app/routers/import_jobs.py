@@ -0,0 +1,27 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.import_jobs import job_status
+from app.db.database import get_db
+from app.schemas import ImportJobStatus
+from app.routers.auth import get_current_user
+
+router = APIRouter(
+    prefix="/import-jobs",
+    tags=["Import Jobs"],
+    dependencies=[Depends(get_current_user)]
+)
+
+@router.get("/", response_model=List[ImportJobStatus])
+def read_import_jobs(db: Session = Depends(get_db)):
+    # Recent jobs of every worker process, oldest first (finished ones are kept for a while for polling)
+    return [job_status(record) for record in crud.crud_import_job.get_import_jobs(db)]
+
+@router.get("/{job_id}", response_model=ImportJobStatus)
+def read_import_job(job_id: str, db: Session = Depends(get_db)):
+    record = crud.crud_import_job.get_import_job(db, job_id=job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job_status(record)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter
+
+from app.core import cache_invalidation
+from app.core.config import DB_MAX_OVERFLOW
+from app.core.exam_type_registry import exam_type_registry
+from app.core.question_cache import question_bank_cache
+from app.core.security import verified_token_cache
+from app.core.user_cache import user_cache
+from app.db import database
+from app.db.pool_metrics import pool_snapshot
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def read_db_pool_metrics():
+    # Connection pool state and checkout wait times of this worker process, for pool sizing
+    return {
+        "sync": pool_snapshot(database.engine.pool, DB_MAX_OVERFLOW),
+        "async": pool_snapshot(database.async_engine.pool, DB_MAX_OVERFLOW) if database.async_engine is not None else None,
+    }
+
+@router.get("/auth-cache")
+def read_auth_cache_metrics():
+    # Hit/miss counters of this worker's verified-token and user caches
+    return {
+        "tokens": verified_token_cache.stats(),
+        "users": user_cache.stats(),
+    }
+
+@router.get("/question-cache")
+def read_question_cache_metrics():
+    # Size and hit rate of this worker's question bank cache
+    return question_bank_cache.stats()
+
+@router.get("/exam-type-registry")
+def read_exam_type_registry_metrics():
+    # Exam types known to this worker and how often validation was answered without a query
+    return exam_type_registry.stats()
+
+@router.get("/cache-invalidation")
+def read_cache_invalidation_metrics():
+    # Notifications this worker received from other workers; null when not listening (not PostgreSQL)
+    listener = cache_invalidation.listener
+    return listener.stats() if listener is not None else None
@@ -0,0 +1,127 @@
+# Async-mode version of app/routers/questions.py (mounted instead of it when DB_ASYNC_MODE is set).
+# Same endpoints and responses; DB access goes through an AsyncSession.
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.db.database import get_async_db
+from app.routers.auth import get_current_user_async
+from app.routers.questions import DUPLICATE_QUESTION_DETAIL
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.Question, status_code=status.HTTP_201_CREATED)
+async def create_new_question(
+    question: schemas.QuestionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    if not await crud.crud_async.exam_type_exists(db, exam_type_id=question.exam_type_id):
+        raise HTTPException(status_code=404, detail=f"ExamType with id {question.exam_type_id} not found.")
+    try:
+        return await crud.crud_async.create_question(db, question=question)
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_QUESTION_DETAIL)
+
+@router.get("/next/", response_model=schemas.Question)
+async def get_next_question(
+    exam_type_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    if not await crud.crud_async.exam_type_exists(db, exam_type_id=exam_type_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"ExamType with id {exam_type_id} not found.")
+
+    question_model = await crud.crud_async.get_next_question_cached(db, user_id=current_user.id, exam_type_id=exam_type_id)
+    if not question_model:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No questions available for exam type {exam_type_id}.")
+
+    return question_model
+
+@router.post("/{question_id}/answer/", response_model=schemas.AnswerResult)
+async def submit_answer(
+    question_id: int,
+    answer_submission: schemas.UserAnswerSubmit,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    question = await crud.crud_async.get_question(db, question_id=question_id)
+    if not question:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found.")
+
+    user_answer_create_data = schemas.UserAnswerCreate(
+        question_id=question_id,
+        selected_answer=answer_submission.selected_answer
+    )
+
+    created_answer = await crud.crud_async.create_user_answer(
+        db,
+        user_answer=user_answer_create_data,
+        user_id=current_user.id
+    )
+
+    return schemas.AnswerResult(
+        question_id=question.id,
+        submitted_answer=answer_submission.selected_answer,
+        is_correct=created_answer.is_correct,
+        correct_answer_option=question.correct_answer,
+        explanation=question.explanation
+    )
+
+@router.get("/{question_id}/", response_model=schemas.Question)
+async def read_question(
+    question_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    db_question = await crud.crud_async.get_question_cached(db, question_id=question_id)
+    if db_question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+    return db_question
+
+@router.get("/", response_model=List[schemas.Question])
+async def read_questions(
+    skip: int = 0,
+    limit: int = 100,
+    exam_type_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud.crud_async.get_questions(db, skip=skip, limit=limit, exam_type_id=exam_type_id)
+
+@router.put("/{question_id}", response_model=schemas.Question)
+async def update_single_question(
+    question_id: int,
+    question_update: schemas.QuestionUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    db_question = await crud.crud_async.get_question(db, question_id=question_id)
+    if db_question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    if question_update.exam_type_id is not None:
+        if not await crud.crud_async.exam_type_exists(db, exam_type_id=question_update.exam_type_id):
+            raise HTTPException(status_code=404, detail=f"ExamType with id {question_update.exam_type_id} not found.")
+
+    try:
+        return await crud.crud_async.update_question(db, question_id=question_id, question_update=question_update)
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_QUESTION_DETAIL)
+
+@router.delete("/{question_id}", response_model=schemas.Question)
+async def delete_single_question(
+    question_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    db_question = await crud.crud_async.get_question(db, question_id=question_id)
+    if db_question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    deleted_question = await crud.crud_async.delete_question(db, question_id=question_id)
+    if deleted_question is None:
+         raise HTTPException(status_code=500, detail="Error deleting question")
+    return deleted_question
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional # Ensure Optional is imported
+from typing import Literal, Optional # Ensure Optional is imported
 
 from app import crud, models, schemas # Assuming these are importable
+from app.crud.crud_summary import DEFAULT_PERFORMANCE_PAGE_SIZE, MAX_PERFORMANCE_PAGE_SIZE, InvalidCursorError
 from app.db.database import get_db
 from app.routers.auth import get_current_user # For authentication
 
@@ -12,18 +13,36 @@ router = APIRouter()
 def get_user_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
-    exam_type_id: Optional[int] = None # Added optional query parameter
+    exam_type_id: Optional[int] = None, # Added optional query parameter
+    sort: Literal["question_id", "most_incorrect", "least_recent", "lowest_accuracy"] = "question_id",
+    limit: int = Query(DEFAULT_PERFORMANCE_PAGE_SIZE, ge=1, le=MAX_PERFORMANCE_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    problem_text_length: Optional[int] = Query(None, ge=0) # 0 omits problem_statement; default is the full text
 ):
     # Optional: Validate exam_type_id if provided
     if exam_type_id is not None:
-        exam_type = crud.crud_exam_type.get_exam_type(db, exam_type_id=exam_type_id)
-        if not exam_type:
+        if not crud.crud_exam_type.exam_type_exists(db, exam_type_id=exam_type_id):
             raise HTTPException(status_code=404, detail=f"ExamType with id {exam_type_id} not found.")
 
     summary_stats = crud.crud_summary.get_user_summary_stats(db, user_id=current_user.id, exam_type_id=exam_type_id)
-    question_performance = crud.crud_summary.get_user_question_performance_summary(db, user_id=current_user.id, exam_type_id=exam_type_id)
+    try:
+        question_performance, next_cursor = crud.crud_summary.get_user_question_performance_summary(
+            db, user_id=current_user.id, exam_type_id=exam_type_id,
+            sort=sort, limit=limit, cursor=cursor, problem_text_length=problem_text_length
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return schemas.UserDetailedSummary(
         summary_stats=summary_stats,
-        question_performance=question_performance
+        question_performance=question_performance,
+        next_cursor=next_cursor
     )
+
+@router.get("/dashboard/", response_model=schemas.UserDashboardSummary)
+def get_user_dashboard(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Every exam type's totals in one round trip, instead of one /summary/?exam_type_id= call each
+    return crud.crud_summary.get_user_dashboard_summary(db, user_id=current_user.id)
@@ -0,0 +1,47 @@
+# Async-mode version of app/routers/summary.py (mounted instead of it when DB_ASYNC_MODE is set).
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+
+from app import crud, models, schemas
+from app.crud.crud_summary import DEFAULT_PERFORMANCE_PAGE_SIZE, MAX_PERFORMANCE_PAGE_SIZE, InvalidCursorError
+from app.db.database import get_async_db
+from app.routers.auth import get_current_user_async
+
+router = APIRouter()
+
+@router.get("/", response_model=schemas.UserDetailedSummary)
+async def get_user_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+    exam_type_id: Optional[int] = None,
+    sort: Literal["question_id", "most_incorrect", "least_recent", "lowest_accuracy"] = "question_id",
+    limit: int = Query(DEFAULT_PERFORMANCE_PAGE_SIZE, ge=1, le=MAX_PERFORMANCE_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    problem_text_length: Optional[int] = Query(None, ge=0)
+):
+    if exam_type_id is not None:
+        if not await crud.crud_async.exam_type_exists(db, exam_type_id=exam_type_id):
+            raise HTTPException(status_code=404, detail=f"ExamType with id {exam_type_id} not found.")
+
+    summary_stats = await crud.crud_async.get_user_summary_stats(db, user_id=current_user.id, exam_type_id=exam_type_id)
+    try:
+        question_performance, next_cursor = await crud.crud_async.get_user_question_performance_summary(
+            db, user_id=current_user.id, exam_type_id=exam_type_id,
+            sort=sort, limit=limit, cursor=cursor, problem_text_length=problem_text_length
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return schemas.UserDetailedSummary(
+        summary_stats=summary_stats,
+        question_performance=question_performance,
+        next_cursor=next_cursor
+    )
+
+@router.get("/dashboard/", response_model=schemas.UserDashboardSummary)
+async def get_user_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    return await crud.crud_async.get_user_dashboard_summary(db, user_id=current_user.id)
@@ -0,0 +1,28 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import BULK_USERS_MAX_PER_REQUEST
+from app.schemas import ImportSummary, UserCreate
+from app.db.database import get_db
+from app.routers.auth import get_current_user
+
+router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+    dependencies=[Depends(get_current_user)]
+)
+
+# Plain `def`: hashing waits on the process pool from FastAPI's thread pool, not the event loop
+@router.post("/bulk", response_model=ImportSummary)
+def create_users_bulk_endpoint(
+    users: List[UserCreate],
+    db: Session = Depends(get_db)
+) -> ImportSummary:
+    if len(users) > BULK_USERS_MAX_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {BULK_USERS_MAX_PER_REQUEST} users per request; split the list or use app/db/bulk_create_users.py.",
+        )
+    return crud.crud_user.create_users_bulk(db, users=users)
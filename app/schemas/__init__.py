@@ -12,15 +12,20 @@ from .schemas import (
     Question,
     QuestionExportItem, # New
     QuestionsExport,    # New
+    NearDuplicateCluster,
+    NearDuplicateReport,
 
     # Import/Export Schemas
     ImportErrorDetail,  # New
     ImportSummary,      # New
+    ImportJobStatus,
 
     # Summary Schemas
     UserSummaryStats,
     UserQuestionPerformance,
     UserDetailedSummary,
+    ExamTypeSummaryStats,
+    UserDashboardSummary,
 
     # UserAnswer Schemas
     UserAnswerSubmit,
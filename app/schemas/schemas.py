@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List # Added List
 
@@ -30,6 +30,32 @@ class ImportSummary(BaseModel):
     imported_count: int
     failed_count: int
     errors: List[ImportErrorDetail]
+    updated_count: int = 0 # Duplicates applied to the stored question (on_duplicate=update)
+    skipped_count: int = 0 # Duplicates left as they were (on_duplicate=skip)
+    dry_run: bool = False # Counts are what the import would do; nothing was written
+
+class ImportJobStatus(BaseModel):
+    job_id: str
+    exam_type_id: int
+    status: str # queued, running, succeeded, failed
+    rows_done: int
+    rows_failed: int
+    rows_per_second: float
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    summary: Optional[ImportSummary] = None # Set once the job has succeeded
+    error: Optional[str] = None # Set if the job failed
+
+class NearDuplicateCluster(BaseModel):
+    question_ids: List[int]
+    min_similarity: float # Lowest verified pair similarity (Jaccard of word bigrams) in the cluster
+
+class NearDuplicateReport(BaseModel):
+    exam_type_id: int
+    threshold: float
+    question_count: int
+    clusters: List[NearDuplicateCluster]
 
 # Schemas for Question
 class QuestionBase(BaseModel):
@@ -38,7 +64,7 @@ class QuestionBase(BaseModel):
     option_2: str
     option_3: str
     option_4: str
-    correct_answer: int
+    correct_answer: int = Field(ge=1, le=4) # Option number
     explanation: Optional[str] = None
     exam_type_id: int # Added exam_type_id
 
@@ -52,7 +78,7 @@ class QuestionExportItem(BaseModel):
     option_2: str
     option_3: str
     option_4: str
-    correct_answer: int
+    correct_answer: int = Field(ge=1, le=4) # Option number
     explanation: Optional[str] = None
 
 # Schema for a list of questions to export
@@ -73,7 +99,7 @@ class QuestionUpdate(BaseModel):
     option_2: Optional[str] = None
     option_3: Optional[str] = None
     option_4: Optional[str] = None
-    correct_answer: Optional[int] = None
+    correct_answer: Optional[int] = Field(default=None, ge=1, le=4)
     explanation: Optional[str] = None
     exam_type_id: Optional[int] = None # Allow changing the exam type
 
@@ -88,14 +114,25 @@ class UserSummaryStats(BaseModel):
 
 class UserQuestionPerformance(BaseModel):
     question_id: int
-    problem_statement: str
+    problem_statement: Optional[str] = None # None when the request omits problem text
     times_answered: int
     times_correct: int
     times_incorrect: int
+    last_answered_at: Optional[datetime] = None
 
 class UserDetailedSummary(BaseModel):
     summary_stats: UserSummaryStats
-    question_performance: List[UserQuestionPerformance]
+    question_performance: List[UserQuestionPerformance] # One page, in the requested sort order
+    next_cursor: Optional[str] = None # Pass as ?cursor= for the next page; None on the last page
+
+class ExamTypeSummaryStats(BaseModel):
+    exam_type_id: Optional[int] = None # None for questions without an exam type
+    exam_type_name: Optional[str] = None
+    summary_stats: UserSummaryStats # Same numbers as /summary/?exam_type_id=
+
+class UserDashboardSummary(BaseModel):
+    summary_stats: UserSummaryStats # Across all exam types
+    exam_types: List[ExamTypeSummaryStats] # Only exam types the user has answered
 
 
 # Schema for submitting an answer
@@ -0,0 +1,151 @@
+"""
+Concurrency benchmark: does a login storm starve other requests?
+
+Fires --logins concurrent POSTs at a login endpoint while a probe coroutine
+keeps requesting GET /openapi.json (an async endpoint that needs no DB), and reports the
+probe latency and the longest gap between probe completions (how long the
+event loop was unable to serve anything else) during the storm. Runs twice: against the previous login
+implementation (sync DB lookup + bcrypt inside an async endpoint, i.e. on the
+event loop) and against /auth/token (DB lookup in the thread pool, bcrypt on
+the bounded password hashing pool).
+
+Usage:
+    python benchmarks/bench_login_storm.py --logins 40
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database is
+dropped and recreated, so never point this at real data.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Annotated
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.chdir(project_root) # StaticFiles(directory="static") is relative to the project root
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_login_storm.db")
+
+import httpx
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.core import security
+from app.db.database import Base, get_db
+from app.main import app
+from app.models import models
+from app.schemas.schemas import UserCreate
+
+USERNAME = "storm_user"
+PASSWORD = "storm_password"
+
+
+async def legacy_login_for_access_token(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: Session = Depends(get_db)
+):
+    """The login endpoint as it was before: blocking work directly on the event loop."""
+    user = crud.crud_user.get_user_by_username(db, username=form_data.username)
+    if not user or not security.verify_password(form_data.password, user.hashed_password):
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+    return {"access_token": security.create_access_token(data={"sub": user.username}), "token_type": "bearer"}
+
+
+app.add_api_route("/bench/legacy-token", legacy_login_for_access_token, methods=["POST"])
+
+engine = None
+SessionLocal = None
+
+
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def seed(logins: int):
+    global engine, SessionLocal
+    # Pool large enough for every in-flight login, so the benchmark measures the
+    # event loop rather than connection pool exhaustion
+    engine = create_engine(os.environ["DATABASE_URL"], pool_size=logins + 5)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        crud.crud_user.create_user(db, UserCreate(username=USERNAME, password=PASSWORD))
+    finally:
+        db.close()
+
+
+async def run_storm(login_path: str, logins: int, probe_interval: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        probe_latencies = []
+        probe_completions = []
+        storm_done = asyncio.Event()
+
+        async def probe():
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/openapi.json")
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                probe_completions.append(time.perf_counter())
+                assert response.status_code == 200
+                await asyncio.sleep(probe_interval)
+
+        async def login():
+            response = await client.post(login_path, data={"username": USERNAME, "password": PASSWORD})
+            assert response.status_code == 200, response.text
+
+        probe_task = asyncio.create_task(probe())
+        await asyncio.sleep(probe_interval)
+        start = time.perf_counter()
+        await asyncio.gather(*[login() for _ in range(logins)])
+        storm_seconds = time.perf_counter() - start
+        storm_done.set()
+        await probe_task
+
+    probe_latencies.sort()
+    gaps = [(b - a) * 1000 for a, b in zip(probe_completions, probe_completions[1:])] or [storm_seconds * 1000]
+    return {
+        "storm_s": storm_seconds,
+        "max_gap": max(gaps),
+        "probes": len(probe_latencies),
+        "p50": statistics.median(probe_latencies),
+        "p99": probe_latencies[min(len(probe_latencies) - 1, int(len(probe_latencies) * 0.99))],
+        "max": probe_latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--probe-interval-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    seed(args.logins)
+    print(f"{args.logins} concurrent logins, probing GET /openapi.json every {args.probe_interval_ms}ms "
+          f"(password hashing pool: {security.password_hash_executor._max_workers} threads)")
+    for label, path in (("legacy", "/bench/legacy-token"), ("off-loop", "/auth/token")):
+        result = asyncio.run(run_storm(path, args.logins, args.probe_interval_ms / 1000))
+        print(f"{label:<9} storm={result['storm_s']:6.2f}s  probes={result['probes']:4d}  "
+              f"probe p50={result['p50']:7.2f}ms  p99={result['p99']:7.2f}ms  max={result['max']:7.2f}ms  "
+              f"longest stall={result['max_gap']:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
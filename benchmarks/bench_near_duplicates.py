@@ -0,0 +1,110 @@
+"""
+Benchmark for near-duplicate detection (GET /exam-types/{id}/near-duplicates/ and
+app/db/find_near_duplicates.py): wall time, peak RSS and recall.
+
+Generates --questions random questions in one exam type, a --planted share of which
+get a reworded copy (one word replaced, or one appended), then runs
+crud_question.find_near_duplicate_questions over the exam type. Recall is the share
+of planted pairs that end up in the same cluster; unplanted pairs are random text,
+so any other cluster is a false positive.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py --questions 100000
+    python benchmarks/bench_near_duplicates.py --threshold 0.7
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database is
+dropped and recreated, so never point this at real data.
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_near_duplicates.db")
+
+
+def generate_questions(count: int, planted: float, seed: int):
+    """Returns (rows, planted_pairs); rows are import-shaped dicts in insertion order."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(20000)]
+    rows, originals = [], []
+    for i in range(count):
+        statement = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(15, 40)))
+        options = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))) for _ in range(4)]
+        rows.append({"problem_statement": statement, "option_1": options[0], "option_2": options[1],
+                     "option_3": options[2], "option_4": options[3]})
+    planted_pairs = []
+    for i in rng.sample(range(count), int(count * planted)):
+        words = rows[i]["problem_statement"].split()
+        if rng.random() < 0.5:
+            words[rng.randrange(len(words))] = "reworded"
+        else:
+            words.append("today")
+        planted_pairs.append((i, len(rows)))
+        rows.append({**rows[i], "problem_statement": " ".join(words)})
+    return rows, planted_pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--planted", type=float, default=0.02, help="Share of questions given a reworded copy.")
+    parser.add_argument("--threshold", type=float, default=None, help="Similarity threshold (default: the endpoint's).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from app.core.near_duplicates import DEFAULT_THRESHOLD
+    from app.crud import crud_exam_type, crud_question, crud_question_import
+    from app.db.database import SessionLocal, engine, Base
+    from app.models.models import CONTENT_HASH_FIELDS, question_content_hash
+    from app.schemas.schemas import ExamTypeCreate
+
+    threshold = args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        exam_type = crud_exam_type.create_exam_type(db, ExamTypeCreate(name="Near-duplicate benchmark"))
+        rows, planted_pairs = generate_questions(args.questions, args.planted, args.seed)
+        for start in range(0, len(rows), 1000):
+            crud_question_import.bulk_insert_questions(db, [
+                {**row, "exam_type_id": exam_type.id, "correct_answer": 1, "explanation": None,
+                 "content_hash": question_content_hash(*(row[field] for field in CONTENT_HASH_FIELDS))}
+                for row in rows[start:start + 1000]
+            ])
+        db.commit()
+        # Ids follow insertion order on a fresh table
+        first_id = crud_question.get_questions(db, skip=0, limit=1, exam_type_id=exam_type.id)[0].id
+        print(f"Scanning {len(rows)} questions ({len(planted_pairs)} planted near-duplicates), threshold {threshold}")
+
+        start = time.perf_counter()
+        report = crud_question.find_near_duplicate_questions(db, exam_type_id=exam_type.id, threshold=threshold)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    cluster_of = {question_id: n for n, cluster in enumerate(report.clusters) for question_id in cluster.question_ids}
+    found = sum(
+        1 for a, b in planted_pairs
+        if first_id + a in cluster_of and cluster_of.get(first_id + a) == cluster_of.get(first_id + b)
+    )
+    planted_ids = {first_id + i for pair in planted_pairs for i in pair}
+    false_clusters = sum(1 for cluster in report.clusters if not set(cluster.question_ids) <= planted_ids)
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss_kib //= 1024
+    print(f"clusters={len(report.clusters)}  recall={found / max(1, len(planted_pairs)):.3f}  "
+          f"false clusters={false_clusters}  wall={elapsed:.1f}s  "
+          f"rate={len(rows) / elapsed:.0f}/s  peak RSS={peak_rss_kib / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark for /questions/next/ question selection.
+
+Compares the previous multi-query selection (unanswered ids, global stats,
+always-correct ids, then a final get_question) against
+crud_question.get_next_question_for_user, which does it in one statement, and
+crud_question.get_next_question_cached, which picks from the cached question
+bank (warmed by one call first, along with its incorrect-rate sampler) with a
+single query for the user's progress.
+Also times GET /questions/{id}/ reads, get_question vs. get_question_cached.
+
+Usage:
+    python benchmarks/bench_next_question.py --questions 10000 --answers 1000000
+    python benchmarks/bench_next_question.py --database-url postgresql://...
+
+A throwaway SQLite file is used unless --database-url is given; an exported
+DATABASE_URL is ignored. The target database is dropped and recreated, so
+never point this at real data.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--database-url", help="Scratch database to drop and recreate (default: a temporary SQLite file)")
+parser.add_argument("--questions", type=int, default=10000)
+parser.add_argument("--answers", type=int, default=1000000)
+parser.add_argument("--users", type=int, default=2000)
+parser.add_argument("--iterations", type=int, default=50)
+args = parser.parse_args()
+
+# Set before the app is imported, so neither the environment nor .env picks the database
+os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_next_question.db")
+
+from sqlalchemy import insert
+
+from app.db.database import SessionLocal, engine, Base
+from app.models.models import ExamType, Question, User, UserAnswer
+from app.core.question_cache import question_bank_cache
+from app.crud import crud_question, crud_user_answer, crud_question_stats, crud_user_question_progress, crud_user_exam_type_stats
+
+
+def legacy_next_question_id(db, user_id: int, exam_type_id: int):
+    """The selection logic /questions/next/ used before the single-query engine."""
+    unanswered_ids = crud_question.get_unanswered_question_ids(db, user_id=user_id, exam_type_id=exam_type_id)
+    if unanswered_ids:
+        return crud_question.get_question(db, random.choice(unanswered_ids))
+    global_stats = crud_question.get_question_global_stats(db, exam_type_id=exam_type_id)
+    always_correct_ids = crud_user_answer.get_questions_always_answered_correctly_by_user(
+        db, user_id=user_id, exam_type_id=exam_type_id
+    )
+    eligible = [stat for stat in global_stats if stat["question_id"] not in always_correct_ids]
+    if eligible:
+        eligible.sort(key=lambda x: x["global_incorrect_rate"], reverse=True)
+        selected_id = eligible[0]["question_id"]
+    else:
+        selected_id = random.choice(global_stats)["question_id"]
+    return crud_question.get_question(db, selected_id)
+
+
+def seed(num_questions: int, num_answers: int, num_users: int, chunk_size: int = 20000) -> int:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        exam_type_id = conn.execute(insert(ExamType).values(name="bench").returning(ExamType.id)).scalar_one()
+        conn.execute(insert(User), [
+            {"username": f"bench_user_{i}", "hashed_password": "x"} for i in range(num_users)
+        ])
+        conn.execute(insert(Question), [
+            {
+                "problem_statement": f"Benchmark question {i}",
+                "option_1": "a", "option_2": "b", "option_3": "c", "option_4": "d",
+                "correct_answer": rng.randint(1, 4),
+                "exam_type_id": exam_type_id,
+            }
+            for i in range(num_questions)
+        ])
+    # User 1 answers every question (the heaviest selection case); the rest is random traffic
+    rows = [
+        {"question_id": q, "user_id": 1, "selected_answer": 1, "is_correct": rng.random() < 0.7}
+        for q in range(1, num_questions + 1)
+    ]
+    with engine.begin() as conn:
+        remaining = num_answers - len(rows)
+        while remaining > 0 or rows:
+            while len(rows) < chunk_size and remaining > 0:
+                rows.append({
+                    "question_id": rng.randint(1, num_questions),
+                    "user_id": rng.randint(2, num_users),
+                    "selected_answer": rng.randint(1, 4),
+                    "is_correct": rng.random() < 0.6,
+                })
+                remaining -= 1
+            conn.execute(insert(UserAnswer), rows)
+            rows = []
+    db = SessionLocal()
+    try:
+        crud_question_stats.rebuild_question_stats(db)
+        crud_user_question_progress.rebuild_user_question_progress(db)
+        crud_user_exam_type_stats.rebuild_user_exam_type_stats(db)
+    finally:
+        db.close()
+    return exam_type_id
+
+
+def measure(label: str, fn, iterations: int):
+    timings = []
+    for _ in range(iterations):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            question = fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert question is not None
+        finally:
+            db.close()
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<13} p50={p50:9.2f} ms  p99={p99:9.2f} ms  (n={iterations})")
+    return p50, p99
+
+
+def main():
+    print(f"Seeding {args.questions} questions / {args.answers} answers on {engine.url.get_backend_name()}...")
+    exam_type_id = seed(args.questions, args.answers, args.users)
+
+    legacy = measure("legacy", lambda db: legacy_next_question_id(db, 1, exam_type_id), args.iterations)
+    single = measure("single-query", lambda db: crud_question.get_next_question_for_user(db, 1, exam_type_id), args.iterations)
+    print(f"speedup      p50 x{legacy[0] / single[0]:.1f}  p99 x{legacy[1] / single[1]:.1f}")
+
+    db = SessionLocal()
+    try:
+        crud_question.get_question_sampler(db, crud_question.get_question_bank(db, exam_type_id))
+    finally:
+        db.close()
+    cached = measure("cached", lambda db: crud_question.get_next_question_cached(db, 1, exam_type_id), args.iterations)
+    print(f"speedup      p50 x{single[0] / cached[0]:.1f}  p99 x{single[1] / cached[1]:.1f}  (cached vs. single-query)")
+    # A typical user, who has answered a small share of the bank
+    single = measure("single/light", lambda db: crud_question.get_next_question_for_user(db, 2, exam_type_id), args.iterations)
+    cached = measure("cached/light", lambda db: crud_question.get_next_question_cached(db, 2, exam_type_id), args.iterations)
+    print(f"speedup      p50 x{single[0] / cached[0]:.1f}  p99 x{single[1] / cached[1]:.1f}  (cached vs. single-query)")
+
+    rng = random.Random(7)
+    read = measure("read", lambda db: crud_question.get_question(db, rng.randint(1, args.questions)), args.iterations * 20)
+    read_cached = measure("read cached", lambda db: crud_question.get_question_cached(db, rng.randint(1, args.questions)), args.iterations * 20)
+    print(f"speedup      p50 x{read[0] / read_cached[0]:.1f}  p99 x{read[1] / read_cached[1]:.1f}")
+    print(f"cache        {question_bank_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark for /exam-types/{id}/import-questions/: wall time and peak RSS.
+
+Generates a JSON file of --questions questions, then imports it with
+    legacy     the previous endpoint logic: read the whole upload, json.loads it,
+               then create_question (one INSERT + commit + refresh) per item
+    streaming  crud_question_import.import_questions: incremental parse, chunked
+               validation, one multi-row INSERT (COPY on PostgreSQL) per chunk
+    ndjson     the same streaming import, fed NDJSON lines
+    csv        the same streaming import, fed CSV rows
+    reimport   the streaming import run a second time over the same file, timing
+               only the second run, where every item is a duplicate and skipped
+    upsert     as reimport, with on_duplicate="update" rewriting every question
+    dry-run    the streaming import with dry_run=True: validation and duplicate
+               checks only, nothing is written
+Each mode runs in a fresh child process so its peak RSS is measured on its own.
+
+Usage:
+    python benchmarks/bench_question_import.py --questions 100000
+    python benchmarks/bench_question_import.py --modes streaming
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database is
+dropped and recreated, so never point this at real data.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_question_import.db")
+
+
+MODES = ["legacy", "streaming", "ndjson", "csv", "reimport", "upsert", "dry-run"]
+FILE_FORMATS = {
+    "legacy": "json", "streaming": "json", "ndjson": "ndjson", "csv": "csv", "reimport": "json", "upsert": "json",
+    "dry-run": "json",
+}
+DUPLICATE_MODES = {"reimport": "skip", "upsert": "update"}
+
+
+def iter_items(count: int):
+    for i in range(count):
+        yield {
+            "problem_statement": f"Benchmark question {i}: " + "lorem ipsum dolor sit amet " * 8,
+            "option_1": f"Option A{i}", "option_2": f"Option B{i}", "option_3": f"Option C{i}", "option_4": f"Option D{i}",
+            "correct_answer": 1 + i % 4,
+            "explanation": f"Explanation for question {i}." if i % 3 else None,
+        }
+
+
+def write_questions_file(path: str, count: int, fmt: str):
+    from app.core import bulk_formats
+    from app.core.json_stream import encode_json_array
+
+    items = iter_items(count)
+    if fmt == "ndjson":
+        chunks = bulk_formats.encode_ndjson(items)
+    elif fmt == "csv":
+        chunks = bulk_formats.encode_csv(items, fieldnames=list(next(iter_items(1))))
+    else:
+        chunks = encode_json_array(items)
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def legacy_import(db, exam_type_id: int, path: str) -> int:
+    """The import endpoint as it was before: whole file in memory, one commit per question."""
+    from app.crud import crud_question
+    from app.schemas.schemas import QuestionCreate, QuestionExportItem
+
+    with open(path, "rb") as f:
+        parsed_data = json.loads(f.read().decode("utf-8"))
+    imported = 0
+    for item_data in parsed_data:
+        item = QuestionExportItem(**item_data)
+        crud_question.create_question(db, QuestionCreate(**item.model_dump(), exam_type_id=exam_type_id))
+        imported += 1
+    return imported
+
+
+def run_child(mode: str, path: str):
+    """Runs one import in this (fresh) process and prints its result as JSON."""
+    from app.crud import crud_exam_type, crud_question_import
+    from app.db.database import SessionLocal, engine, Base
+    from app.schemas.schemas import ExamTypeCreate
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        exam_type = crud_exam_type.create_exam_type(db, ExamTypeCreate(name="Import benchmark"))
+        if mode in DUPLICATE_MODES:
+            # Untimed first import, so the timed one finds every item already stored
+            with open(path, "rb") as f:
+                crud_question_import.import_questions(db, exam_type_id=exam_type.id, stream=f)
+        start = time.perf_counter()
+        if mode == "legacy":
+            imported = legacy_import(db, exam_type.id, path)
+        else:
+            with open(path, "rb") as f:
+                summary = crud_question_import.import_questions(
+                    db, exam_type_id=exam_type.id, stream=f, fmt=FILE_FORMATS[mode],
+                    on_duplicate=DUPLICATE_MODES.get(mode, "skip"), dry_run=mode == "dry-run",
+                )
+            # Rows handled: inserted (or, in a dry run, found insertable), or resolved as duplicates
+            imported = summary.imported_count + summary.updated_count + summary.skipped_count
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss_kib //= 1024
+    print(json.dumps({"imported": imported, "seconds": elapsed, "peak_rss_mib": peak_rss_kib / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.file)
+        return
+
+    paths = {}
+    for fmt in sorted({FILE_FORMATS[mode] for mode in args.modes}):
+        paths[fmt] = os.path.join(tempfile.gettempdir(), f"bench_question_import_{args.questions}.{fmt}")
+        write_questions_file(paths[fmt], args.questions, fmt)
+    print(f"Importing {args.questions} questions (" + ", ".join(
+        f"{os.path.getsize(path) / 1024 / 1024:.1f} MiB of {fmt}" for fmt, path in paths.items()) + ")")
+    try:
+        for mode in args.modes:
+            path = paths[FILE_FORMATS[mode]]
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--file", path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<10} imported={result['imported']:7d}  wall={result['seconds']:8.2f}s  "
+                  f"rate={result['imported'] / result['seconds']:9.0f}/s  peak RSS={result['peak_rss_mib']:7.1f} MiB")
+    finally:
+        for path in paths.values():
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
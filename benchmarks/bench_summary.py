@@ -0,0 +1,156 @@
+"""
+Microbenchmark: the totals behind GET /summary/ for one heavy user.
+
+Seeds one user with --answers answers over --questions questions spread across
+--exam-types exam types, then times computing the user's totals
+(unique questions, answers, correct answers) with
+
+    raw        COUNT / COUNT(DISTINCT) over user_answers, as the summary once did
+    progress   SUM over the user's user_question_progress rows (one per question)
+    stats      the user_exam_type_stats row(s) read by crud_summary.get_user_summary_stats
+
+each for one exam type and across all of them. It then times one page (--page-size)
+of the per-question performance for each sort order: the first page, a page
+--depth questions into the history, and the whole unpaginated list as /summary/
+returned it before pagination.
+
+Usage:
+    python benchmarks/bench_summary.py --answers 50000
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database is
+dropped and recreated, so never point this at real data.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_summary.db")
+
+from sqlalchemy import case, func, insert
+
+from app.crud import crud_summary, crud_user_exam_type_stats, crud_user_question_progress
+from app.db.database import SessionLocal, engine, Base
+from app.models.models import ExamType, Question, User, UserAnswer, UserQuestionProgress
+
+
+def raw_totals(db, user_id, exam_type_id):
+    query = db.query(
+        func.count(func.distinct(UserAnswer.question_id)),
+        func.count(UserAnswer.id),
+        func.coalesce(func.sum(case((UserAnswer.is_correct == True, 1), else_=0)), 0),
+    ).filter(UserAnswer.user_id == user_id)
+    if exam_type_id is not None:
+        query = query.join(Question, Question.id == UserAnswer.question_id).filter(Question.exam_type_id == exam_type_id)
+    return tuple(query.one())
+
+
+def progress_totals(db, user_id, exam_type_id):
+    query = db.query(
+        func.count(UserQuestionProgress.question_id),
+        func.coalesce(func.sum(UserQuestionProgress.attempts), 0),
+        func.coalesce(func.sum(UserQuestionProgress.correct_count), 0),
+    ).filter(UserQuestionProgress.user_id == user_id)
+    if exam_type_id is not None:
+        query = query.join(Question, Question.id == UserQuestionProgress.question_id).filter(Question.exam_type_id == exam_type_id)
+    return tuple(query.one())
+
+
+def stats_totals(db, user_id, exam_type_id):
+    stats = crud_summary.get_user_summary_stats(db, user_id=user_id, exam_type_id=exam_type_id)
+    return stats.total_unique_questions_attempted, stats.total_answers_submitted, stats.total_correct_answers
+
+
+def page_cursor_at(db, exam_type_id, sort: str, depth: int, page_size: int):
+    """Cursor of the page that starts about depth questions into the sort order (None if shorter)."""
+    cursor, seen = None, 0
+    while seen < depth:
+        page, cursor = crud_summary.get_user_question_performance_summary(
+            db, user_id=1, exam_type_id=exam_type_id, sort=sort, limit=min(1000, depth - seen), cursor=cursor,
+            problem_text_length=0
+        )
+        seen += len(page)
+        if cursor is None:
+            break
+    return cursor
+
+
+def time_calls(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=50000)
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--exam-types", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=5000, help="Questions to page past before the 'deep' page.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.execute(insert(ExamType), [{"name": f"Bench ET {i}"} for i in range(args.exam_types)])
+        db.execute(insert(User), [{"username": "heavy", "hashed_password": "x"}])
+        db.execute(insert(Question), [
+            {"problem_statement": f"Bench Q{i}", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D",
+             "correct_answer": 1, "exam_type_id": i % args.exam_types + 1}
+            for i in range(args.questions)
+        ])
+        for start in range(0, args.answers, 10000):
+            db.execute(insert(UserAnswer), [
+                {"question_id": rng.randint(1, args.questions), "user_id": 1, "selected_answer": 1, "is_correct": rng.random() < 0.6}
+                for _ in range(min(10000, args.answers - start))
+            ])
+        db.commit()
+        crud_user_question_progress.rebuild_user_question_progress(db)
+        crud_user_exam_type_stats.rebuild_user_exam_type_stats(db)
+
+        print(f"One user, {args.answers} answers over {args.questions} questions in {args.exam_types} exam types "
+              f"(median of {args.repeat}, ms)")
+        for label, exam_type_id in (("one exam type", 1), ("all exam types", None)):
+            results = {name: fn(db, 1, exam_type_id) for name, fn in
+                       (("raw", raw_totals), ("progress", progress_totals), ("stats", stats_totals))}
+            assert len(set(results.values())) == 1, results
+            timings = {
+                name: time_calls(lambda: fn(db, 1, exam_type_id), args.repeat)
+                for name, fn in (("raw", raw_totals), ("progress", progress_totals), ("stats", stats_totals))
+            }
+            print(f"{label:<15} " + "  ".join(f"{name}={ms:8.3f}" for name, ms in timings.items()))
+
+        print(f"\nquestion_performance, {args.page_size} per page (median of {args.repeat}, ms)")
+        for label, exam_type_id in (("one exam type", 1), ("all exam types", None)):
+            for sort in crud_summary.PERFORMANCE_SORTS:
+                deep_cursor = page_cursor_at(db, exam_type_id, sort, args.depth, args.page_size)
+                timings = {
+                    "first": time_calls(lambda: crud_summary.get_user_question_performance_summary(
+                        db, user_id=1, exam_type_id=exam_type_id, sort=sort, limit=args.page_size, problem_text_length=50), args.repeat),
+                    "deep": time_calls(lambda: crud_summary.get_user_question_performance_summary(
+                        db, user_id=1, exam_type_id=exam_type_id, sort=sort, limit=args.page_size, cursor=deep_cursor,
+                        problem_text_length=50), args.repeat),
+                    "unpaginated": time_calls(lambda: crud_summary.get_user_question_performance_summary(
+                        db, user_id=1, exam_type_id=exam_type_id, sort=sort, limit=args.questions), max(1, args.repeat // 5)),
+                }
+                print(f"{label:<15} {sort:<16} " + "  ".join(f"{name}={ms:9.3f}" for name, ms in timings.items()))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
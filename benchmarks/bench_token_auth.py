@@ -0,0 +1,79 @@
+"""
+Microbenchmark: per-request authentication overhead.
+
+Times the token/user resolution that get_current_user performs for every
+protected request, for one token reused across --requests calls (as a client
+does for the token's whole lifetime):
+
+    uncached   JWT signature check + claims parse + users lookup on every call
+    tokens     verified-token cache only (users lookup still per call)
+    full       verified-token cache + user cache (no DB work on a hit)
+
+Usage:
+    python benchmarks/bench_token_auth.py --requests 20000
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database is
+dropped and recreated, so never point this at real data.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_token_auth.db")
+
+from app.core import security
+from app.core.user_cache import user_cache
+from app.crud import crud_user
+from app.db.database import SessionLocal, engine, Base
+from app.routers.auth import resolve_user
+from app.schemas.schemas import UserCreate
+
+
+def run(db, token: str, requests: int, token_cache: bool, users: bool):
+    security.verified_token_cache.clear()
+    user_cache.clear()
+    timings = []
+    for _ in range(requests):
+        if not token_cache:
+            security.verified_token_cache.clear()
+        if not users:
+            user_cache.clear()
+        start = time.perf_counter()
+        claims = security.decode_token_claims(token)
+        user = resolve_user(db, claims)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+        assert user is not None
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = crud_user.create_user(db, UserCreate(username="bench_auth_user", password="bench_password"))
+        token = security.create_access_token(data={"sub": user.username, "uid": user.id, "ver": user.token_version})
+
+        print(f"{args.requests} authentications of one reused token")
+        for label, token_cache, users in (("uncached", False, False), ("tokens", True, False), ("full", True, True)):
+            mean, p50, p99 = run(db, token, args.requests, token_cache, users)
+            print(f"{label:<9} mean={mean:8.1f}us  p50={p50:8.1f}us  p99={p99:8.1f}us")
+        print(f"token cache: {security.verified_token_cache.stats()}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,17 @@ document.addEventListener('DOMContentLoaded', async () => {
 
     const examTypeDropdown = document.getElementById('summary-exam-type-dropdown');
     const summaryFilterHeading = document.getElementById('summary-filter-heading');
-    
+    const sortDropdown = document.getElementById('summary-sort-dropdown');
+    const loadMoreButton = document.getElementById('load-more-button');
+    const dashboardTableBody = document.querySelector('#exam-type-dashboard-table tbody');
+
+    // Question performance is fetched a page at a time, with problem text cut to what the list shows
+    const PAGE_SIZE = 50;
+    const PROBLEM_TEXT_LENGTH = 50;
+
     let allExamTypes = [];
+    let currentExamTypeId = '';
+    let nextCursor = null;
 
     function getAuthHeaders() {
         const token = localStorage.getItem('accessToken');
@@ -49,15 +58,67 @@ document.addEventListener('DOMContentLoaded', async () => {
         });
     }
 
-    async function fetchSummary(examTypeId = '') {
+    // Every exam type's totals in one request; selecting a row filters the summary below
+    async function fetchDashboard() {
+        const headers = getAuthHeaders();
+        if (!headers) return;
+        try {
+            const response = await fetch('/summary/dashboard/', { headers });
+            if (!response.ok) {
+                if (response.status === 401) window.location.href = '/login';
+                throw new Error('Failed to load per exam type summary.');
+            }
+            displayDashboard(await response.json());
+        } catch (error) {
+            console.error('Error fetching dashboard:', error);
+            summaryErrorMessage.textContent = error.message || 'Could not load per exam type summary.';
+        }
+    }
+
+    function displayDashboard(data) {
+        dashboardTableBody.innerHTML = '';
+        if (data.exam_types.length === 0) {
+            dashboardTableBody.innerHTML = '<tr><td colspan="6">No answers yet.</td></tr>';
+            return;
+        }
+        data.exam_types.forEach(item => {
+            const stats = item.summary_stats;
+            const row = document.createElement('tr');
+            const name = item.exam_type_id === null ? 'No exam type' : item.exam_type_name;
+            [name, stats.total_unique_questions_attempted, stats.total_answers_submitted, stats.total_correct_answers,
+             stats.total_incorrect_answers, `${(stats.correct_answer_rate * 100).toFixed(2)}%`].forEach(value => {
+                const cell = document.createElement('td');
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            if (item.exam_type_id !== null) {
+                row.style.cursor = 'pointer';
+                row.addEventListener('click', () => {
+                    examTypeDropdown.value = item.exam_type_id;
+                    fetchSummary(item.exam_type_id);
+                });
+            }
+            dashboardTableBody.appendChild(row);
+        });
+    }
+
+    async function fetchSummary(examTypeId = '', cursor = null) {
         summaryErrorMessage.textContent = '';
         const headers = getAuthHeaders();
         if (!headers) return;
 
-        let url = '/summary/';
+        const params = new URLSearchParams({
+            sort: sortDropdown ? sortDropdown.value : 'question_id',
+            limit: PAGE_SIZE,
+            problem_text_length: PROBLEM_TEXT_LENGTH,
+        });
         if (examTypeId) {
-            url += `?exam_type_id=${examTypeId}`;
+            params.set('exam_type_id', examTypeId);
+        }
+        if (cursor) {
+            params.set('cursor', cursor);
         }
+        const url = `/summary/?${params}`;
 
         try {
             const response = await fetch(url, { method: 'GET', headers: headers });
@@ -75,7 +136,8 @@ document.addEventListener('DOMContentLoaded', async () => {
             }
 
             const data = await response.json();
-            displaySummary(data);
+            currentExamTypeId = examTypeId;
+            displaySummary(data, Boolean(cursor));
             
             // Update heading
             if (examTypeId) {
@@ -99,9 +161,11 @@ document.addEventListener('DOMContentLoaded', async () => {
          totalIncorrectAnswersElem.textContent = 'N/A';
          correctAnswerRateElem.textContent = 'N/A';
          questionPerformanceListElem.innerHTML = '<li>Error loading data or no data available.</li>';
+         nextCursor = null;
+         loadMoreButton.style.display = 'none';
     }
 
-    function displaySummary(data) {
+    function displaySummary(data, append = false) {
         const stats = data.summary_stats;
         totalUniqueQuestionsElem.textContent = stats.total_unique_questions_attempted;
         totalAnswersSubmittedElem.textContent = stats.total_answers_submitted;
@@ -109,15 +173,20 @@ document.addEventListener('DOMContentLoaded', async () => {
         totalIncorrectAnswersElem.textContent = stats.total_incorrect_answers;
         correctAnswerRateElem.textContent = (stats.correct_answer_rate * 100).toFixed(2);
 
-        questionPerformanceListElem.innerHTML = ''; // Clear previous list
-        if (data.question_performance.length === 0) {
+        nextCursor = data.next_cursor;
+        loadMoreButton.style.display = nextCursor ? '' : 'none';
+
+        if (!append) {
+            questionPerformanceListElem.innerHTML = ''; // Clear previous list
+        }
+        if (!append && data.question_performance.length === 0) {
             questionPerformanceListElem.innerHTML = '<li>No question performance data available for this filter.</li>';
             return;
         }
         data.question_performance.forEach(item => {
             const listItem = document.createElement('li');
             listItem.innerHTML = `
-                <strong>Question ID ${item.question_id}:</strong> "${item.problem_statement.substring(0, 50)}..."<br>
+                <strong>Question ID ${item.question_id}:</strong> "${item.problem_statement}..."<br>
                 Attempted: ${item.times_answered}, Correct: ${item.times_correct}, Incorrect: ${item.times_incorrect}
             `;
             questionPerformanceListElem.appendChild(listItem);
@@ -129,6 +198,18 @@ document.addEventListener('DOMContentLoaded', async () => {
             fetchSummary(event.target.value);
         });
     }
+
+    if (sortDropdown) {
+        sortDropdown.addEventListener('change', () => {
+            fetchSummary(currentExamTypeId);
+        });
+    }
+
+    loadMoreButton.addEventListener('click', () => {
+        if (nextCursor) {
+            fetchSummary(currentExamTypeId, nextCursor);
+        }
+    });
     
     if (logoutLink) {
         logoutLink.addEventListener('click', (e) => {
@@ -141,6 +222,7 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Initial Load
     async function initialLoad() {
         await fetchExamTypesForFilter(); // Load exam types for the filter first
+        fetchDashboard();
         fetchSummary(); // Then load the initial overall summary
     }
     initialLoad();
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.security import create_access_token, get_password_hash
+from app.db.database import Base, get_async_db, to_async_database_url
+from app.models import models
+from app.routers import questions_async, summary_async
+
+
+def test_to_async_database_url():
+    assert to_async_database_url("postgresql://u:p@db:5432/quiz") == "postgresql+asyncpg://u:p@db:5432/quiz"
+    assert to_async_database_url("postgresql+psycopg2://u:p@db/quiz") == "postgresql+asyncpg://u:p@db/quiz"
+    assert to_async_database_url("sqlite:///./quiz.db") == "sqlite+aiosqlite:///./quiz.db"
+    assert to_async_database_url("sqlite+aiosqlite:///./quiz.db") == "sqlite+aiosqlite:///./quiz.db"
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    # A file database shared by every connection; NullPool keeps connections off the TestClient's loop boundary
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async_mode.db'}", poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncTestingSession() as db:
+            exam_type = models.ExamType(name="Async ET")
+            user = models.User(username="asyncuser", hashed_password=get_password_hash("pw"))
+            db.add_all([exam_type, user])
+            await db.commit()
+            return exam_type.id
+
+    exam_type_id = asyncio.run(setup())
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(questions_async.router, prefix="/questions")
+    app.include_router(summary_async.router, prefix="/summary")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    token = create_access_token(data={"sub": "asyncuser"})
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client, exam_type_id
+    asyncio.run(engine.dispose())
+
+
+def test_async_quiz_flow(async_client):
+    client, exam_type_id = async_client
+    payload = {
+        "problem_statement": "Async: 1 + 1?",
+        "option_1": "1", "option_2": "2", "option_3": "3", "option_4": "4",
+        "correct_answer": 2, "explanation": "Addition.",
+        "exam_type_id": exam_type_id
+    }
+    response = client.post("/questions/", json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    question_id = response.json()["id"]
+
+    response = client.get(f"/questions/next/?exam_type_id={exam_type_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == question_id
+
+    response = client.post(f"/questions/{question_id}/answer/", json={"selected_answer": 3})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["is_correct"] is False
+    assert response.json()["correct_answer_option"] == 2
+
+    response = client.get(f"/summary/?exam_type_id={exam_type_id}")
+    assert response.status_code == status.HTTP_200_OK
+    summary = response.json()
+    assert summary["summary_stats"]["total_answers_submitted"] == 1
+    assert summary["question_performance"][0]["times_incorrect"] == 1
+
+    response = client.delete(f"/questions/{question_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get(f"/questions/{question_id}/").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_async_mode_requires_valid_token(async_client):
+    client, exam_type_id = async_client
+    response = client.get(f"/questions/next/?exam_type_id={exam_type_id}", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.get("/questions/next/?exam_type_id=99999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,4 +1,6 @@
+import gzip # For compressed export tests
 import json # For import/export tests
+import time # For polling import jobs
 from io import BytesIO # For import tests
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session as SQLAlchemySession # Use the renamed Session from conftest
@@ -7,7 +9,7 @@ from typing import List # For response type hint
 
 from app.schemas import schemas # For request/response validation
 from app.models import models # For DB verification
-from app.crud import crud_exam_type # For potential direct DB manipulation for setup/cleanup if needed
+from app.crud import crud_exam_type, crud_question # For potential direct DB manipulation for setup/cleanup if needed
 
 # Test data
 sample_exam_type_data_1 = {"name": "API Test Exam Type Alpha"}
@@ -223,6 +225,51 @@ def test_export_questions_no_questions(authenticated_client: TestClient, db_sess
     assert isinstance(exported_data, list)
     assert len(exported_data) == 0
 
+def test_export_questions_streams_everything_with_optional_gzip(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Export Stream ET"))
+    for i in range(25):
+        crud_question.create_question(db_session, schemas.QuestionCreate(problem_statement=f"Stream Q{i}", option_1="A", option_2="B", option_3="C", option_4="D", correct_answer=1, exam_type_id=exam_type.id))
+
+    # Every question in id order, even when fetched in batches smaller than the bank
+    exported = list(crud_question.iter_questions_for_export(db_session, exam_type_id=exam_type.id, batch_size=4))
+    assert [q["problem_statement"] for q in exported] == [f"Stream Q{i}" for i in range(25)]
+
+    response = authenticated_client.get(f"/exam-types/{exam_type.id}/export-questions/?gzip=true")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.json.gz"')
+    assert json.loads(gzip.decompress(response.content)) == exported
+
+def test_export_import_round_trip_ndjson_and_csv(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    source = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Round Trip Source"))
+    crud_question.create_question(db_session, schemas.QuestionCreate(problem_statement="RT \"Q1\", with comma\nand newline", option_1="A", option_2="B", option_3="C", option_4="D", correct_answer=3, exam_type_id=source.id, explanation="Exp é"))
+    crud_question.create_question(db_session, schemas.QuestionCreate(problem_statement="RT Q2", option_1="1", option_2="2", option_3="3", option_4="4", correct_answer=2, exam_type_id=source.id))
+    expected = list(crud_question.iter_questions_for_export(db_session, exam_type_id=source.id))
+
+    for media_type, extension in (("application/x-ndjson", "ndjson"), ("text/csv", "csv")):
+        exported = authenticated_client.get(f"/exam-types/{source.id}/export-questions/", headers={"Accept": media_type})
+        assert exported.status_code == status.HTTP_200_OK
+        assert exported.headers["content-type"].startswith(media_type)
+        assert exported.headers["content-disposition"].endswith(f'.{extension}"')
+
+        target = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name=f"Round Trip {extension}"))
+        files = {"file": (f"bank.{extension}", BytesIO(exported.content), media_type)}
+        summary = authenticated_client.post(f"/exam-types/{target.id}/import-questions/", files=files).json()
+        assert summary == {"imported_count": 2, "updated_count": 0, "skipped_count": 0, "failed_count": 0, "errors": [], "dry_run": False}
+        assert list(crud_question.iter_questions_for_export(db_session, exam_type_id=target.id)) == expected
+
+
+def test_import_ndjson_reports_bad_lines_per_row(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Import NDJSON ET"))
+    good = [json.dumps({"problem_statement": f"NDJSON Q{i}", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 1}) for i in range(2)]
+    body = "\n".join([good[0], "{not json", json.dumps({"option_1": "A"}), good[1]]) + "\n"
+
+    files = {"file": ("bank.ndjson", BytesIO(body.encode("utf-8")), "application/x-ndjson")}
+    summary = authenticated_client.post(f"/exam-types/{exam_type.id}/import-questions/", files=files).json()
+    assert summary["imported_count"] == 2
+    assert [error["row_index"] for error in summary["errors"]] == [1, 2]
+    assert "Invalid JSON line" in summary["errors"][0]["error_message"]
+
 def test_export_questions_nonexistent_exam_type(authenticated_client: TestClient):
     response = authenticated_client.get("/exam-types/999999/export-questions/")
     assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -377,6 +424,66 @@ def test_import_questions_malformed_json_file(authenticated_client: TestClient,
 # The backend tries to parse JSON regardless of UploadFile.content_type.
 # If strict content-type check was added to backend, this test would be more relevant.
 
+def test_import_job_endpoints(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Import Job ET"))
+    questions_to_import = [{"problem_statement": f"Job Q{i}", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 1} for i in range(3)]
+    files = {"file": ("bank.json", BytesIO(json.dumps(questions_to_import).encode("utf-8")), "application/json")}
+
+    response = authenticated_client.post(f"/exam-types/{exam_type.id}/import-jobs/", files=files)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job_id = response.json()["job_id"]
+
+    deadline = time.monotonic() + 10
+    while True:
+        job = authenticated_client.get(f"/import-jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+    assert job["status"] == "succeeded"
+    assert job["summary"]["imported_count"] == 3
+    assert job["rows_done"] == 3
+    assert any(listed["job_id"] == job_id for listed in authenticated_client.get("/import-jobs/").json())
+    assert authenticated_client.get("/import-jobs/unknown").status_code == status.HTTP_404_NOT_FOUND
+
+def test_import_questions_dry_run(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Dry Run ET"))
+    questions_to_import = [
+        {"problem_statement": "Dry Q1", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 1},
+        {"problem_statement": "Dry Q2", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 0},
+    ]
+    files = {"file": ("bank.json", BytesIO(json.dumps(questions_to_import).encode("utf-8")), "application/json")}
+
+    response = authenticated_client.post(f"/exam-types/{exam_type.id}/import-questions/", files=files, params={"dry_run": "true"})
+    assert response.status_code == status.HTTP_200_OK
+    summary = response.json()
+    assert (summary["dry_run"], summary["imported_count"], summary["failed_count"]) == (True, 1, 1)
+    assert summary["errors"][0]["row_index"] == 1
+    assert db_session.query(models.Question).filter(models.Question.exam_type_id == exam_type.id).count() == 0
+
+def test_near_duplicates_endpoint(authenticated_client: TestClient, db_session: SQLAlchemySession):
+    exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Near Dup ET"))
+    statements = [
+        "Which layer of the OSI model is responsible for routing packets between networks?",
+        "Which layer of the OSI model is responsible for routing packets between different networks?",
+        "What is the time complexity of binary search on a sorted array of n elements?",
+    ]
+    ids = [
+        crud_question.create_question(db_session, schemas.QuestionCreate(
+            problem_statement=statement, option_1="Physical", option_2="Network", option_3="Transport",
+            option_4="Session", correct_answer=2, exam_type_id=exam_type.id,
+        )).id
+        for statement in statements
+    ]
+
+    response = authenticated_client.get(f"/exam-types/{exam_type.id}/near-duplicates/", params={"threshold": 0.7})
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report["question_count"] == 3
+    assert [cluster["question_ids"] for cluster in report["clusters"]] == [ids[:2]]
+    assert 0.7 <= report["clusters"][0]["min_similarity"] < 1
+    assert authenticated_client.get("/exam-types/999999/near-duplicates/").status_code == status.HTTP_404_NOT_FOUND
+    assert authenticated_client.get(f"/exam-types/{exam_type.id}/near-duplicates/", params={"threshold": 2}).status_code == 422
+
 def test_import_questions_nonexistent_exam_type(authenticated_client: TestClient):
     questions_to_import = [{"problem_statement": "Q", "option_1":"A", "option_2":"B", "option_3":"C", "option_4":"D", "correct_answer":1}]
     json_string = json.dumps(questions_to_import)
@@ -32,6 +32,14 @@ def test_create_question_api(authenticated_client: TestClient, db_session: SQLAl
     assert db_q is not None
     assert db_q.problem_statement == question_payload.problem_statement
 
+def test_create_question_duplicate_content_conflict(authenticated_client: TestClient, test_exam_type: models.ExamType):
+    payload = get_sample_question_api_data(test_exam_type.id)
+    assert authenticated_client.post("/questions/", json=payload).status_code == status.HTTP_201_CREATED
+    # Case and whitespace differences do not make it a different question
+    payload["problem_statement"] = "  api test:  WHAT is 2x2? "
+    response = authenticated_client.post("/questions/", json=payload)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
 def test_create_question_invalid_exam_type_id(authenticated_client: TestClient):
     question_payload_dict = get_sample_question_api_data(99999) # Non-existent exam_type_id
     response = authenticated_client.post("/questions/", json=question_payload_dict)
@@ -44,6 +52,12 @@ def test_create_question_missing_exam_type_id(authenticated_client: TestClient):
     response = authenticated_client.post("/questions/", json=question_payload_dict)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+def test_create_question_correct_answer_out_of_range(authenticated_client: TestClient, test_exam_type: models.ExamType):
+    for correct_answer in (0, 5):
+        question_payload_dict = {**get_sample_question_api_data(test_exam_type.id), "correct_answer": correct_answer}
+        response = authenticated_client.post("/questions/", json=question_payload_dict)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 def test_read_question_api(authenticated_client: TestClient, db_session: SQLAlchemySession, test_exam_type: models.ExamType):
     question_in_db = crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_question_api_data(test_exam_type.id)))
     response = authenticated_client.get(f"/questions/{question_in_db.id}/")
@@ -307,3 +321,24 @@ def test_get_next_question_all_answered_correctly_fallback(
     assert response_one_q.status_code == status.HTTP_200_OK
     data_one_q = response_one_q.json()
     assert data_one_q["id"] == q1.id
+
+def test_question_reads_are_served_from_the_bank_cache(authenticated_client: TestClient, db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    question = crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_question_api_data(test_exam_type.id)))
+    before = authenticated_client.get("/metrics/question-cache").json()
+
+    assert authenticated_client.get(f"/questions/next/?exam_type_id={test_exam_type.id}").json()["id"] == question.id # Loads the bank
+    assert authenticated_client.get(f"/questions/{question.id}/").json()["problem_statement"] == question.problem_statement
+    after = authenticated_client.get("/metrics/question-cache").json()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 1)
+    assert after["banks"] == 1 and after["questions"] == 1
+
+    # Writes bump the exam type's version, so the next read sees them
+    response = authenticated_client.put(f"/questions/{question.id}", json={"problem_statement": "API Test: What is 3x3?"})
+    assert response.status_code == status.HTTP_200_OK
+    assert authenticated_client.get(f"/questions/{question.id}/").json()["problem_statement"] == "API Test: What is 3x3?"
+    second = crud_question.create_question(db_session, schemas.QuestionCreate(
+        **{**get_sample_question_api_data(test_exam_type.id), "problem_statement": "API Test: What is 4x4?"}
+    ))
+    assert authenticated_client.get(f"/questions/{second.id}/").status_code == status.HTTP_200_OK
+    authenticated_client.delete(f"/questions/{second.id}")
+    assert authenticated_client.get(f"/questions/{second.id}/").status_code == status.HTTP_404_NOT_FOUND
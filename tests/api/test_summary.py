@@ -4,7 +4,7 @@ from fastapi import status
 
 from app.schemas import schemas
 from app.models import models
-from app.crud import crud_question, crud_user_answer, crud_exam_type # For setting up test scenarios
+from app.crud import crud_question, crud_user_answer, crud_exam_type, crud_summary # For setting up test scenarios
 
 # Sample question data for reuse, now requires exam_type_id
 def get_sample_summary_q_data(exam_type_id: int, suffix: str) -> dict:
@@ -198,3 +198,77 @@ def test_get_summary_answers_exist_elsewhere_not_in_filtered_exam_type(
     assert data_overall["summary_stats"]["total_unique_questions_attempted"] == 1
     assert len(data_overall["question_performance"]) == 1
     assert data_overall["question_performance"][0]["question_id"] == q_answered.id
+
+def _collect_pages(client: TestClient, url: str) -> list:
+    pages, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        pages.append(data["question_performance"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+def test_get_summary_paginates_sorted_question_performance(
+    authenticated_client: TestClient, db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType
+):
+    et2 = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Summary Sort ET2"))
+    questions = [
+        crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_summary_q_data(et.id, f"Sort{i}")))
+        for i, et in enumerate([test_exam_type, et2] * 3)
+    ]
+    # Question i is answered wrong i times and right once
+    for i, q in enumerate(questions):
+        for _ in range(i):
+            crud_user_answer.create_user_answer(db_session, schemas.UserAnswerCreate(question_id=q.id, selected_answer=2), test_user.id)
+        crud_user_answer.create_user_answer(db_session, schemas.UserAnswerCreate(question_id=q.id, selected_answer=1), test_user.id)
+    ids = [q.id for q in questions]
+
+    pages = _collect_pages(authenticated_client, "/summary/?sort=most_incorrect&limit=4")
+    assert [len(page) for page in pages] == [4, 2]
+    assert [p["question_id"] for page in pages for p in page] == ids[::-1]
+
+    pages = _collect_pages(authenticated_client, "/summary/?sort=lowest_accuracy&limit=2")
+    assert [p["question_id"] for page in pages for p in page] == ids[::-1]
+
+    pages = _collect_pages(authenticated_client, f"/summary/?sort=most_incorrect&limit=2&exam_type_id={et2.id}")
+    assert [p["question_id"] for page in pages for p in page] == [ids[5], ids[3], ids[1]]
+
+    pages = _collect_pages(authenticated_client, "/summary/?limit=5")
+    assert [p["question_id"] for page in pages for p in page] == ids
+
+def test_get_summary_problem_text_length(authenticated_client: TestClient, db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q = crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_summary_q_data(test_exam_type.id, "Text")))
+    crud_user_answer.create_user_answer(db_session, schemas.UserAnswerCreate(question_id=q.id, selected_answer=1), test_user.id)
+
+    assert authenticated_client.get("/summary/").json()["question_performance"][0]["problem_statement"] == q.problem_statement
+    assert authenticated_client.get("/summary/?problem_text_length=7").json()["question_performance"][0]["problem_statement"] == q.problem_statement[:7]
+    assert authenticated_client.get("/summary/?problem_text_length=0").json()["question_performance"][0]["problem_statement"] is None
+
+def test_get_summary_invalid_cursor(authenticated_client: TestClient):
+    assert authenticated_client.get("/summary/?cursor=not-a-cursor").status_code == status.HTTP_400_BAD_REQUEST
+    cursor = crud_summary.encode_performance_cursor("most_incorrect", 1)
+    response = authenticated_client.get(f"/summary/?sort=least_recent&cursor={cursor}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_summary_dashboard_matches_filtered_summaries(
+    authenticated_client: TestClient, db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType
+):
+    et2 = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Dashboard ET2"))
+    crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Dashboard ET Unanswered"))
+    q1 = crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_summary_q_data(test_exam_type.id, "Dash1")))
+    q2 = crud_question.create_question(db_session, schemas.QuestionCreate(**get_sample_summary_q_data(et2.id, "Dash2")))
+    for q, selected in ((q1, 1), (q1, 2), (q2, 3)):
+        crud_user_answer.create_user_answer(db_session, schemas.UserAnswerCreate(question_id=q.id, selected_answer=selected), test_user.id)
+
+    response = authenticated_client.get("/summary/dashboard/")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["summary_stats"] == authenticated_client.get("/summary/").json()["summary_stats"]
+    assert [(et["exam_type_id"], et["exam_type_name"]) for et in data["exam_types"]] == sorted(
+        [(test_exam_type.id, test_exam_type.name), (et2.id, et2.name)], key=lambda item: item[1]
+    )
+    for et in data["exam_types"]:
+        assert et["summary_stats"] == authenticated_client.get(f"/summary/?exam_type_id={et['exam_type_id']}").json()["summary_stats"]
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session as SQLAlchemySession
+from fastapi import status
+
+from app.models import models
+
+
+def test_bulk_create_users(authenticated_client: TestClient, test_user: models.User, db_session: SQLAlchemySession):
+    payload = [
+        {"username": "cohort_1", "email": "cohort_1@example.com", "password": "pw1"},
+        {"username": test_user.username, "password": "pw2"},
+        {"username": "cohort_3", "password": "pw3", "full_name": "Cohort Three"},
+    ]
+    response = authenticated_client.post("/users/bulk", json=payload)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["imported_count"] == 2
+    assert data["failed_count"] == 1
+    assert data["errors"][0]["row_index"] == 1
+    assert db_session.query(models.User).filter(models.User.username.in_(["cohort_1", "cohort_3"])).count() == 2
+
+
+def test_bulk_create_users_requires_auth(client: TestClient, db_session: SQLAlchemySession):
+    response = client.post("/users/bulk", json=[{"username": "nobody", "password": "pw"}])
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_bulk_create_users_caps_request_size(authenticated_client: TestClient, db_session: SQLAlchemySession, monkeypatch):
+    monkeypatch.setattr("app.routers.users.BULK_USERS_MAX_PER_REQUEST", 2)
+    payload = [{"username": f"capped_{i}", "password": "pw"} for i in range(3)]
+    response = authenticated_client.post("/users/bulk", json=payload)
+    assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+    assert db_session.query(models.User).filter(models.User.username.like("capped_%")).count() == 0
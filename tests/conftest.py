@@ -10,7 +10,10 @@ from app.main import app
 from app.db.database import Base, get_db # Assuming get_db is in app.db.database
 from app.models import models # Ensure all models are imported for Base.metadata
 from app.schemas import schemas # For creating test data
-from app.core.security import get_password_hash # For creating test users
+from app.core.security import get_password_hash, verified_token_cache # For creating test users
+from app.core.user_cache import user_cache
+from app.core.exam_type_registry import exam_type_registry
+from app.core.question_cache import question_bank_cache
 
 # Use SQLite in-memory for testing
 SQLALCHEMY_DATABASE_URL_TEST = "sqlite:///:memory:"
@@ -39,7 +42,11 @@ app.dependency_overrides[get_db] = override_get_db
 def db_session() -> SQLAlchemySession: # Yields a SQLAlchemy session
     Base.metadata.drop_all(bind=engine) # Drop all tables
     Base.metadata.create_all(bind=engine) # Create all tables
-    
+    user_cache.clear() # User ids restart with every fresh database
+    verified_token_cache.clear()
+    question_bank_cache.clear() # So are question and exam type ids
+    exam_type_registry.clear()
+
     db = TestingSessionLocal()
     try:
         yield db
@@ -0,0 +1,44 @@
+import csv
+import io
+
+from app.core import bulk_formats
+from app.core.bulk_formats import RowError
+
+
+def test_format_negotiation():
+    assert bulk_formats.import_format_for("application/x-ndjson") == bulk_formats.NDJSON
+    assert bulk_formats.import_format_for("text/csv; charset=utf-8") == bulk_formats.CSV
+    assert bulk_formats.import_format_for("application/octet-stream", "bank.jsonl") == bulk_formats.NDJSON
+    assert bulk_formats.import_format_for(None, "bank") == bulk_formats.JSON
+    assert bulk_formats.export_format_for("text/html, text/csv;q=0.9, */*") == bulk_formats.CSV
+    assert bulk_formats.export_format_for("*/*") == bulk_formats.JSON
+    assert bulk_formats.export_format_for(None) == bulk_formats.JSON
+
+
+def test_ndjson_lines_are_independent():
+    rows = list(bulk_formats.iter_ndjson(io.BytesIO(b'\xef\xbb\xbf{"a": 1}\n{broken\n\n{"a": "\xc3\xa9"}\n')))
+    assert rows[0] == (0, {"a": 1})
+    assert rows[1][0] == 1 and isinstance(rows[1][1], RowError)
+    assert rows[2] == (3, {"a": "é"}) # The blank line is skipped but still counted
+    assert len(rows) == 3
+
+    encoded = b"".join(bulk_formats.encode_ndjson([{"a": 1}, {"a": "é"}], chunk_size=4))
+    assert list(bulk_formats.iter_ndjson(io.BytesIO(encoded))) == [(0, {"a": 1}), (1, {"a": "é"})]
+
+
+def test_csv_round_trip_and_row_errors():
+    items = [{"a": "x, \"quoted\"\nmultiline", "b": None}, {"a": "é", "b": "2"}]
+    encoded = b"".join(bulk_formats.encode_csv(items, fieldnames=["a", "b"], chunk_size=8))
+    stream = io.BytesIO(encoded)
+    assert list(bulk_formats.iter_csv(stream, optional_fields=["b"])) == items
+    assert not stream.closed
+
+    rows = list(bulk_formats.iter_csv(io.BytesIO(b"a,b\n1,2\n1,2,3\n"), optional_fields=["b"]))
+    assert rows[0] == {"a": "1", "b": "2"}
+    assert isinstance(rows[1], RowError)
+
+    oversized = "x" * (csv.field_size_limit() + 1)
+    rows = list(bulk_formats.iter_csv(io.BytesIO(f"a,b\n1,2\n{oversized},3\n4,5\n".encode())))
+    assert rows[0] == {"a": "1", "b": "2"}
+    assert isinstance(rows[1], RowError)
+    assert rows[2] == {"a": "4", "b": "5"} # Reading goes on after the bad row
@@ -0,0 +1,67 @@
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core import cache_invalidation
+from app.models.models import ExamType
+
+TEST_KIND = "test_kind"
+
+
+@pytest.fixture
+def evicted():
+    keys = []
+    cache_invalidation.register(TEST_KIND, keys.append, lambda: keys.append("reset"))
+    yield keys
+    cache_invalidation._handlers.pop(TEST_KIND)
+
+
+def test_invalidation_applies_only_when_the_transaction_commits(db_session, evicted):
+    db_session.add(ExamType(name="Rolled back"))
+    cache_invalidation.invalidate(db_session, TEST_KIND, 1)
+    db_session.rollback()
+    assert evicted == []
+
+    db_session.add(ExamType(name="Committed"))
+    cache_invalidation.invalidate(db_session, TEST_KIND, 2)
+    cache_invalidation.invalidate(db_session, TEST_KIND, None) # e.g. a question without an exam type
+    assert evicted == []
+    db_session.commit()
+    assert evicted == [2]
+
+
+def test_listener_dispatch_skips_own_and_malformed_notifications(evicted):
+    listener = cache_invalidation.InvalidationListener(engine=None)
+    listener.dispatch(json.dumps({"origin": cache_invalidation.PROCESS_ID, "kind": TEST_KIND, "keys": [1]}))
+    listener.dispatch("not json")
+    listener.dispatch(json.dumps({"origin": "other", "kind": "unknown", "keys": [2]}))
+    listener.dispatch(json.dumps({"origin": "other", "kind": TEST_KIND, "keys": [3, 4], "sent_at": time.time()}))
+    assert evicted == [3, 4]
+    assert listener.stats()["received"] == 2 and listener.stats()["last_delay_ms"] is not None
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="needs a PostgreSQL server (TEST_POSTGRES_URL)")
+def test_notifications_reach_listener_over_postgresql(evicted):
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    # Listen to this process's own notifications, standing in for another worker
+    listener = cache_invalidation.InvalidationListener(engine, poll_interval=0.1, ignore_origin=None).start()
+    try:
+        assert listener.listening.wait(10)
+        assert evicted == ["reset"]
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+            cache_invalidation.invalidate(session, TEST_KIND, 5)
+            session.rollback()
+            cache_invalidation.invalidate(session, TEST_KIND, 7)
+            session.commit()
+        deadline = time.monotonic() + 10
+        while listener.received < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert evicted == ["reset", 7, 7] # Locally at commit, then via the listener
+    finally:
+        listener.stop()
+        engine.dispose()
@@ -0,0 +1,91 @@
+import io
+import json
+import time
+
+import pytest
+from sqlalchemy.orm import Session as SQLAlchemySession, sessionmaker
+
+from app.core.import_jobs import ImportJobManager, ImportQueueFullError, SUCCEEDED, job_status
+from app.crud import crud_import_job
+from app.models import models
+
+
+def wait_for(job, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while job.status not in ("succeeded", "failed"):
+        assert time.monotonic() < deadline, "import job did not finish"
+        time.sleep(0.01)
+
+
+def make_document(count: int) -> bytes:
+    items = [{"problem_statement": f"Job Q{i}", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 1} for i in range(count)]
+    items[1] = {"problem_statement": "Invalid"}
+    return json.dumps(items).encode("utf-8")
+
+
+def test_import_job_runs_in_background_with_throttle(db_session: SQLAlchemySession, test_exam_type: models.ExamType, tmp_path):
+    manager = ImportJobManager(max_workers=1, max_queued=5, max_rows_per_second=2000, spool_dir=str(tmp_path))
+    session_factory = sessionmaker(bind=db_session.get_bind())
+
+    job = manager.submit(test_exam_type.id, io.BytesIO(make_document(1500)), "json", session_factory)
+    wait_for(job)
+
+    status = job_status(crud_import_job.get_import_job(db_session, job.job_id)) # As any worker would see it
+    assert status.status == SUCCEEDED
+    assert (status.rows_done, status.rows_failed) == (1499, 1)
+    assert status.summary.errors[0].row_index == 1
+    assert status.finished_at >= status.started_at
+    # 1500 rows at 2000 rows/s: the second chunk has to wait for the budget
+    assert (status.finished_at - status.started_at).total_seconds() >= 0.5
+    assert list(tmp_path.iterdir()) == [] # Spool file removed
+    assert db_session.query(models.Question).count() == 1499
+    assert manager.active_count() == 0
+
+
+def test_import_job_with_stale_heartbeat_is_reported_failed(db_session: SQLAlchemySession):
+    # A job whose process stopped (restart, crash) stays "running" in the table; its heartbeat ages
+    record = crud_import_job.create_import_job(db_session, "lostjob", exam_type_id=1)
+    crud_import_job.start_import_job(db_session, "lostjob")
+    assert job_status(record).status == "running"
+    assert job_status(record, stale_seconds=-1).status == "failed"
+    assert "stopped" in job_status(record, stale_seconds=-1).error
+
+
+def test_import_job_queue_limit(tmp_path):
+    manager = ImportJobManager(max_workers=1, max_queued=0, spool_dir=str(tmp_path))
+    with pytest.raises(ImportQueueFullError):
+        manager.submit(1, io.BytesIO(b"[]"), "json", lambda: None)
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+def test_import_job_queue_limit_holds_under_concurrent_submits(tmp_path, monkeypatch):
+    import threading
+
+    manager = ImportJobManager(max_workers=1, max_queued=1, spool_dir=str(tmp_path), heartbeat_seconds=3600)
+    monkeypatch.setattr(manager, "_run", lambda job, session_factory: None) # Jobs stay queued
+    monkeypatch.setattr(crud_import_job, "create_import_job", lambda db, job_id, exam_type_id: None)
+    monkeypatch.setattr(crud_import_job, "delete_finished_import_jobs", lambda db, keep: 0)
+    spool = manager.spool
+    monkeypatch.setattr(manager, "spool", lambda source: (time.sleep(0.05), spool(source))[1]) # A slow upload
+    barrier = threading.Barrier(8)
+    outcomes = []
+
+    def submit():
+        barrier.wait()
+        try:
+            manager.submit(1, io.BytesIO(b"[]"), "json", FakeSession)
+            outcomes.append("queued")
+        except ImportQueueFullError:
+            outcomes.append("full")
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(outcomes) == ["full"] * 7 + ["queued"]
+    assert manager.active_count() == 1
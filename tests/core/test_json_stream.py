@@ -0,0 +1,59 @@
+import io
+
+import pytest
+
+from app.core.json_stream import InvalidJSONError, NotAJSONArrayError, iter_json_array
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_iter_json_array_across_chunk_boundaries(chunk_size: int):
+    document = '﻿ [ {"a": [1, 2, {"b": "é]"}]} , 123456789, "x\\"y", null ]\n'.encode("utf-8")
+    items = list(iter_json_array(io.BytesIO(document), chunk_size=chunk_size))
+    assert items == [{"a": [1, 2, {"b": "é]"}]}, 123456789, 'x"y', None]
+    assert list(iter_json_array(io.BytesIO(b"[]"), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize("document, error", [
+    (b'{"a": 1}', NotAJSONArrayError),
+    (b"this is not json", InvalidJSONError),
+    (b"", InvalidJSONError),
+    (b"[1,]", InvalidJSONError),
+    (b"[1 2]", InvalidJSONError),
+    (b"[1] 2", InvalidJSONError),
+    (b"[1, 2", InvalidJSONError),
+])
+def test_iter_json_array_rejects_malformed_documents(document: bytes, error):
+    with pytest.raises(error):
+        list(iter_json_array(io.BytesIO(document), chunk_size=2))
+
+
+def test_encode_json_array_round_trips_in_chunks():
+    import gzip
+    import json
+    from app.core.json_stream import encode_json_array, gzip_chunks
+
+    items = [{"i": i, "text": "é" * (i % 7)} for i in range(500)]
+    chunks = list(encode_json_array(iter(items), chunk_size=256))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == items
+    assert list(iter_json_array(io.BytesIO(b"".join(chunks)), chunk_size=100)) == items
+    assert json.loads(b"".join(encode_json_array([]))) == []
+
+    assert json.loads(gzip.decompress(b"".join(gzip_chunks(encode_json_array(items, chunk_size=256))))) == items
+
+
+def test_iter_json_array_stops_reading_at_an_oversized_malformed_element():
+    class CountingStream(io.BytesIO):
+        bytes_read = 0
+
+        def read(self, size=-1):
+            data = super().read(size)
+            self.bytes_read += len(data)
+            return data
+
+    stream = CountingStream(b'[{"a": 1}, {"a": ' + b"1" * 10 + b" !" + b" " * 100_000 + b"}]")
+    items = iter_json_array(stream, chunk_size=64, max_element_chars=256)
+    assert next(items) == {"a": 1}
+    with pytest.raises(InvalidJSONError):
+        next(items)
+    assert stream.bytes_read < 1024
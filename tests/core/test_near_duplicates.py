@@ -0,0 +1,47 @@
+import random
+
+from app.core.near_duplicates import MinHasher, find_near_duplicate_clusters, jaccard, lsh_bands, shingle_hashes
+
+OPTIONS = ["Physical", "Network", "Transport", "Session"]
+
+
+def test_shingles_ignore_case_whitespace_and_punctuation():
+    assert shingle_hashes(["Which  layer routes packets?", *OPTIONS]) == shingle_hashes(["which layer, routes PACKETS", *OPTIONS])
+    assert shingle_hashes(["Which layer routes packets?", *OPTIONS]) != shingle_hashes(["Which layer routes frames?", *OPTIONS])
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = random.Random(3)
+    base = list(range(200))
+    other = base[:150] + list(range(1000, 1050)) # Jaccard 150 / 250 = 0.6
+    hasher = MinHasher(num_perm=256, seed=rng.randrange(1000))
+    a, b = hasher.signature(base), hasher.signature(other)
+    assert abs(sum(x == y for x, y in zip(a, b)) / 256 - jaccard(base, other)) < 0.1
+    assert MinHasher(num_perm=256, seed=7).signature(base) == MinHasher(num_perm=256, seed=7).signature(base)
+
+
+def test_lsh_bands_stay_at_or_below_threshold():
+    for threshold in (0.5, 0.7, 0.8, 0.9):
+        bands, rows = lsh_bands(128, threshold)
+        assert bands * rows == 128
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_clusters_near_duplicates_only():
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(2000)]
+    questions = []
+    for question_id in range(500):
+        statement = " ".join(rng.choice(words) for _ in range(20))
+        questions.append((question_id, [statement, *OPTIONS]))
+    # Two rewordings of question 0 (one word changed, one word appended) and an exact copy of question 1
+    reworded = questions[0][1][0].split()
+    questions.append((1000, [" ".join(reworded[:10] + ["changed"] + reworded[11:]), *OPTIONS]))
+    questions.append((1001, [questions[0][1][0] + " today", *OPTIONS]))
+    questions.append((1002, list(questions[1][1])))
+
+    clusters = find_near_duplicate_clusters(questions, threshold=0.7)
+    assert [cluster.question_ids for cluster in clusters] == [[0, 1000, 1001], [1, 1002]]
+    assert clusters[1].min_similarity == 1.0
+    assert 0.7 <= clusters[0].min_similarity < 1.0
+    assert find_near_duplicate_clusters([]) == []
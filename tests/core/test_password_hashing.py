@@ -0,0 +1,10 @@
+from app.core import security
+
+
+def test_get_password_hashes_uses_process_pool_and_keeps_order():
+    passwords = [f"password-{i}" for i in range(security.PARALLEL_HASH_MIN_PASSWORDS)]
+    hashes = security.get_password_hashes(passwords)
+
+    assert len(hashes) == len(passwords)
+    assert all(security.verify_password(password, hashed) for password, hashed in zip(passwords, hashes))
+    assert security._bulk_hash_pool is not None
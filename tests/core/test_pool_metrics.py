@@ -0,0 +1,44 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool_metrics import InstrumentedQueuePool, pool_snapshot
+
+
+def test_instrumented_pool_tracks_checkouts_and_overflow(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    first = engine.connect()
+    second = engine.connect() # Needs the overflow slot
+    first.execute(text("SELECT 1"))
+
+    snapshot = pool_snapshot(engine.pool, max_overflow=1)
+    assert snapshot["max_overflow"] == 1
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow_in_use"] == 1
+    assert snapshot["peak_checked_out"] == 2
+    assert snapshot["peak_overflow"] == 1
+    assert snapshot["checkouts"] == 2
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect() # Pool and overflow exhausted
+
+    snapshot = pool_snapshot(engine.pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms"]["max"] >= 50 * 0.9 # Waited ~pool_timeout before giving up
+
+    first.close()
+    second.close()
+    assert pool_snapshot(engine.pool)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_db_pool_metrics_endpoint(client: TestClient):
+    response = client.get("/metrics/db-pool")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["sync"]["pool_class"]
+    assert "async" in data
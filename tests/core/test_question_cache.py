@@ -0,0 +1,56 @@
+from typing import Tuple
+
+from app.core.question_cache import QuestionBank, QuestionBankCache
+
+
+def make_bank(exam_type_id: int, version: Tuple[int, int] = (0, 0), count: int = 3, text: str = "Q") -> QuestionBank:
+    return QuestionBank(exam_type_id, version, [
+        (exam_type_id * 100 + i, f"{text}{i}", "A", "B", "C", "D", 1 + i % 4, None) for i in range(count)
+    ])
+
+
+def test_question_bank_returns_fresh_questions():
+    bank = make_bank(1)
+    first = bank.get(101)
+    assert (first.id, first.exam_type_id, first.problem_statement, first.correct_answer, first.explanation) == (101, 1, "Q1", 2, None)
+    assert bank.get(101) is not first
+    assert bank.get(999) is None
+    assert len(bank) == 3 and 100 in bank
+
+
+def test_question_bank_cache_refuses_stale_loads():
+    cache = QuestionBankCache(max_bytes=10 ** 7)
+    version = cache.version(1)
+    cache.bump_version(1) # A write committed while the bank was loading
+    assert not cache.put(make_bank(1, version))
+    assert cache.get(1) is None
+
+    assert cache.put(make_bank(1, cache.version(1)))
+    assert cache.find_question(102).problem_statement == "Q2"
+    cache.bump_version(1)
+    assert cache.get(1) is None and cache.find_question(102) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # clear() (a missed invalidation) refuses every load that started before it
+    version = cache.version(2)
+    cache.clear()
+    assert not cache.put(make_bank(2, version))
+    assert cache.put(make_bank(2, cache.version(2)))
+
+
+def test_question_bank_cache_evicts_least_recently_used_by_size():
+    bank_size = make_bank(1, count=50).nbytes
+    cache = QuestionBankCache(max_bytes=int(bank_size * 2.5))
+    for exam_type_id in (1, 2):
+        assert cache.put(make_bank(exam_type_id, count=50))
+    cache.get(1) # 2 is now least recently used
+    assert cache.put(make_bank(3, count=50))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] <= cache.max_bytes
+
+    # A bank larger than the whole cache is not cached until its exam type changes
+    assert not cache.put(make_bank(4, count=500))
+    assert cache.is_oversized(4)
+    cache.bump_version(4)
+    assert not cache.is_oversized(4)
@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+
+from app.core import question_sampler
+from app.core.question_sampler import FenwickTree, IncorrectRateSampler, WEIGHT_SCALE
+
+
+def test_fenwick_tree_matches_brute_force():
+    rng = random.Random(7)
+    weights = [rng.choice([0, 0, 1, 5, 40]) for _ in range(37)]
+    tree = FenwickTree(weights)
+    for _ in range(100):
+        index = rng.randrange(len(weights))
+        delta = rng.randint(-weights[index], 10)
+        weights[index] += delta
+        tree.add(index, delta)
+        assert tree.total() == sum(weights)
+        end = rng.randrange(len(weights) + 1)
+        assert tree.prefix_sum(end) == sum(weights[:end])
+        if tree.total():
+            target = rng.randrange(tree.total())
+            found = tree.find(target)
+            assert sum(weights[:found]) <= target < sum(weights[:found + 1])
+
+
+def test_sampler_draws_by_incorrect_rate_reproducibly():
+    # (total_answers, total_correct): never answered, always correct, 25% and 75% incorrect
+    sampler = IncorrectRateSampler([(0, 0), (4, 4), (4, 3), (4, 1)])
+    assert [sampler.weight(slot) for slot in range(4)] == [0, 0, WEIGHT_SCALE // 4, WEIGHT_SCALE * 3 // 4]
+
+    question_sampler.seed(42)
+    first = sampler.draw(2000)
+    question_sampler.seed(42)
+    assert sampler.draw(2000) == first
+    counts = Counter(first)
+    assert set(counts) == {2, 3}
+    assert 2.5 < counts[3] / counts[2] < 3.5
+
+    sampler.record_answer(0, is_correct=False) # Slot 0's first answer is wrong: now the heaviest
+    assert sampler.weight(0) == WEIGHT_SCALE
+    assert sampler.choose([0, 1]) == 0
+    assert sampler.choose([1]) is None
+    assert IncorrectRateSampler([(3, 3)]).draw(5) == []
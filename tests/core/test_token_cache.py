@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from app.core import security
+
+
+def test_verified_token_cache_hits_after_first_decode():
+    security.verified_token_cache.clear()
+    token = security.create_access_token(data={"sub": "cacheduser", "uid": 7}, expires_delta=timedelta(minutes=5))
+    before = security.verified_token_cache.stats()
+
+    first = security.decode_token_claims(token)
+    second = security.decode_token_claims(token)
+    after = security.verified_token_cache.stats()
+
+    assert first == second and first["uid"] == 7
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+    second["sub"] = "tampered" # Callers get copies
+    assert security.decode_token("x" + token) is None
+    assert security.decode_token(token) == "cacheduser"
+
+
+def test_verified_token_cache_respects_exp_and_size():
+    cache = security.VerifiedTokenCache(max_entries=2)
+    cache.put("expired", {"sub": "a", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+    cache.put("no-exp", {"sub": "a"}) # Never cached without an exp
+    assert cache.get("no-exp") is None
+
+    exp = time.time() + 60
+    for token in ("t1", "t2", "t3"):
+        cache.put(token, {"sub": token, "exp": exp})
+    assert cache.get("t1") is None
+    assert cache.get("t3")["sub"] == "t3"
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,36 @@
+import time
+
+from app.core.user_cache import UserCache
+from app.models import models
+
+
+def make_user(user_id: int, username: str, token_version: int = 0) -> models.User:
+    return models.User(id=user_id, username=username, hashed_password="x", token_version=token_version)
+
+
+def test_user_cache_returns_fresh_copies_without_password():
+    cache = UserCache(ttl_seconds=60, max_entries=10)
+    cache.put(make_user(1, "alice"))
+
+    first = cache.get(1)
+    second = cache.get(1)
+    assert first.username == "alice"
+    assert first.hashed_password is None
+    assert first is not second
+    assert cache.get(2) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_user_cache_evicts_least_recently_used_and_expired():
+    cache = UserCache(ttl_seconds=60, max_entries=2)
+    cache.put(make_user(1, "a"))
+    cache.put(make_user(2, "b"))
+    cache.get(1) # 2 is now least recently used
+    cache.put(make_user(3, "c"))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+
+    short = UserCache(ttl_seconds=0.01, max_entries=10)
+    short.put(make_user(1, "a"))
+    time.sleep(0.02)
+    assert short.get(1) is None
@@ -0,0 +1,51 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.core.exam_type_registry import ExamTypeRegistry, exam_type_registry
+from app.crud import crud_exam_type
+from app.schemas import schemas
+from app.models import models
+
+
+def test_exam_type_lookups_are_served_from_the_registry(db_session: SQLAlchemySession):
+    created = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Registry ET"))
+    assert crud_exam_type.get_exam_type_name(db_session, created.id) == "Registry ET"
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert crud_exam_type.exam_type_exists(db_session, created.id)
+        assert crud_exam_type.get_exam_type_id_by_name(db_session, "Registry ET") == created.id
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    assert statements == []
+
+    # Created behind the registry's back (another worker): found in the database, then cached
+    db_session.add(models.ExamType(name="Other Worker ET"))
+    db_session.commit()
+    other_id = db_session.query(models.ExamType.id).filter(models.ExamType.name == "Other Worker ET").scalar()
+    assert crud_exam_type.exam_type_exists(db_session, other_id)
+    assert exam_type_registry.name(other_id) == "Other Worker ET"
+
+    crud_exam_type.update_exam_type(db_session, created.id, schemas.ExamTypeUpdate(name="Renamed ET"))
+    assert crud_exam_type.get_exam_type_name(db_session, created.id) == "Renamed ET"
+    assert crud_exam_type.get_exam_type_id_by_name(db_session, "Registry ET") is None
+
+    crud_exam_type.delete_exam_type(db_session, created.id)
+    assert not crud_exam_type.exam_type_exists(db_session, created.id)
+    assert not crud_exam_type.exam_type_exists(db_session, 9999)
+
+
+def test_registry_refuses_loads_that_raced_an_eviction():
+    registry = ExamTypeRegistry()
+    generation = registry.generation()
+    registry.evict(1) # An update committed while the rows were being read
+    assert not registry.load([(1, "Old name")], generation)
+    assert not registry.loaded
+
+    assert registry.load([(1, "New name")], registry.generation())
+    generation = registry.generation()
+    registry.evict(1)
+    assert not registry.put(1, "New name", generation)
+    assert registry.name(1) is None and registry.id_for_name("New name") is None
@@ -114,3 +114,156 @@ def test_get_question_global_stats_with_answers(db_session: SQLAlchemySession, t
     assert q1_stat["total_incorrect_answers"] == 1
     assert q1_stat["global_correct_rate"] == 0.5
     assert q1_stat["global_incorrect_rate"] == 0.5
+
+
+def test_get_next_question_for_user_prefers_unanswered(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    from app.crud import crud_user_answer
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id}
+    q1 = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "NQ1"}))
+    q2 = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "NQ2"}))
+    crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=q1.id, selected_answer=2), user_id=test_user.id) # Incorrect
+
+    next_q = crud_question.get_next_question_for_user(db=db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert next_q is not None
+    assert next_q.id == q2.id
+
+
+def test_get_next_question_for_user_prioritizes_incorrect_rate(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    from app.crud import crud_user_answer
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id, "correct_answer": 1}
+    q_correct = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "NQ Correct"}))
+    q_low = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "NQ Low Rate"}))
+    q_high = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "NQ High Rate"}))
+
+    other_user = crud_user.create_user(db=db_session, user=schemas.UserCreate(username="othernextq", password="password"))
+
+    def answer(question_id: int, selected: int, user_id: int):
+        crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=question_id, selected_answer=selected), user_id=user_id)
+
+    # q_correct: always correct for test_user, but globally very incorrect (must be excluded)
+    answer(q_correct.id, 1, test_user.id)
+    answer(q_correct.id, 2, other_user.id)
+    answer(q_correct.id, 2, other_user.id)
+    # q_low: 1 of 3 incorrect globally
+    answer(q_low.id, 2, test_user.id)
+    answer(q_low.id, 1, other_user.id)
+    answer(q_low.id, 1, other_user.id)
+    # q_high: 2 of 3 incorrect globally
+    answer(q_high.id, 2, test_user.id)
+    answer(q_high.id, 1, test_user.id)
+    answer(q_high.id, 2, other_user.id)
+
+    next_q = crud_question.get_next_question_for_user(db=db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert next_q.id == q_high.id
+
+
+def test_get_next_question_for_user_review_fallback_and_empty(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    from app.crud import crud_user_answer
+    assert crud_question.get_next_question_for_user(db=db_session, user_id=test_user.id, exam_type_id=test_exam_type.id) is None
+
+    q1 = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**sample_question_data, "exam_type_id": test_exam_type.id, "correct_answer": 1}))
+    crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=q1.id, selected_answer=1), user_id=test_user.id) # Correct
+
+    next_q = crud_question.get_next_question_for_user(db=db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert next_q.id == q1.id
+
+
+def test_create_question_rejects_duplicate_content_per_exam_type(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    import pytest
+    from sqlalchemy.exc import IntegrityError
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id}
+    q1 = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**base))
+    assert q1.content_hash == models.question_content_hash(base["problem_statement"], base["option_1"], base["option_2"], base["option_3"], base["option_4"])
+
+    with pytest.raises(IntegrityError):
+        crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": base["problem_statement"].upper() + " ", "correct_answer": 2}))
+    # Other exam types may hold the same content
+    other = models.ExamType(name="Dedup Other")
+    db_session.add(other)
+    db_session.commit()
+    assert crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "exam_type_id": other.id})).id != q1.id
+
+
+def test_update_question_keeps_null_hash_of_legacy_duplicate(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id}
+    crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**base))
+    # A later copy that migration 0003 left without a hash
+    legacy = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "Legacy copy"}))
+    db_session.query(models.Question).filter(models.Question.id == legacy.id).update(
+        {"problem_statement": base["problem_statement"], "content_hash": None}, synchronize_session=False
+    )
+    db_session.commit()
+
+    # Editing a column outside the hash neither sets the hash nor collides with the original
+    updated = crud_question.update_question(db=db_session, question_id=legacy.id, question_update=schemas.QuestionUpdate(explanation="Reworded"))
+    assert updated.explanation == "Reworded"
+    assert updated.content_hash is None
+
+    updated = crud_question.update_question(db=db_session, question_id=legacy.id, question_update=schemas.QuestionUpdate(problem_statement="Now distinct"))
+    assert updated.content_hash == models.question_content_hash("Now distinct", base["option_1"], base["option_2"], base["option_3"], base["option_4"])
+
+
+def test_get_next_question_cached_samples_incorrect_answers_by_rate(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    from collections import Counter
+    from app.core import question_sampler
+    from app.core.question_cache import question_bank_cache
+    from app.crud import crud_user_answer
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id, "correct_answer": 1}
+    q_low = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "Sample Low"}))
+    q_high = crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": "Sample High"}))
+    other_user = crud_user.create_user(db=db_session, user=schemas.UserCreate(username="othersampler", password="password"))
+
+    def answer(question_id: int, selected: int, user_id: int):
+        crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=question_id, selected_answer=selected), user_id=user_id)
+
+    answer(q_low.id, 2, test_user.id) # q_low: 1 of 4 incorrect
+    for _ in range(3):
+        answer(q_low.id, 1, other_user.id)
+    answer(q_high.id, 2, test_user.id) # q_high: 3 of 4 incorrect
+    answer(q_high.id, 2, other_user.id)
+    answer(q_high.id, 2, other_user.id)
+    answer(q_high.id, 1, other_user.id)
+
+    question_sampler.seed(3)
+    picks = Counter(
+        crud_question.get_next_question_cached(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id).id
+        for _ in range(200)
+    )
+    assert set(picks) == {q_low.id, q_high.id} # Both get served, not just the highest rate
+    assert picks[q_high.id] > 2 * picks[q_low.id]
+
+    # Answers committed in this process update the sampler without rebuilding it
+    sampler = question_bank_cache.peek(test_exam_type.id).sampler
+    answer(q_low.id, 2, other_user.id)
+    bank = question_bank_cache.peek(test_exam_type.id)
+    assert bank.sampler is sampler
+    assert sampler.weight(bank.slots[q_low.id]) == question_sampler.incorrect_rate_weight(5, 3)
+
+
+def test_get_next_question_cached_seeded_picks_are_reproducible(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    from app.core import question_sampler
+    from app.crud import crud_user_answer
+    base = {**sample_question_data, "exam_type_id": test_exam_type.id, "correct_answer": 1}
+    questions = [
+        crud_question.create_question(db=db_session, question=schemas.QuestionCreate(**{**base, "problem_statement": f"Seeded {i}"}))
+        for i in range(8)
+    ]
+    mixed_user = crud_user.create_user(db=db_session, user=schemas.UserCreate(username="seededmixed", password="password"))
+    correct_user = crud_user.create_user(db=db_session, user=schemas.UserCreate(username="seededcorrect", password="password"))
+    for i, question in enumerate(questions):
+        crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=question.id, selected_answer=1 + i % 2), user_id=mixed_user.id)
+        crud_user_answer.create_user_answer(db=db_session, user_answer=schemas.UserAnswerCreate(question_id=question.id, selected_answer=1), user_id=correct_user.id)
+
+    def pick_sequence():
+        # test_user: unanswered tier; mixed_user: incorrect-rate tier; correct_user: random review
+        return [
+            crud_question.get_next_question_cached(db_session, user_id=user.id, exam_type_id=test_exam_type.id).id
+            for user in (test_user, mixed_user, correct_user)
+            for _ in range(15)
+        ]
+
+    question_sampler.seed(11)
+    first = pick_sequence()
+    question_sampler.seed(11)
+    assert pick_sequence() == first
+    assert len(set(first[:15])) > 1 and len(set(first[30:])) > 1
@@ -0,0 +1,141 @@
+import io
+import json
+
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.crud import crud_question, crud_question_import
+from app.models import models
+
+
+def make_item(i: int) -> dict:
+    return {"problem_statement": f"Bulk Q{i}", "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D", "correct_answer": 1 + i % 4}
+
+
+def test_import_questions_in_chunks_reports_row_errors(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    items = [make_item(i) for i in range(7)]
+    items[2] = {"problem_statement": "Missing options"}
+    items[5] = "not an object"
+    stream = io.BytesIO(json.dumps(items).encode("utf-8"))
+
+    summary = crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=stream, chunk_size=2)
+
+    assert summary.imported_count == 5
+    assert summary.failed_count == 2
+    assert [error.row_index for error in summary.errors] == [2, 5]
+    assert summary.errors[0].data == {"problem_statement": "Missing options"}
+    stored = db_session.query(models.Question).filter(models.Question.exam_type_id == test_exam_type.id).order_by(models.Question.id).all()
+    assert [q.problem_statement for q in stored] == [f"Bulk Q{i}" for i in (0, 1, 3, 4, 6)]
+    assert stored[-1].explanation is None
+
+
+def test_import_questions_malformed_tail_imports_nothing(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    document = json.dumps([make_item(i) for i in range(5)])[:-1] + ", {broken"
+    summary = crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=io.BytesIO(document.encode("utf-8")), chunk_size=2)
+
+    assert summary.imported_count == 0
+    assert "Invalid JSON file" in summary.errors[0].error_message
+    assert db_session.query(models.Question).count() == 0
+
+
+def test_import_questions_commit_each_chunk(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    # Background jobs: each chunk is committed before on_progress, so pacing there holds no transaction
+    open_transactions = []
+    document = json.dumps([make_item(i) for i in range(5)])[:-1] + ", {broken"
+    summary = crud_question_import.import_questions(
+        db_session, exam_type_id=test_exam_type.id, stream=io.BytesIO(document.encode("utf-8")), chunk_size=2,
+        on_progress=lambda done, failed: open_transactions.append(db_session.in_transaction()), commit_each_chunk=True,
+    )
+    assert open_transactions == [False, False]
+    assert summary.imported_count == 4 # The chunks committed before the malformed tail
+    assert "Invalid JSON file" in summary.errors[0].error_message
+    assert db_session.query(models.Question).count() == 4
+
+    # FAIL checks the whole file first: a duplicate in the last chunk still rejects every chunk
+    items = [make_item(i) for i in range(10, 15)] + [make_item(0)]
+    summary = crud_question_import.import_questions(
+        db_session, exam_type_id=test_exam_type.id, stream=io.BytesIO(json.dumps(items).encode("utf-8")), chunk_size=2,
+        on_duplicate=crud_question_import.FAIL, commit_each_chunk=True,
+    )
+    assert (summary.imported_count, summary.failed_count) == (0, 1)
+    assert summary.errors[0].row_index == 5
+    assert db_session.query(models.Question).count() == 4
+
+    summary = crud_question_import.import_questions(
+        db_session, exam_type_id=test_exam_type.id, stream=io.BytesIO(json.dumps(items[:-1]).encode("utf-8")), chunk_size=2,
+        on_duplicate=crud_question_import.FAIL, commit_each_chunk=True,
+    )
+    assert (summary.imported_count, summary.failed_count) == (5, 0)
+    assert db_session.query(models.Question).count() == 9
+
+
+def test_import_throughput_ndjson_and_csv(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    import time
+    from app.core import bulk_formats
+    from app.crud import crud_exam_type
+    from app.schemas import schemas
+    other_exam_type = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Throughput CSV"))
+    rows = 5000
+    items = [{**make_item(i), "explanation": None if i % 2 else f"Exp {i}"} for i in range(rows)]
+    documents = {
+        bulk_formats.NDJSON: b"".join(bulk_formats.encode_ndjson(items)),
+        bulk_formats.CSV: b"".join(bulk_formats.encode_csv(items, fieldnames=list(items[0]))),
+    }
+    for exam_type_id, (fmt, document) in zip((test_exam_type.id, other_exam_type.id), documents.items()):
+        start = time.perf_counter()
+        summary = crud_question_import.import_questions(db_session, exam_type_id=exam_type_id, stream=io.BytesIO(document), fmt=fmt)
+        elapsed = time.perf_counter() - start
+        assert summary.imported_count == rows and summary.failed_count == 0
+        # Generous floor (the bulk path does several thousand rows/s); catches a regression to per-row commits
+        assert rows / elapsed > 1000, f"{fmt}: {rows / elapsed:.0f} rows/s"
+
+    for exam_type_id in (test_exam_type.id, other_exam_type.id):
+        assert list(crud_question.iter_questions_for_export(db_session, exam_type_id=exam_type_id)) == items
+
+
+def test_reimport_resolves_duplicates_by_mode(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    items = [make_item(i) for i in range(5)]
+    def run(document_items, **kwargs):
+        stream = io.BytesIO(json.dumps(document_items).encode("utf-8"))
+        return crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=stream, chunk_size=2, **kwargs)
+
+    # A repeat inside the file counts as a duplicate too
+    first = run(items + [{**items[0], "problem_statement": "  BULK   q0 "}])
+    assert (first.imported_count, first.skipped_count) == (5, 1)
+
+    again = run(items)
+    assert (again.imported_count, again.skipped_count, again.updated_count) == (0, 5, 0)
+
+    corrected = [{**item, "correct_answer": 4, "explanation": "fixed"} for item in items[:2]] + [make_item(99)]
+    updated = run(corrected, on_duplicate="update")
+    assert (updated.imported_count, updated.updated_count) == (1, 2)
+    stored = db_session.query(models.Question).filter(models.Question.problem_statement == "Bulk Q1").one()
+    db_session.refresh(stored)
+    assert (stored.correct_answer, stored.explanation) == (4, "fixed")
+
+    failed = run([make_item(100), items[3]], on_duplicate="fail")
+    assert failed.imported_count == 0
+    assert [error.row_index for error in failed.errors] == [1]
+    assert db_session.query(models.Question).filter(models.Question.exam_type_id == test_exam_type.id).count() == 6
+
+
+def test_dry_run_predicts_import_without_writing(db_session: SQLAlchemySession, test_exam_type: models.ExamType):
+    crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=io.BytesIO(json.dumps([make_item(0)]).encode("utf-8")))
+    items = [make_item(i) for i in range(6)] + [make_item(3)] # Row 0 is stored already, row 6 repeats row 3 in a later chunk
+    items[1] = {**make_item(1), "correct_answer": 5}
+    items[4] = {"problem_statement": "Missing options"}
+    def document():
+        return io.BytesIO(json.dumps(items).encode("utf-8"))
+
+    dry = crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=document(), chunk_size=3, dry_run=True)
+    assert dry.dry_run
+    assert (dry.imported_count, dry.skipped_count, dry.failed_count) == (3, 2, 2)
+    assert [error.row_index for error in dry.errors] == [1, 4]
+    assert "less_than_equal" in dry.errors[0].error_message
+    assert db_session.query(models.Question).count() == 1
+
+    rejected = crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=document(), chunk_size=3, dry_run=True, on_duplicate="fail")
+    assert rejected.imported_count == 0
+    assert [error.row_index for error in rejected.errors] == [0, 1, 4, 6] # Duplicates from every chunk, not just the first
+
+    real = crud_question_import.import_questions(db_session, exam_type_id=test_exam_type.id, stream=document(), chunk_size=3)
+    assert real.model_dump(exclude={"dry_run"}) == dry.model_dump(exclude={"dry_run"})
@@ -0,0 +1,57 @@
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.crud import crud_question, crud_question_stats, crud_user_answer
+from app.schemas import schemas
+from app.models import models
+
+
+def _create_question(db: SQLAlchemySession, exam_type_id: int, statement: str) -> models.Question:
+    return crud_question.create_question(db=db, question=schemas.QuestionCreate(
+        problem_statement=statement,
+        option_1="A", option_2="B", option_3="C", option_4="D",
+        correct_answer=1,
+        exam_type_id=exam_type_id
+    ))
+
+
+def _answer(db: SQLAlchemySession, question_id: int, selected: int, user_id: int):
+    crud_user_answer.create_user_answer(
+        db=db, user_answer=schemas.UserAnswerCreate(question_id=question_id, selected_answer=selected), user_id=user_id
+    )
+
+
+def test_create_user_answer_updates_question_stats(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Stats Q1")
+    assert crud_question_stats.get_question_stats(db_session, q1.id) is None
+
+    _answer(db_session, q1.id, 1, test_user.id) # Correct
+    _answer(db_session, q1.id, 3, test_user.id) # Incorrect
+    _answer(db_session, q1.id, 3, test_user.id) # Incorrect
+
+    stats = crud_question_stats.get_question_stats(db_session, q1.id)
+    assert stats.total_answers == 3
+    assert stats.total_correct == 1
+    assert (stats.option_1_count, stats.option_2_count, stats.option_3_count, stats.option_4_count) == (1, 0, 2, 0)
+    assert crud_question_stats.find_question_stats_mismatches(db_session) == []
+
+
+def test_rebuild_question_stats_repairs_drift(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Stats Rebuild Q1")
+    q2 = _create_question(db_session, test_exam_type.id, "Stats Rebuild Q2")
+    _answer(db_session, q1.id, 1, test_user.id)
+    _answer(db_session, q2.id, 2, test_user.id)
+
+    # Simulate drift: a lost counter row and a wrong total
+    db_session.query(models.QuestionStats).filter(models.QuestionStats.question_id == q1.id).delete()
+    db_session.query(models.QuestionStats).filter(models.QuestionStats.question_id == q2.id).update({"total_answers": 10})
+    db_session.commit()
+    assert crud_question_stats.find_question_stats_mismatches(db_session) == sorted([q1.id, q2.id])
+
+    rows = crud_question_stats.rebuild_question_stats(db_session, exam_type_id=test_exam_type.id)
+    assert rows == 2
+    assert crud_question_stats.find_question_stats_mismatches(db_session) == []
+
+    stats = crud_question.get_question_global_stats(db_session, exam_type_id=test_exam_type.id)
+    q2_stat = next(s for s in stats if s["question_id"] == q2.id)
+    assert q2_stat["total_answers"] == 1
+    assert q2_stat["global_incorrect_rate"] == 1
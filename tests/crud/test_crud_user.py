@@ -55,3 +55,22 @@ def test_get_user_by_email(db_session: SQLAlchemySession):
 def test_get_user_by_email_nonexistent(db_session: SQLAlchemySession):
     fetched_user = crud_user.get_user_by_email(db=db_session, email="nonexistent_email@example.com")
     assert fetched_user is None
+
+def test_create_users_bulk_reports_duplicates_per_row(db_session: SQLAlchemySession):
+    from app.core.security import verify_password
+    crud_user.create_user(db=db_session, user=schemas.UserCreate(username="bulk_existing", email="existing@example.com", password="pw"))
+
+    users = [schemas.UserCreate(username=f"bulk_{i}", email=f"bulk_{i}@example.com", password=f"pw{i}") for i in range(10)]
+    users[3] = schemas.UserCreate(username="bulk_existing", password="pw") # Already stored
+    users[5] = schemas.UserCreate(username="bulk_5_other", email="existing@example.com", password="pw") # Stored email
+    users[7] = schemas.UserCreate(username="bulk_1", password="pw") # Duplicate within the input
+
+    summary = crud_user.create_users_bulk(db=db_session, users=users, batch_size=3)
+
+    assert summary.imported_count == 7
+    assert summary.failed_count == 3
+    assert [error.row_index for error in summary.errors] == [3, 5, 7]
+    assert "password" not in summary.errors[0].data
+    created = crud_user.get_user_by_username(db=db_session, username="bulk_9")
+    assert created is not None and verify_password("pw9", created.hashed_password)
+    assert db_session.query(models.User).count() == 8
@@ -0,0 +1,76 @@
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.crud import crud_exam_type, crud_question, crud_summary, crud_user_answer, crud_user_exam_type_stats
+from app.schemas import schemas
+from app.models import models
+
+
+def _create_question(db: SQLAlchemySession, exam_type_id: int, statement: str) -> models.Question:
+    return crud_question.create_question(db=db, question=schemas.QuestionCreate(
+        problem_statement=statement,
+        option_1="A", option_2="B", option_3="C", option_4="D",
+        correct_answer=1,
+        exam_type_id=exam_type_id
+    ))
+
+
+def _answer(db: SQLAlchemySession, question_id: int, selected: int, user_id: int):
+    crud_user_answer.create_user_answer(
+        db=db, user_answer=schemas.UserAnswerCreate(question_id=question_id, selected_answer=selected), user_id=user_id
+    )
+
+
+def _stats(db: SQLAlchemySession, user_id: int) -> dict:
+    rows = db.query(models.UserExamTypeStats).filter(models.UserExamTypeStats.user_id == user_id).all()
+    return {row.exam_type_id: (row.total_answers, row.total_correct, row.unique_questions) for row in rows}
+
+
+def test_answers_maintain_per_exam_type_totals(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    other = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Stats Other ET"))
+    q1 = _create_question(db_session, test_exam_type.id, "Stats Q1")
+    q2 = _create_question(db_session, test_exam_type.id, "Stats Q2")
+    q3 = _create_question(db_session, other.id, "Stats Q3")
+    _answer(db_session, q1.id, 1, test_user.id) # Correct
+    _answer(db_session, q1.id, 2, test_user.id) # Incorrect, same question
+    _answer(db_session, q2.id, 1, test_user.id) # Correct
+    _answer(db_session, q3.id, 3, test_user.id) # Incorrect
+
+    assert _stats(db_session, test_user.id) == {test_exam_type.id: (3, 2, 2), other.id: (1, 0, 1)}
+    stats = crud_summary.get_user_summary_stats(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert (stats.total_unique_questions_attempted, stats.total_answers_submitted, stats.total_correct_answers) == (2, 3, 2)
+    overall = crud_summary.get_user_summary_stats(db_session, user_id=test_user.id)
+    assert (overall.total_unique_questions_attempted, overall.total_answers_submitted, overall.total_incorrect_answers) == (3, 4, 2)
+    assert crud_user_exam_type_stats.find_user_exam_type_stats_mismatches(db_session) == []
+
+
+def test_question_moves_and_deletes_keep_totals_consistent(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    other = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Stats Move ET"))
+    q1 = _create_question(db_session, test_exam_type.id, "Stats Move Q1")
+    q2 = _create_question(db_session, test_exam_type.id, "Stats Move Q2")
+    _answer(db_session, q1.id, 1, test_user.id)
+    _answer(db_session, q2.id, 2, test_user.id)
+
+    crud_question.update_question(db_session, q1.id, schemas.QuestionUpdate(exam_type_id=other.id))
+    assert _stats(db_session, test_user.id) == {test_exam_type.id: (1, 0, 1), other.id: (1, 1, 1)}
+
+    crud_question.delete_question(db_session, q2.id)
+    assert _stats(db_session, test_user.id) == {other.id: (1, 1, 1)}
+
+    crud_exam_type.delete_exam_type(db_session, other.id)
+    assert _stats(db_session, test_user.id) == {crud_user_exam_type_stats.NO_EXAM_TYPE: (1, 1, 1)}
+    assert crud_user_exam_type_stats.find_user_exam_type_stats_mismatches(db_session) == []
+
+
+def test_consistency_checker_and_rebuild(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Stats Rebuild Q1")
+    _answer(db_session, q1.id, 1, test_user.id)
+    _answer(db_session, q1.id, 1, test_user.id)
+
+    db_session.query(models.UserExamTypeStats).update({"total_correct": 5})
+    db_session.commit()
+    assert crud_user_exam_type_stats.find_user_exam_type_stats_mismatches(db_session) == [(test_user.id, test_exam_type.id)]
+
+    rows = crud_user_exam_type_stats.rebuild_user_exam_type_stats(db_session, user_id=test_user.id)
+    assert rows == 1
+    assert crud_user_exam_type_stats.find_user_exam_type_stats_mismatches(db_session) == []
+    assert _stats(db_session, test_user.id) == {test_exam_type.id: (2, 2, 1)}
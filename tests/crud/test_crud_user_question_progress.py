@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.core import spaced_repetition
+
+from app.crud import crud_exam_type, crud_question, crud_user_answer, crud_user_question_progress, crud_summary
+from app.schemas import schemas
+from app.models import models
+
+
+def _create_question(db: SQLAlchemySession, exam_type_id: int, statement: str) -> models.Question:
+    return crud_question.create_question(db=db, question=schemas.QuestionCreate(
+        problem_statement=statement,
+        option_1="A", option_2="B", option_3="C", option_4="D",
+        correct_answer=1,
+        exam_type_id=exam_type_id
+    ))
+
+
+def _answer(db: SQLAlchemySession, question_id: int, selected: int, user_id: int):
+    crud_user_answer.create_user_answer(
+        db=db, user_answer=schemas.UserAnswerCreate(question_id=question_id, selected_answer=selected), user_id=user_id
+    )
+
+
+def test_create_user_answer_upserts_progress(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Progress Q1")
+    q2 = _create_question(db_session, test_exam_type.id, "Progress Q2")
+    _answer(db_session, q1.id, 1, test_user.id) # Correct
+    _answer(db_session, q1.id, 1, test_user.id) # Correct
+    _answer(db_session, q2.id, 1, test_user.id) # Correct
+    _answer(db_session, q2.id, 4, test_user.id) # Incorrect
+
+    p1 = crud_user_question_progress.get_progress(db_session, test_user.id, q1.id)
+    assert (p1.attempts, p1.correct_count, p1.ever_incorrect) == (2, 2, False)
+    assert p1.last_answered_at is not None
+    p2 = crud_user_question_progress.get_progress(db_session, test_user.id, q2.id)
+    assert (p2.attempts, p2.correct_count, p2.ever_incorrect) == (2, 1, True)
+
+    assert crud_user_answer.get_questions_always_answered_correctly_by_user(db_session, test_user.id, test_exam_type.id) == [q1.id]
+    assert crud_question.get_unanswered_question_ids(db_session, test_user.id, test_exam_type.id) == []
+
+    stats = crud_summary.get_user_summary_stats(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert stats.total_unique_questions_attempted == 2
+    assert stats.total_answers_submitted == 4
+    assert stats.total_correct_answers == 3
+    assert stats.correct_answer_rate == 0.75
+
+    performance, next_cursor = crud_summary.get_user_question_performance_summary(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id)
+    assert [(p.question_id, p.times_answered, p.times_incorrect) for p in performance] == [(q1.id, 2, 0), (q2.id, 2, 1)]
+    assert next_cursor is None
+
+
+def test_rebuild_user_question_progress_repairs_drift(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Progress Rebuild Q1")
+    _answer(db_session, q1.id, 2, test_user.id) # Incorrect
+
+    db_session.query(models.UserQuestionProgress).delete()
+    db_session.commit()
+    assert crud_user_question_progress.find_user_question_progress_mismatches(db_session) == [(test_user.id, q1.id)]
+
+    rows = crud_user_question_progress.rebuild_user_question_progress(db_session, user_id=test_user.id)
+    assert rows == 1
+    assert crud_user_question_progress.find_user_question_progress_mismatches(db_session) == []
+    progress = crud_user_question_progress.get_progress(db_session, test_user.id, q1.id)
+    assert (progress.attempts, progress.correct_count, progress.ever_incorrect) == (1, 0, True)
+
+
+def test_progress_follows_question_exam_type(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    other = crud_exam_type.create_exam_type(db_session, schemas.ExamTypeCreate(name="Progress Move ET"))
+    q1 = _create_question(db_session, test_exam_type.id, "Progress Move Q1")
+    _answer(db_session, q1.id, 1, test_user.id)
+    assert crud_user_question_progress.get_progress(db_session, test_user.id, q1.id).exam_type_id == test_exam_type.id
+
+    crud_question.update_question(db_session, q1.id, schemas.QuestionUpdate(exam_type_id=other.id))
+    db_session.expire_all()
+    assert crud_user_question_progress.get_progress(db_session, test_user.id, q1.id).exam_type_id == other.id
+
+    crud_exam_type.delete_exam_type(db_session, other.id)
+    db_session.expire_all()
+    assert crud_user_question_progress.get_progress(db_session, test_user.id, q1.id).exam_type_id is None
+    assert crud_user_question_progress.find_user_question_progress_mismatches(db_session) == []
+
+    db_session.query(models.UserQuestionProgress).update({models.UserQuestionProgress.exam_type_id: test_exam_type.id})
+    db_session.commit()
+    assert crud_user_question_progress.find_user_question_progress_mismatches(db_session) == [(test_user.id, q1.id)]
+
+
+def test_answers_schedule_reviews_like_sm2(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Schedule Q1")
+    outcomes = [True, True, True, False, True]
+    expected = (spaced_repetition.INITIAL_EASE, 0.0, 0)
+    for correct in outcomes:
+        _answer(db_session, q1.id, 1 if correct else 2, test_user.id)
+        expected = spaced_repetition.review(*expected, correct)
+        db_session.expire_all()
+        progress = crud_user_question_progress.get_progress(db_session, test_user.id, q1.id)
+        assert (progress.ease, progress.interval_days, progress.repetitions) == pytest.approx(expected)
+        delay = progress.due_at - progress.last_answered_at
+        assert delay.total_seconds() == pytest.approx(spaced_repetition.delay_seconds(expected[1]), abs=1)
+
+    # The rebuild replays the same answers to the same schedule
+    db_session.query(models.UserQuestionProgress).delete()
+    db_session.commit()
+    crud_user_question_progress.rebuild_user_question_progress(db_session, user_id=test_user.id)
+    progress = crud_user_question_progress.get_progress(db_session, test_user.id, q1.id)
+    assert (progress.ease, progress.interval_days, progress.repetitions) == pytest.approx(expected)
+    assert progress.due_at is not None
+
+
+def test_next_question_pops_the_most_overdue_review(db_session: SQLAlchemySession, test_user: models.User, test_exam_type: models.ExamType):
+    q1 = _create_question(db_session, test_exam_type.id, "Due Q1")
+    q2 = _create_question(db_session, test_exam_type.id, "Due Q2")
+    _create_question(db_session, test_exam_type.id, "Due Q3 unanswered")
+    _answer(db_session, q1.id, 1, test_user.id)
+    _answer(db_session, q2.id, 2, test_user.id)
+    # Nothing is due yet, so an unanswered question comes first
+    assert crud_user_question_progress.get_earliest_due_question_id(db_session, test_user.id, test_exam_type.id) is None
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for question_id, overdue in ((q1.id, timedelta(days=2)), (q2.id, timedelta(hours=1))):
+        db_session.query(models.UserQuestionProgress)\
+            .filter(models.UserQuestionProgress.question_id == question_id)\
+            .update({models.UserQuestionProgress.due_at: now - overdue})
+    db_session.commit()
+    assert crud_user_question_progress.get_earliest_due_question_id(db_session, test_user.id, test_exam_type.id) == q1.id
+    assert crud_question.get_next_question_cached(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id).id == q1.id
+    assert crud_question.get_next_question_for_user(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id).id == q1.id
+
+    _answer(db_session, q1.id, 1, test_user.id) # Reviewed: q2 is next
+    assert crud_question.get_next_question_cached(db_session, user_id=test_user.id, exam_type_id=test_exam_type.id).id == q2.id
@@ -0,0 +1,118 @@
+import random
+from functools import partial
+from typing import Callable, List, Tuple
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.crud import crud_question, crud_user_answer, crud_summary, crud_question_stats, crud_user_question_progress, crud_user_exam_type_stats
+from app.models import models
+
+NUM_EXAM_TYPES = 20
+NUM_USERS = 200
+NUM_QUESTIONS = 2000
+NUM_ANSWERS = 40000
+
+# Tables whose full scans would grow with the question bank or the answer history
+INDEXED_TABLES = {"questions", "user_answers", "question_stats", "user_question_progress", "user_exam_type_stats"}
+
+
+@pytest.fixture(scope="function")
+def seeded_db(db_session: SQLAlchemySession) -> SQLAlchemySession:
+    rng = random.Random(1234)
+    db_session.execute(insert(models.ExamType), [{"name": f"Plan ET {i}"} for i in range(NUM_EXAM_TYPES)])
+    db_session.execute(insert(models.User), [{"username": f"plan_user_{i}", "hashed_password": "x"} for i in range(NUM_USERS)])
+    db_session.execute(insert(models.Question), [
+        {
+            "problem_statement": f"Plan Q{i}",
+            "option_1": "A", "option_2": "B", "option_3": "C", "option_4": "D",
+            "correct_answer": 1,
+            "exam_type_id": i % NUM_EXAM_TYPES + 1,
+        }
+        for i in range(NUM_QUESTIONS)
+    ])
+    db_session.execute(insert(models.UserAnswer), [
+        {
+            "question_id": rng.randint(1, NUM_QUESTIONS),
+            "user_id": rng.randint(1, NUM_USERS),
+            "selected_answer": rng.randint(1, 4),
+            "is_correct": rng.random() < 0.5,
+        }
+        for _ in range(NUM_ANSWERS)
+    ])
+    db_session.commit()
+    crud_question_stats.rebuild_question_stats(db_session)
+    crud_user_question_progress.rebuild_user_question_progress(db_session)
+    crud_user_exam_type_stats.rebuild_user_exam_type_stats(db_session)
+    db_session.execute(text("ANALYZE")) # Give the planner real table statistics
+    db_session.commit()
+    return db_session
+
+
+def _full_table_scans(db: SQLAlchemySession, fn: Callable[[], object]) -> List[Tuple[str, str]]:
+    """Runs fn, then EXPLAINs every SELECT it issued and returns (sql, plan step) for full table scans."""
+    engine = db.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements, "the crud call issued no SELECT"
+    scans = []
+    for statement, parameters in statements:
+        plan = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        for row in plan:
+            detail = row[-1]
+            words = detail.split()
+            # "SCAN <table>" without "USING ... INDEX" is a sequential scan
+            if words[0] == "SCAN" and words[1] in INDEXED_TABLES and "INDEX" not in detail:
+                scans.append((statement, detail))
+    return scans
+
+
+def _second_performance_page(db: SQLAlchemySession, sort: str, exam_type_id):
+    _, cursor = crud_summary.get_user_question_performance_summary(db, user_id=7, exam_type_id=exam_type_id, sort=sort, limit=5)
+    return crud_summary.get_user_question_performance_summary(db, user_id=7, exam_type_id=exam_type_id, sort=sort, limit=5, cursor=cursor)
+
+
+HOT_PATH_QUERIES = {
+    "crud_question.get_question": lambda db: crud_question.get_question(db, question_id=5),
+    "crud_question.get_questions": lambda db: crud_question.get_questions(db, exam_type_id=3),
+    "crud_question.get_unanswered_question_ids": lambda db: crud_question.get_unanswered_question_ids(db, user_id=7, exam_type_id=3),
+    "crud_question.get_question_global_stats": lambda db: crud_question.get_question_global_stats(db, exam_type_id=3),
+    "crud_question.get_next_question_for_user": lambda db: crud_question.get_next_question_for_user(db, user_id=7, exam_type_id=3),
+    "crud_question.get_question_cached": lambda db: crud_question.get_question_cached(db, question_id=5),
+    "crud_question.get_next_question_cached": lambda db: crud_question.get_next_question_cached(db, user_id=7, exam_type_id=3),
+    "crud_question.get_question_sampler": lambda db: crud_question.get_question_sampler(db, crud_question.get_question_bank(db, exam_type_id=3)),
+    "crud_user_question_progress.get_earliest_due_question_id": lambda db: crud_user_question_progress.get_earliest_due_question_id(db, user_id=7, exam_type_id=3),
+    "crud_user_answer.get_user_answers_by_user": lambda db: crud_user_answer.get_user_answers_by_user(db, user_id=7),
+    "crud_user_answer.get_user_answers_by_question": lambda db: crud_user_answer.get_user_answers_by_question(db, question_id=5, user_id=7),
+    "crud_user_answer.get_specific_user_answer": lambda db: crud_user_answer.get_specific_user_answer(db, question_id=5, user_id=7),
+    "crud_user_answer.get_answered_question_ids": lambda db: crud_user_answer.get_answered_question_ids(db, user_id=7),
+    "crud_user_answer.get_questions_always_answered_correctly_by_user": lambda db: crud_user_answer.get_questions_always_answered_correctly_by_user(db, user_id=7, exam_type_id=3),
+    "crud_summary.get_user_summary_stats": lambda db: crud_summary.get_user_summary_stats(db, user_id=7, exam_type_id=3),
+    "crud_summary.get_user_summary_stats (all exam types)": lambda db: crud_summary.get_user_summary_stats(db, user_id=7),
+    "crud_summary.get_user_dashboard_summary": lambda db: crud_summary.get_user_dashboard_summary(db, user_id=7),
+    "crud_summary.get_user_question_performance_summary": lambda db: crud_summary.get_user_question_performance_summary(db, user_id=7, exam_type_id=3),
+    "crud_summary.get_user_question_performance_summary (all exam types)": lambda db: crud_summary.get_user_question_performance_summary(db, user_id=7),
+    **{
+        f"crud_summary.get_user_question_performance_summary (sort={sort}{scope}, second page)":
+            partial(_second_performance_page, sort=sort, exam_type_id=exam_type_id)
+        for sort in crud_summary.PERFORMANCE_SORTS
+        for scope, exam_type_id in (("", 3), (", all exam types", None))
+    },
+}
+
+
+@pytest.mark.parametrize("query_name", sorted(HOT_PATH_QUERIES))
+def test_hot_path_queries_use_indexes(seeded_db: SQLAlchemySession, query_name: str):
+    scans = _full_table_scans(seeded_db, lambda: HOT_PATH_QUERIES[query_name](seeded_db))
+    assert scans == [], f"{query_name} falls back to a sequential scan: {scans}"
@@ -96,3 +96,40 @@ def test_protected_route_valid_token(client: TestClient, test_user: models.User,
     # Further checks on the response data can be done if needed, but for auth, 200 is key.
     assert "id" in response.json() # Check if it looks like a question object
     assert response.json()["problem_statement"] == "Test question for auth valid token"
+
+
+def test_login_token_resolves_user_from_cache_without_queries(client: TestClient, test_user: models.User, db_session: SQLAlchemySession):
+    from sqlalchemy import event
+    from app.core import security
+    from app.routers.auth import resolve_user
+
+    response = client.post("/auth/token", data={"username": test_user.username, "password": "testpassword"})
+    claims = security.decode_token_claims(response.json()["access_token"])
+    assert claims["uid"] == test_user.id and claims["ver"] == 0
+
+    assert resolve_user(db_session, claims).id == test_user.id # Miss: loads and caches the user
+
+    statements = []
+    bind = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        user = resolve_user(db_session, claims)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    assert user.id == test_user.id and user.username == test_user.username
+    assert statements == []
+
+
+def test_revoked_token_is_rejected(client: TestClient, test_user: models.User, db_session: SQLAlchemySession):
+    from app.crud import crud_user
+
+    token = client.post("/auth/token", data={"username": test_user.username, "password": "testpassword"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/summary/", headers=headers).status_code != status.HTTP_401_UNAUTHORIZED # Warms the cache
+
+    crud_user.revoke_user_tokens(db_session, test_user.id)
+    assert client.get("/summary/", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+
+    new_token = client.post("/auth/token", data={"username": test_user.username, "password": "testpassword"}).json()["access_token"]
+    assert client.get("/summary/", headers={"Authorization": f"Bearer {new_token}"}).status_code != status.HTTP_401_UNAUTHORIZED